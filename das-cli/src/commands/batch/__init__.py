@@ -0,0 +1,3 @@
+from .batch_module import BatchModule
+
+__all__ = ["BatchModule"]
@@ -0,0 +1,204 @@
+import io
+import json
+import shlex
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Any, List, TextIO, Tuple
+
+import click
+from injector import inject
+
+from common import CommandArgument, CommandGroup, CommandOption, StdoutSeverity, StdoutType
+from common.command import collect_machine_readable_output
+
+from .batch_docs import HELP_BATCH, SHORT_HELP_BATCH
+
+
+def run_in_process(root: click.Command, args: List[str]) -> int:
+    '''Runs a das-cli command line in the current process and returns its exit code.'''
+    try:
+        # Every step goes through the same click tree built at start-up, so the commands
+        # reuse the injected settings, Docker clients and SSH connections of this process.
+        exit_code = root.main(args=args, prog_name="das-cli", standalone_mode=False)
+    except click.exceptions.Exit as e:
+        exit_code = e.exit_code
+    except click.ClickException as e:
+        e.show()
+        exit_code = e.exit_code
+    except click.exceptions.Abort:
+        exit_code = 1
+
+    return exit_code if isinstance(exit_code, int) else 0
+
+
+def run_in_process_captured(root: click.Command, args: List[str]) -> Tuple[int, Any]:
+    '''
+    Runs a das-cli command line like run_in_process, returning what it printed instead of
+    writing it out. Output that is a JSON document is returned parsed.
+    '''
+    buffer = io.StringIO()
+
+    with redirect_stdout(buffer), redirect_stderr(buffer):
+        exit_code = run_in_process(root, args)
+
+    output = buffer.getvalue().strip()
+
+    try:
+        return exit_code, json.loads(output)
+    except ValueError:
+        return exit_code, output
+
+
+def run_in_process_collected(
+    root: click.Command, args: List[str], output_format: str
+) -> Tuple[int, List[Any]]:
+    '''
+    Runs a das-cli command line like run_in_process with the given output format and
+    returns its machine readable output instead of printing it. Unlike
+    run_in_process_captured, it does not redirect the process streams, so it can be
+    used from several threads at once.
+    '''
+    with collect_machine_readable_output() as collected:
+        exit_code = run_in_process(root, [*args, "--output-format", output_format])
+
+    return exit_code, collected
+
+
+class BatchStepError(Exception):
+    """Raised when one or more steps of a batch failed."""
+
+    def __init__(self, failed_steps: List[int]):
+        self.failed_steps = failed_steps
+        steps = ", ".join(map(str, failed_steps))
+        super().__init__(f"Batch finished with failures on step(s) {steps}.")
+
+
+class BatchCli(CommandGroup):
+    name = "batch"
+
+    short_help = SHORT_HELP_BATCH
+
+    help = HELP_BATCH
+
+    params = [
+        CommandArgument(
+            ["file"],
+            type=click.File("r"),
+        ),
+        CommandOption(
+            ["--continue-on-error"],
+            is_flag=True,
+            default=False,
+            help="Keep running the remaining steps after a step fails.",
+            required=False,
+        ),
+        *CommandGroup.default_params,
+    ]
+
+    @inject
+    def __init__(self) -> None:
+        super().__init__()
+        self.override_group_command()
+
+        # 'batch' has no subcommands, so options are also accepted after the file argument.
+        self.group.allow_interspersed_args = True
+        self.group.subcommand_metavar = ""
+
+    def _parse_steps(self, file: TextIO) -> List[List[str]]:
+        steps = []
+
+        for line_number, line in enumerate(file, start=1):
+            line = line.strip()
+
+            if not line or line.startswith("#"):
+                continue
+
+            try:
+                args = shlex.split(line, comments=True)
+            except ValueError as e:
+                raise ValueError(f"Invalid command at line {line_number}: {e}")
+
+            if args and args[0] == "das-cli":
+                args = args[1:]
+
+            if not args:
+                continue
+
+            if args[0] == self.name:
+                raise ValueError(f"Nested batches are not supported (line {line_number}).")
+
+            steps.append(args)
+
+        return steps
+
+    def _run_step(self, root: click.Command, args: List[str]) -> Tuple[int, Any]:
+        # In json or yaml mode the step output goes into its summary entry, so the
+        # batch prints a single document that can be parsed.
+        if self.output_format == "plain":
+            return run_in_process(root, args), None
+
+        return run_in_process_captured(root, args)
+
+    def run(self, file: TextIO, continue_on_error: bool = False) -> None:
+        steps = self._parse_steps(file)
+        root = click.get_current_context().find_root().command
+        results = []
+        failed_steps = []
+
+        batch_started_at = time.monotonic()
+
+        for index, args in enumerate(steps, start=1):
+            command = " ".join(args)
+
+            self.stdout(f"[{index}/{len(steps)}] das-cli {command}", severity=StdoutSeverity.INFO)
+
+            step_started_at = time.monotonic()
+            exit_code, output = self._run_step(root, args)
+            duration = round(time.monotonic() - step_started_at, 3)
+
+            results.append(
+                {
+                    "step": index,
+                    "command": command,
+                    "exit_code": exit_code,
+                    "duration_seconds": duration,
+                    "output": output,
+                }
+            )
+
+            if exit_code == 0:
+                self.stdout(
+                    f"[{index}/{len(steps)}] done in {duration:.2f}s",
+                    severity=StdoutSeverity.SUCCESS,
+                )
+                continue
+
+            failed_steps.append(index)
+
+            self.stdout(
+                f"[{index}/{len(steps)}] failed with exit code {exit_code} after {duration:.2f}s",
+                severity=StdoutSeverity.ERROR,
+            )
+
+            if not continue_on_error:
+                break
+
+        total_duration = round(time.monotonic() - batch_started_at, 3)
+
+        self.stdout(
+            f"\n{len(results)} of {len(steps)} step(s) run in {total_duration:.2f}s, "
+            f"{len(failed_steps)} failed.",
+            severity=StdoutSeverity.ERROR if failed_steps else StdoutSeverity.SUCCESS,
+        )
+        self.stdout(
+            {
+                "steps": results,
+                "total_steps": len(steps),
+                "failed_steps": failed_steps,
+                "total_duration_seconds": total_duration,
+            },
+            stdout_type=StdoutType.MACHINE_READABLE,
+        )
+
+        if failed_steps:
+            raise BatchStepError(failed_steps)
@@ -0,0 +1,52 @@
+HELP_BATCH = """
+NAME
+
+    batch - Run a list of das-cli commands in a single process
+
+SYNOPSIS
+
+    das-cli batch <file|-> [--continue-on-error]
+
+DESCRIPTION
+
+    Reads das-cli commands from a file (or from the standard input when '-' is given), one per line,
+    and runs them in order inside the same das-cli process.
+
+    All the steps share the loaded configuration, the Docker clients and the SSH connections, so
+    a long automation script no longer pays the start-up cost of one das-cli process per command.
+
+    Empty lines and lines starting with '#' are ignored. The leading 'das-cli' of each line is
+    optional. The time taken by each step is reported as it finishes, followed by a summary.
+
+    With -o json or -o yaml, the batch prints a single document. What each step printed is
+    captured into the "output" field of its summary entry instead of being written out.
+
+OPTIONS
+
+    --continue-on-error
+
+        Keep running the remaining steps after a step fails. By default the batch stops at the first
+        failure. In both cases the batch exits with an error if any step failed.
+
+EXAMPLES
+
+    Start the databases and the agents, then load a knowledge base:
+
+        $ cat start.das
+        db start
+        attention-broker start
+        query-agent start --port-range 42000:42999
+        metta load /tmp/animals.metta
+
+        $ das-cli batch start.das
+
+    Run commands from the standard input, even if some of them fail:
+
+        $ printf 'db stop\\nattention-broker stop\\n' | das-cli batch - --continue-on-error
+
+    Get the step timings and outputs as JSON:
+
+        $ das-cli batch start.das -o json
+"""
+
+SHORT_HELP_BATCH = "Run a list of das-cli commands in a single process."
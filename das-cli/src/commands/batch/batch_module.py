@@ -0,0 +1,10 @@
+from typing import List
+
+from common import Module
+
+from .batch_cli import BatchCli
+
+
+class BatchModule(Module):
+    _instance = BatchCli
+    _dependency_list: List = []
@@ -1,6 +1,32 @@
+import pathlib
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
 from injector import inject
 
-from common import Command, CommandGroup, CommandOption, Settings, StdoutSeverity, StdoutType
+from common import (
+    Command,
+    CommandArgument,
+    CommandGroup,
+    CommandOption,
+    FloatRange,
+    IntRange,
+    Path,
+    Settings,
+    StdoutSeverity,
+    StdoutType,
+)
+from common.atomdb_snapshot import (
+    read_manifest,
+    restore_mongodb,
+    restore_redis,
+    snapshot_mongodb,
+    snapshot_redis,
+    write_manifest,
+)
 from common.container_manager.atomdb.mongodb_container_manager import MongodbContainerManager
 from common.container_manager.atomdb.morkdb_container_manager import MorkdbContainerManager
 from common.container_manager.atomdb.redis_container_manager import RedisContainerManager
@@ -15,16 +41,21 @@ from common.factory.atomdb.atomdb_backend import (
     MongoDBRedisBackend,
     MorkMongoDBBackend,
 )
+from common.network import clear_port_probe_cache
 
 from .db_docs import (
     HELP_DB_CLI,
     HELP_DB_COUNT_ATOMS,
     HELP_DB_RESTART,
+    HELP_DB_RESTORE,
+    HELP_DB_SNAPSHOT,
     HELP_DB_START,
     HELP_DB_STOP,
     SHORT_HELP_DB_CLI,
     SHORT_HELP_DB_COUNT_ATOMS,
     SHORT_HELP_DB_RESTART,
+    SHORT_HELP_DB_RESTORE,
+    SHORT_HELP_DB_SNAPSHOT,
     SHORT_HELP_DB_START,
     SHORT_HELP_DB_STOP,
 )
@@ -38,6 +69,26 @@ class DbCountAtoms(Command):
 
     help = HELP_DB_COUNT_ATOMS
 
+    params = [
+        CommandOption(
+            ["--watch", "-w"],
+            is_flag=True,
+            help="Keep sampling the counts and show ingestion deltas and the atoms/s rate.",
+            default=False,
+            required=False,
+        ),
+        CommandOption(
+            ["--interval", "-i"],
+            type=FloatRange(min=0, min_open=True),
+            help="Seconds between samples in watch mode.",
+            default=2.0,
+            required=False,
+        ),
+    ]
+
+    _watched_collections = ["nodes", "links", "atoms"]
+    _rate_window = 5
+
     @inject
     def __init__(
         self,
@@ -95,18 +146,102 @@ class DbCountAtoms(Command):
             stdout_type=StdoutType.MACHINE_READABLE,
         )
 
+    def _show_redis_stats(self):
+        key_stats = self._redis_container_manager.get_key_stats()
+
+        self.stdout(f"Redis keys: {key_stats.get('keys', 0)}")
+
+        self.stdout(
+            dict(
+                DbServiceResponse(
+                    action="count-atoms",
+                    status="success",
+                    message="Count of Redis keys displayed successfully.",
+                    container=self._get_redis_container(),
+                    extra_details={
+                        "stats": key_stats,
+                    },
+                )
+            ),
+            stdout_type=StdoutType.MACHINE_READABLE,
+        )
+
+    def _show_watch_sample(self, counts: dict, deltas: dict, atoms_per_second: float):
+        sampled_at = datetime.now().strftime("%H:%M:%S")
+        columns = "  ".join(
+            f"{key}: {counts[key]} ({deltas[key]:+d})" for key in self._watched_collections
+        )
+        self.stdout(f"[{sampled_at}] {columns}  rate: {atoms_per_second:.1f} atoms/s")
+
+        self.stdout(
+            dict(
+                DbServiceResponse(
+                    action="count-atoms",
+                    status="sample",
+                    message="MongoDB atom counts sampled.",
+                    container=self._get_mongodb_container(),
+                    extra_details={
+                        "counts": counts,
+                        "deltas": deltas,
+                        "atoms_per_second": round(atoms_per_second, 2),
+                    },
+                )
+            ),
+            stdout_type=StdoutType.MACHINE_READABLE,
+            stream_mode=True,
+        )
+
+    def _watch_mongodb_stats(self, interval: float):
+        rates: deque = deque(maxlen=self._rate_window)
+        previous_counts = None
+        previous_sampled_at = 0.0
+
+        try:
+            while True:
+                sampled_at = time.monotonic()
+                collection_stats = self._mongodb_container_manager.get_collection_stats()
+
+                counts = {
+                    key: int(collection_stats.get(key, 0)) for key in self._watched_collections
+                }
+                deltas = {
+                    key: counts[key] - (previous_counts or counts)[key]
+                    for key in self._watched_collections
+                }
+
+                if previous_counts is not None:
+                    rates.append(deltas["atoms"] / (sampled_at - previous_sampled_at))
+
+                atoms_per_second = sum(rates) / len(rates) if rates else 0.0
+
+                self._show_watch_sample(counts, deltas, atoms_per_second)
+
+                previous_counts = counts
+                previous_sampled_at = sampled_at
+
+                time.sleep(max(0.0, interval - (time.monotonic() - sampled_at)))
+
+        except KeyboardInterrupt:
+            return
+
     @ensure_container_running(
         "_atomdb_backend",
         exception_text="\nPlease use 'db start' to start required services before running 'db count-atoms'.",
         verbose=False,
     )
-    def run(self) -> None:
+    def run(self, watch: bool = False, interval: float = 2.0) -> None:
         for provider in self._atomdb_backend.get_active_providers():
-            if isinstance(provider, MongoDBRedisBackend):
-                self._show_mongodb_stats()
+            if not isinstance(provider, (MongoDBRedisBackend, MorkMongoDBBackend)):
+                continue
 
-            elif isinstance(provider, MorkMongoDBBackend):
-                self._show_mongodb_stats()
+            if watch:
+                self._watch_mongodb_stats(interval)
+                return
+
+            self._show_mongodb_stats()
+
+            if isinstance(provider, MongoDBRedisBackend):
+                self._show_redis_stats()
 
 
 class DbStop(Command):
@@ -235,8 +370,8 @@ class DbStop(Command):
             stdout_type=StdoutType.MACHINE_READABLE,
         )
 
-    def run(self, prune: bool = False) -> None:
-        self._settings.validate_configuration_file()
+    def _get_services_to_stop(self) -> List[Tuple[Any, list, str, bool]]:
+        services: List[Tuple[Any, list, str, bool]] = []
 
         for provider in self._atomdb_backend.get_active_providers():
 
@@ -244,39 +379,35 @@ class DbStop(Command):
                 redis_options = self._redis_container_manager._options
                 mongodb_options = self._mongodb_container_manager._options
 
-                self._stop_service(
-                    self._redis_container_manager,
-                    redis_options["redis_nodes"],
-                    "Redis",
-                    prune,
-                    redis_options["redis_cluster"],
+                services.append(
+                    (
+                        self._redis_container_manager,
+                        redis_options["redis_nodes"],
+                        "Redis",
+                        redis_options["redis_cluster"],
+                    )
                 )
-
-                self._stop_service(
-                    self._mongodb_container_manager,
-                    mongodb_options["mongodb_nodes"],
-                    "MongoDB",
-                    prune,
-                    mongodb_options["mongodb_cluster"],
+                services.append(
+                    (
+                        self._mongodb_container_manager,
+                        mongodb_options["mongodb_nodes"],
+                        "MongoDB",
+                        mongodb_options["mongodb_cluster"],
+                    )
                 )
 
             elif isinstance(provider, MorkMongoDBBackend):
                 mongodb_options = self._mongodb_container_manager._options
 
-                self._stop_service(
-                    self._mongodb_container_manager,
-                    mongodb_options["mongodb_nodes"],
-                    "MongoDB",
-                    prune,
-                    mongodb_options["mongodb_cluster"],
-                )
-
-                self._stop_service(
-                    self._morkdb_container_manager,
-                    [],
-                    "MorkDB",
-                    prune,
+                services.append(
+                    (
+                        self._mongodb_container_manager,
+                        mongodb_options["mongodb_nodes"],
+                        "MongoDB",
+                        mongodb_options["mongodb_cluster"],
+                    )
                 )
+                services.append((self._morkdb_container_manager, [], "MorkDB", False))
 
             else:
                 self.stdout(
@@ -284,6 +415,27 @@ class DbStop(Command):
                     severity=StdoutSeverity.WARNING,
                 )
 
+        return services
+
+    def run(self, prune: bool = False) -> None:
+        self._settings.validate_configuration_file()
+
+        services = self._get_services_to_stop()
+
+        if not services:
+            return
+
+        # Each service has its own manager, so they are stopped (and their volumes
+        # removed) at the same time; the nodes of one service are still handled in turn.
+        with ThreadPoolExecutor(max_workers=len(services)) as executor:
+            futures = [
+                executor.submit(self._stop_service, manager, nodes, service_name, prune, cluster)
+                for manager, nodes, service_name, cluster in services
+            ]
+
+        for future in futures:
+            future.result()
+
 
 class DbStart(Command):
     name = "start"
@@ -368,7 +520,7 @@ class DbStart(Command):
                     container_port,
                     kwargs["username"],
                     kwargs["password"],
-                    kwargs.get("cluster_node"),
+                    node if kwargs.get("cluster", False) else None,
                     kwargs.get("cluster_key"),
                 )
 
@@ -415,6 +567,42 @@ class DbStart(Command):
             )
             raise e
 
+    def _show_tuning(self, manager, service_name: str) -> None:
+        profile = manager.profile
+        tuning_settings = manager.get_tuning_settings()
+
+        self.stdout(f"{service_name} tuning profile: {profile}")
+
+        for key, value in tuning_settings.items():
+            display_value = value if value != "" else '""'
+            self.stdout(f"  {key} {display_value}")
+
+    def _show_redis_cluster_plan(self, plan: dict, slot_counts: Dict[str, int]) -> None:
+        self.stdout(
+            f"Redis cluster is up with {len(plan['masters'])} masters "
+            f"and {sum(len(replicas) for replicas in plan['replicas'].values())} replicas:"
+        )
+
+        for master in plan["masters"]:
+            replicas = ", ".join(replica["ip"] for replica in plan["replicas"][master["ip"]])
+            self.stdout(
+                f"  {master['ip']}: {slot_counts.get(master['ip'], 0)} slots"
+                + (f", replicas: {replicas}" if replicas else "")
+            )
+
+        # redis-cli rounds the weighted shares on its own, so one slot of difference is expected.
+        mismatches = [
+            f"{ip} has {slot_counts.get(ip, 0)} (planned {planned})"
+            for ip, planned in plan["slots"].items()
+            if abs(slot_counts.get(ip, 0) - planned) > 1
+        ]
+
+        if mismatches:
+            self.stdout(
+                "The Redis slot layout does not match the plan: " + "; ".join(mismatches),
+                severity=StdoutSeverity.WARNING,
+            )
+
     def _start_service(self, manager, nodes: list, service_name: str, **kwargs):
         try:
             self.stdout(f"Starting {service_name} service...")
@@ -422,13 +610,29 @@ class DbStart(Command):
             if service_name.lower() == "morkdb":
                 self._start_mork(manager, kwargs["port"])
 
+            if service_name.lower() in ("redis", "mongodb"):
+                self._show_tuning(manager, service_name)
+
+            if kwargs.get("cluster", False) and service_name.lower() == "redis":
+                manager.probe_cluster_ports(nodes, int(kwargs["port"]))
+
+            if kwargs.get("cluster", False) and service_name.lower() == "mongodb":
+                self.stdout("Uploading the MongoDB cluster keyfile to all nodes...")
+                manager.upload_cluster_keys(nodes, kwargs["cluster_key"])
+
             for node in nodes:
                 self._start_node(manager, node, service_name, **kwargs)
 
             if kwargs.get("cluster", False) and service_name.lower() in ("redis", "mongodb"):
                 try:
                     if service_name.lower() == "redis":
-                        manager.start_cluster(nodes, kwargs["port"])
+                        plan = manager.start_cluster(nodes, kwargs["port"])
+                        self._show_redis_cluster_plan(
+                            plan,
+                            manager.get_cluster_slot_counts(
+                                plan["masters"][0]["ip"], int(kwargs["port"])
+                            ),
+                        )
                     else:
                         manager.start_cluster(
                             nodes, kwargs["port"], kwargs["username"], kwargs["password"]
@@ -440,6 +644,14 @@ class DbStart(Command):
                     )
                     raise
 
+            extra_details: Dict[str, Any] = {
+                "cluster": kwargs.get("cluster", False),
+                "nodes": nodes,
+            }
+
+            if service_name.lower() in ("redis", "mongodb"):
+                extra_details["tuning"] = manager.get_tuning_settings()
+
             self.stdout(
                 dict(
                     DbServiceResponse(
@@ -447,7 +659,7 @@ class DbStart(Command):
                         status="success",
                         message=f"{service_name.capitalize()} started successfully",
                         container=manager.get_container(),
-                        extra_details={"cluster": kwargs.get("cluster", False), "nodes": nodes},
+                        extra_details=extra_details,
                     )
                 ),
                 stdout_type=StdoutType.MACHINE_READABLE,
@@ -464,6 +676,9 @@ class DbStart(Command):
 
         self._settings.validate_configuration_file()
 
+        # Port probes are only valid for this start, not for later commands run in the same process.
+        clear_port_probe_cache()
+
         for provider in self._atomdb_backend.get_active_providers():
 
             if isinstance(provider, MongoDBRedisBackend):
@@ -546,6 +761,226 @@ class DbRestart(Command):
         self._db_start.run()
 
 
+class DbSnapshot(Command):
+    name = "snapshot"
+
+    short_help = SHORT_HELP_DB_SNAPSHOT
+
+    help = HELP_DB_SNAPSHOT
+
+    params = [
+        CommandArgument(
+            ["path"],
+            type=Path(file_okay=False, dir_okay=True, writable=True),
+        ),
+        CommandOption(
+            ["--compression-level"],
+            type=IntRange(min=1, max=22),
+            default=3,
+            help="zstd compression level, from 1 (fastest) to 22 (smallest).",
+            required=False,
+        ),
+        CommandOption(
+            ["--threads"],
+            type=IntRange(min=0),
+            default=0,
+            help="Compression threads per stream. 0 uses every CPU.",
+            required=False,
+        ),
+        CommandOption(
+            ["--jobs", "-j"],
+            type=IntRange(min=1),
+            default=4,
+            help="Number of nodes or collections dumped at the same time.",
+            required=False,
+        ),
+    ]
+
+    @inject
+    def __init__(
+        self,
+        settings: Settings,
+        atomdb_backend: AtomdbBackend,
+        redis_container_manager: RedisContainerManager,
+        mongodb_container_manager: MongodbContainerManager,
+    ) -> None:
+        self._settings = settings
+        self._atomdb_backend = atomdb_backend
+        self._redis_container_manager = redis_container_manager
+        self._mongodb_container_manager = mongodb_container_manager
+        super().__init__()
+
+    def _show_files(self, files: List[dict], label: str) -> None:
+        for file in files:
+            ratio = file["raw_bytes"] / file["compressed_bytes"] if file["compressed_bytes"] else 0
+            self.stdout(
+                f"{label} {file.get('collection') or file.get('node')}: "
+                f"{file['raw_bytes'] / 1024 ** 2:.1f} MB -> {file['compressed_bytes'] / 1024 ** 2:.1f} MB "
+                f"({ratio:.1f}x) in {file['duration_seconds']:.1f}s"
+            )
+
+    @ensure_container_running(
+        "_atomdb_backend",
+        exception_text="\nPlease use 'db start' to start required services before running 'db snapshot'.",
+        verbose=False,
+    )
+    def run(self, path: str, compression_level: int, threads: int, jobs: int) -> None:
+        if not any(
+            isinstance(provider, MongoDBRedisBackend)
+            for provider in self._atomdb_backend.get_active_providers()
+        ):
+            raise ValueError("'db snapshot' only supports the Redis + MongoDB AtomDB backend")
+
+        target_dir = pathlib.Path(path)
+
+        if target_dir.exists() and any(target_dir.iterdir()):
+            raise ValueError(f"The snapshot directory {target_dir} must be empty")
+
+        target_dir.mkdir(parents=True, exist_ok=True)
+        started_at = time.monotonic()
+
+        self.stdout(f"Writing AtomDB snapshot to {target_dir}...")
+
+        # Redis nodes and MongoDB collections are dumped at the same time.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            redis_future = executor.submit(
+                snapshot_redis,
+                self._redis_container_manager,
+                self._redis_container_manager.nodes,
+                target_dir,
+                compression_level,
+                threads,
+                jobs,
+            )
+            mongodb_future = executor.submit(
+                snapshot_mongodb,
+                self._mongodb_container_manager,
+                target_dir,
+                compression_level,
+                threads,
+                jobs,
+            )
+
+        manifest: Dict[str, Any] = {
+            "atomdb_type": "redismongodb",
+            "compression": {"algorithm": "zstd", "level": compression_level},
+            "redis": redis_future.result(),
+            "mongodb": mongodb_future.result(),
+        }
+        write_manifest(target_dir, manifest)
+
+        self._show_files(manifest["redis"]["nodes"], "Redis node")
+        self._show_files(manifest["mongodb"]["collections"], "MongoDB collection")
+
+        duration = round(time.monotonic() - started_at, 3)
+        self.stdout(
+            f"AtomDB snapshot written to {target_dir} in {duration:.1f}s",
+            severity=StdoutSeverity.SUCCESS,
+        )
+        self.stdout(
+            {"path": str(target_dir), "duration_seconds": duration, **manifest},
+            stdout_type=StdoutType.MACHINE_READABLE,
+        )
+
+
+class DbRestore(Command):
+    name = "restore"
+
+    short_help = SHORT_HELP_DB_RESTORE
+
+    help = HELP_DB_RESTORE
+
+    params = [
+        CommandArgument(
+            ["path"],
+            type=Path(exists=True, file_okay=False, dir_okay=True),
+        ),
+        CommandOption(
+            ["--jobs", "-j"],
+            type=IntRange(min=1),
+            default=4,
+            help="Number of nodes or collections restored at the same time.",
+            required=False,
+        ),
+    ]
+
+    @inject
+    def __init__(
+        self,
+        settings: Settings,
+        atomdb_backend: AtomdbBackend,
+        redis_container_manager: RedisContainerManager,
+        mongodb_container_manager: MongodbContainerManager,
+    ) -> None:
+        self._settings = settings
+        self._atomdb_backend = atomdb_backend
+        self._redis_container_manager = redis_container_manager
+        self._mongodb_container_manager = mongodb_container_manager
+        super().__init__()
+
+    @ensure_container_running(
+        "_atomdb_backend",
+        exception_text="\nPlease use 'db start' to start required services before running 'db restore'.",
+        verbose=False,
+    )
+    def run(self, path: str, jobs: int) -> None:
+        if not any(
+            isinstance(provider, MongoDBRedisBackend)
+            for provider in self._atomdb_backend.get_active_providers()
+        ):
+            raise ValueError("'db restore' only supports the Redis + MongoDB AtomDB backend")
+
+        source_dir = pathlib.Path(path)
+        manifest = read_manifest(source_dir)
+        started_at = time.monotonic()
+
+        self.stdout(f"Restoring AtomDB snapshot from {source_dir}...")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            redis_future = executor.submit(
+                restore_redis,
+                self._redis_container_manager,
+                self._redis_container_manager.nodes,
+                source_dir,
+                manifest["redis"],
+                jobs,
+            )
+            mongodb_future = executor.submit(
+                restore_mongodb,
+                self._mongodb_container_manager,
+                source_dir,
+                manifest["mongodb"],
+                jobs,
+            )
+
+        redis_nodes = redis_future.result()
+        mongodb_collections = mongodb_future.result()
+
+        for node in redis_nodes:
+            self.stdout(f"Redis node {node['node']}: restored in {node['duration_seconds']:.1f}s")
+
+        for collection in mongodb_collections:
+            self.stdout(
+                f"MongoDB collection {collection['collection']}: {collection['documents']} documents "
+                f"restored in {collection['duration_seconds']:.1f}s"
+            )
+
+        duration = round(time.monotonic() - started_at, 3)
+        self.stdout(
+            f"AtomDB snapshot restored from {source_dir} in {duration:.1f}s",
+            severity=StdoutSeverity.SUCCESS,
+        )
+        self.stdout(
+            {
+                "path": str(source_dir),
+                "duration_seconds": duration,
+                "redis": redis_nodes,
+                "mongodb": mongodb_collections,
+            },
+            stdout_type=StdoutType.MACHINE_READABLE,
+        )
+
+
 class DbCli(CommandGroup):
     name = "database"
 
@@ -562,6 +997,8 @@ class DbCli(CommandGroup):
         db_stop: DbStop,
         db_restart: DbRestart,
         db_count_atoms: DbCountAtoms,
+        db_snapshot: DbSnapshot,
+        db_restore: DbRestore,
     ) -> None:
         super().__init__()
         self.add_commands(
@@ -570,5 +1007,7 @@ class DbCli(CommandGroup):
                 db_stop,
                 db_restart,
                 db_count_atoms,
+                db_snapshot,
+                db_restore,
             ]
         )
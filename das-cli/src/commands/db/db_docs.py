@@ -11,11 +11,23 @@ count-atoms - Displays counts of MongoDB atoms and Redis key patterns.
 'das-cli db count-atoms' counts the atoms stored in MongoDB and shows counts of specific key patterns stored in Redis.
 This is useful for monitoring and understanding the distribution and number of records in your databases.
 
+When the configured MongoDB and Redis endpoints are reachable, the counts are read directly through the native
+database drivers. The slower 'docker exec' path is only used as a fallback when the ports cannot be reached.
+
 .SH EXAMPLES
 
 Run the command see the count of MongoDB atoms and the breakdown of Redis key patterns:
 
 $ das-cli db count-atoms
+
+Watch the ingestion during a bulk load, sampling every 5 seconds. Each line shows the counts, the
+deltas since the previous sample and a moving-average atoms/s rate:
+
+$ das-cli db count-atoms --watch --interval 5
+
+Stream the samples as NDJSON (one JSON document per line):
+
+$ das-cli db count-atoms --watch -o json
 """
 
 SHORT_HELP_DB_COUNT_ATOMS = "Displays counts of MongoDB atoms and Redis key patterns."
@@ -33,6 +45,10 @@ This command is useful for shutting down the databases when they are no longer n
 
 IMPORTANT NOTE: After stopping the databases, all data will be lost.
 
+The databases keep their data in named Docker volumes labeled with the container name. With --prune,
+only those volumes are removed, including the ones left by earlier runs; other volumes on the host are
+never touched. Redis and MongoDB are stopped at the same time.
+
 .SH EXAMPLES
 
 Stop DBMS containers previously started with 'das-cli db start'.
@@ -59,6 +75,11 @@ start - Starts all DBMS containers.
 Upon execution, the command will display the ports on which each database is running.
 Note that the port configuration can be modified using the 'das-cli config set' command.
 
+Redis is tuned by the profile set in 'atomdb.redis.profile' (default, bulk-load, query-serving or low-memory).
+Individual redis-server settings in 'atomdb.redis.tuning' (for example {"maxmemory": "8gb", "io-threads": 8}) override the profile.
+MongoDB is tuned the same way by 'atomdb.mongodb.profile' (default, bulk-load or low-memory) and 'atomdb.mongodb.tuning' (cache_size_gb, journal_commit_interval, block_compressor and oplog_size_mb).
+The effective settings are printed when each database starts.
+
 .SH EXAMPLES
 
 Start all databases for use with the DAS.
@@ -95,6 +116,76 @@ $ das-cli db restart --prune
 SHORT_HELP_DB_RESTART = "Restart all DBMS containers."
 
 
+HELP_DB_SNAPSHOT = """
+.SH NAME
+
+snapshot - Writes a compressed snapshot of the AtomDB to a directory.
+
+.SH DESCRIPTION
+
+'das-cli db snapshot' dumps the Redis and MongoDB databases of a running AtomDB into an empty directory, so it can be
+restored with 'das-cli db restore' instead of loading the original MeTTa files again.
+
+Each Redis node streams a point-in-time RDB with 'redis-cli --rdb', and every MongoDB collection of the AtomDB is read
+as raw BSON together with its index definitions. On a replica set, the collections are read from a single snapshot
+session; a standalone MongoDB has no snapshot reads, so it should not be loaded into while the snapshot runs.
+
+A replica set only keeps snapshot history for minSnapshotHistoryWindowInSeconds (300 seconds by default). If the
+MongoDB dump takes longer, it fails; raise that parameter above the expected dump time for large AtomDBs.
+
+The Redis and MongoDB halves are taken independently, each at its own point in time, so the snapshot is not consistent
+across the two stores. Stop loading into the AtomDB while the snapshot runs.
+
+Every stream is compressed with zstd as it arrives, using several threads per stream. Redis nodes and MongoDB
+collections are dumped at the same time, up to --jobs of each. A manifest.json file describes the snapshot.
+
+Only the Redis + MongoDB AtomDB backend is supported.
+
+.SH EXAMPLES
+
+Write a snapshot of the running AtomDB:
+
+$ das-cli db snapshot /backups/atomdb-2026-10-19
+
+Favor a smaller snapshot over speed, dumping up to eight nodes or collections at once:
+
+$ das-cli db snapshot /backups/atomdb --compression-level 9 --jobs 8
+"""
+
+SHORT_HELP_DB_SNAPSHOT = "Writes a compressed snapshot of the AtomDB to a directory."
+
+
+HELP_DB_RESTORE = """
+.SH NAME
+
+restore - Replaces the AtomDB data with a snapshot written by 'db snapshot'.
+
+.SH DESCRIPTION
+
+'das-cli db restore' loads a snapshot into the databases started with 'das-cli db start', which may run on
+a different machine than the one the snapshot was taken on.
+
+Each MongoDB collection is loaded from the snapshot into a temporary collection, which gets its indexes once the
+documents are in and then replaces the live one, so a damaged snapshot file leaves that collection untouched. Collections
+that are not in the snapshot are dropped.
+Each Redis RDB is streamed into the data volume of the node at the same position in the configuration, and the node is
+restarted to load it. The configuration needs as many Redis nodes as the snapshot; a Redis cluster also needs the same
+node order, so the hash slots end up on the same nodes.
+
+Redis nodes and MongoDB collections are restored at the same time, up to --jobs of each.
+
+IMPORTANT NOTE: The current AtomDB data is replaced.
+
+.SH EXAMPLES
+
+Restore a snapshot into the running databases:
+
+$ das-cli db restore /backups/atomdb-2026-10-19
+"""
+
+SHORT_HELP_DB_RESTORE = "Replaces the AtomDB data with a snapshot written by 'db snapshot'."
+
+
 HELP_DB_CLI = """
 NAME
 
@@ -117,6 +208,8 @@ COMMANDS
     stop                Stop the DAS database containers.
     restart             Restart the DAS database containers.
     count-atoms         Count the number of atoms currently stored in the database
+    snapshot            Write a compressed snapshot of the AtomDB to a directory.
+    restore             Replace the AtomDB data with a snapshot.
 
 EXAMPLES
 
@@ -135,6 +228,10 @@ EXAMPLES
     das-cli db count-atoms
 
         Return the number of atoms currently stored in the database.
+
+    das-cli db snapshot /backups/atomdb
+
+        Write a snapshot of the AtomDB that 'das-cli db restore' can load back.
 """
 
 SHORT_HELP_DB_CLI = "Manage db-related operations."
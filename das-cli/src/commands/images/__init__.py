@@ -0,0 +1,3 @@
+from .images_module import ImagesModule
+
+__all__ = ["ImagesModule"]
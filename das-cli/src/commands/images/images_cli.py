@@ -0,0 +1,215 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from injector import inject
+from rich.progress import BarColumn, DownloadColumn, Progress, TaskID, TextColumn
+
+from common import (
+    Command,
+    CommandGroup,
+    CommandOption,
+    ImageManager,
+    IntRange,
+    Settings,
+    StdoutSeverity,
+    StdoutType,
+)
+from common.docker.exceptions import DockerError
+from common.required_images import LOCAL_CONTEXT, resolve_required_images
+from common.utils import print_table
+
+from .images_docs import HELP_IMAGES, HELP_PREFETCH, SHORT_HELP_IMAGES, SHORT_HELP_PREFETCH
+
+# Layer statuses reported by the Docker daemon once a layer needs no more downloading.
+LAYER_DONE_STATUSES = ("Download complete", "Pull complete", "Already exists")
+
+
+class LayerProgress:
+    """Aggregates the per-layer events of one image pull into a single progress bar."""
+
+    def __init__(self, progress: Progress, task_id: TaskID) -> None:
+        self._progress = progress
+        self._task_id = task_id
+        self._lock = threading.Lock()
+        self._layers: Dict[str, Tuple[int, int]] = {}
+        self._done_layers: set = set()
+
+    def __call__(self, event: dict) -> None:
+        layer_id = event.get("id")
+        status = event.get("status", "")
+
+        if not layer_id or layer_id == "latest" or status.startswith(("Pulling from", "Digest")):
+            return
+
+        with self._lock:
+            current, total = self._layers.get(layer_id, (0, 0))
+            detail = event.get("progressDetail") or {}
+
+            if status == "Downloading" and detail.get("total"):
+                current, total = detail.get("current", 0), detail["total"]
+
+            if status in LAYER_DONE_STATUSES:
+                current = total
+                self._done_layers.add(layer_id)
+
+            self._layers[layer_id] = (current, total)
+
+            self._progress.update(
+                self._task_id,
+                completed=sum(layer[0] for layer in self._layers.values()),
+                total=sum(layer[1] for layer in self._layers.values()) or None,
+                layers=f"{len(self._done_layers)}/{len(self._layers)} layers",
+            )
+
+
+class ImagesPrefetch(Command):
+    name = "prefetch"
+
+    short_help = SHORT_HELP_PREFETCH
+
+    help = HELP_PREFETCH
+
+    params = [
+        CommandOption(
+            ["--jobs", "-j"],
+            type=IntRange(min=1),
+            default=4,
+            help="Number of images pulled at the same time.",
+            required=False,
+        ),
+        CommandOption(
+            ["--all", "include_optional"],
+            is_flag=True,
+            default=False,
+            help="Also pull the optional images, such as the Jupyter Notebook one.",
+            required=False,
+        ),
+        CommandOption(
+            ["--local-only"],
+            is_flag=True,
+            default=False,
+            help="Only pull images through the local Docker daemon, skipping the cluster nodes.",
+            required=False,
+        ),
+    ]
+
+    @inject
+    def __init__(self, settings: Settings) -> None:
+        super().__init__()
+        self._settings = settings
+
+    def _prefetch_image(self, context: str, image: str, progress: Progress) -> dict:
+        image_manager = ImageManager(None if context == LOCAL_CONTEXT else context)
+        task_id = progress.add_task(
+            f"{image} ({context})", total=None, layers="checking", start=False
+        )
+        started_at = time.monotonic()
+        result: Dict[str, Any] = {
+            "image": image,
+            "context": context,
+            "status": "present",
+            "error": None,
+        }
+
+        try:
+            if not image_manager.is_image_current(image):
+                progress.start_task(task_id)
+                image_manager.pull_image(image, on_progress=LayerProgress(progress, task_id))
+                result["status"] = "pulled"
+
+            progress.update(task_id, layers=result["status"])
+        except Exception as e:
+            result["status"] = "failed"
+            result["error"] = str(e)
+            progress.update(task_id, layers="failed")
+        finally:
+            progress.stop_task(task_id)
+
+        result["duration_seconds"] = round(time.monotonic() - started_at, 3)
+
+        return result
+
+    def _show_results(self, results: List[dict]) -> None:
+        print_table(
+            [
+                {
+                    "IMAGE": result["image"],
+                    "CONTEXT": result["context"],
+                    "STATUS": result["status"],
+                    "TIME (s)": f"{result['duration_seconds']:.1f}",
+                }
+                for result in results
+            ],
+            columns=["IMAGE", "CONTEXT", "STATUS", "TIME (s)"],
+            max_width=60,
+            stdout=self.stdout,
+        )
+
+        for result in results:
+            if result["error"]:
+                self.stdout(
+                    f"{result['image']} ({result['context']}): {result['error']}",
+                    severity=StdoutSeverity.ERROR,
+                )
+
+    def run(self, jobs: int, include_optional: bool, local_only: bool) -> None:
+        self._settings.validate_configuration_file()
+
+        required_images = resolve_required_images(self._settings, include_optional)
+
+        if local_only:
+            required_images = {LOCAL_CONTEXT: required_images[LOCAL_CONTEXT]}
+
+        targets = [
+            (context, image) for context, images in required_images.items() for image in images
+        ]
+
+        progress = Progress(
+            TextColumn("{task.description}"),
+            BarColumn(),
+            DownloadColumn(),
+            TextColumn("{task.fields[layers]}"),
+            disable=self.output_format != "plain",
+        )
+
+        with progress, ThreadPoolExecutor(max_workers=jobs) as executor:
+            results = list(
+                executor.map(
+                    lambda target: self._prefetch_image(target[0], target[1], progress),
+                    targets,
+                )
+            )
+
+        self._show_results(results)
+
+        failed = [result for result in results if result["status"] == "failed"]
+
+        self.stdout(
+            {
+                "images": results,
+                "pulled": sum(1 for result in results if result["status"] == "pulled"),
+                "present": sum(1 for result in results if result["status"] == "present"),
+                "failed": len(failed),
+            },
+            stdout_type=StdoutType.MACHINE_READABLE,
+        )
+
+        if failed:
+            raise DockerError(f"Failed to prefetch {len(failed)} of {len(results)} image(s).")
+
+        self.stdout("All images are up to date.", severity=StdoutSeverity.SUCCESS)
+
+
+class ImagesCli(CommandGroup):
+    name = "images"
+
+    short_help = SHORT_HELP_IMAGES
+
+    help = HELP_IMAGES
+
+    @inject
+    def __init__(self, images_prefetch: ImagesPrefetch) -> None:
+        super().__init__()
+        self.add_commands([images_prefetch])
@@ -0,0 +1,69 @@
+HELP_PREFETCH = """
+NAME
+
+    images prefetch - Pull every Docker image needed by the current configuration
+
+SYNOPSIS
+
+    das-cli images prefetch [--jobs N] [--all] [--local-only]
+
+DESCRIPTION
+
+    Resolves the images used by the active configuration (the AtomDB databases, the agents, the MeTTa parser and, for the MorkDB backend, the Mork loader) and pulls them concurrently, showing the download progress of each image layer by layer.
+
+    Images already present with the digest the registry serves for their tag are skipped. When the registry cannot be reached, any local copy is kept as is.
+
+    The Redis and MongoDB images are also pulled through the Docker context of every cluster node listed in the configuration, so the first 'das-cli db start' does not wait on registry downloads on any node.
+
+OPTIONS
+
+    --jobs, -j N
+
+        Number of images pulled at the same time. Defaults to 4.
+
+    --all
+
+        Also pull the optional images, such as the Jupyter Notebook one.
+
+    --local-only
+
+        Only pull images through the local Docker daemon, skipping the cluster nodes.
+
+EXAMPLES
+
+    Prefetch the images of the current configuration:
+
+        $ das-cli images prefetch
+
+    Prefetch every image, eight at a time, and report the result as JSON:
+
+        $ das-cli images prefetch --all --jobs 8 -o json
+"""
+
+SHORT_HELP_PREFETCH = "Pull every Docker image needed by the current configuration."
+
+HELP_IMAGES = """
+NAME
+
+    images - Manage the Docker images used by das-cli
+
+SYNOPSIS
+
+    das-cli images <command> [options]
+
+DESCRIPTION
+
+    Commands to manage the Docker images of the services started by das-cli.
+
+COMMANDS
+
+    prefetch
+
+        Pull every Docker image needed by the current configuration.
+
+EXAMPLES
+
+    $ das-cli images prefetch
+"""
+
+SHORT_HELP_IMAGES = "Manage the Docker images used by das-cli."
@@ -0,0 +1,23 @@
+import os
+
+from common import Module
+from common.config.store import JsonConfigStore
+from settings.config import SECRETS_PATH
+
+from .images_cli import ImagesCli, Settings
+
+
+class ImagesModule(Module):
+    _instance = ImagesCli
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self._settings = Settings(store=JsonConfigStore(os.path.expanduser(SECRETS_PATH)))
+
+        self._dependency_list = [
+            (
+                Settings,
+                self._settings,
+            ),
+        ]
@@ -1,18 +1,35 @@
 import glob
 import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 
 from injector import inject
-
-from common import Command, CommandArgument, CommandGroup, Path, Settings, StdoutSeverity
+from pymongo.errors import PyMongoError
+
+from common import (
+    Command,
+    CommandArgument,
+    CommandGroup,
+    CommandOption,
+    IntRange,
+    Path,
+    Settings,
+    StdoutSeverity,
+)
+from common.container_manager.atomdb.mongodb_container_manager import MongodbContainerManager
 from common.container_manager.metta.database_loader_container_manager import (
     DatabaseLoaderContainerManager,
 )
 from common.container_manager.metta.metta_syntax_container_manager import (
     MettaSyntaxContainerManager,
 )
+from common.container_manager.metta.mork_loader_container_manager import MorkLoaderContainerManager
 from common.decorators import ensure_container_running
-from common.docker.exceptions import DockerError
-from common.factory.atomdb.atomdb_backend import AtomdbBackend
+from common.docker.exceptions import DockerContainerNotFoundError, DockerError
+from common.factory.atomdb.atomdb_backend import AtomdbBackend, MorkMongoDBBackend
 from common.prompt_types import AbsolutePath
 
 from .metta_docs import (
@@ -42,7 +59,14 @@ class MettaLoad(Command):
                 writable=False,
                 readable=False,
             ),
-        )
+        ),
+        CommandOption(
+            ["--jobs", "-j"],
+            type=IntRange(min=1),
+            default=1,
+            help="Number of files of a directory loaded at the same time.",
+            required=False,
+        ),
     ]
 
     @inject
@@ -51,14 +75,19 @@ class MettaLoad(Command):
         atomdb_backend: AtomdbBackend,
         database_loader_container_manager: DatabaseLoaderContainerManager,
         metta_syntax_container_manager: MettaSyntaxContainerManager,
+        mongodb_container_manager: MongodbContainerManager,
+        mork_loader_container_manager: MorkLoaderContainerManager,
         settings: Settings,
     ) -> None:
         super().__init__()
 
         self._settings = settings
         self._atomdb_backend = atomdb_backend
+        self._mongodb_container_manager = mongodb_container_manager
         self._database_loader_container_manager = database_loader_container_manager
+        self._mork_loader_container_manager = mork_loader_container_manager
         self._metta_syntax_container_manager = metta_syntax_container_manager
+        self._output_lock = threading.Lock()
 
     @ensure_container_running(
         "_atomdb_backend",
@@ -67,16 +96,50 @@ class MettaLoad(Command):
         ),
         verbose=True,
     )
-    def run(self, path: str):
+    def run(self, path: str, jobs: int = 1):
         self._settings.validate_configuration_file()
 
         self._check_path_exists(path)
 
-        self._load_metta(path)
+        with ExitStack() as stack:
+            durability_relaxed = False
+            restore_errors: list = []
+
+            try:
+                durability_relaxed = stack.enter_context(
+                    self._mongodb_container_manager.bulk_load_durability(
+                        on_restore_error=lambda e: self._show_restore_error(e, restore_errors)
+                    )
+                )
+            except PyMongoError as e:
+                self.stdout(
+                    f"Could not relax MongoDB durability for the bulk load: {e}",
+                    severity=StdoutSeverity.WARNING,
+                )
+
+            if durability_relaxed:
+                self.stdout("MongoDB journaling and checkpoints relaxed for the bulk load.")
+
+            self._load_metta(path, jobs)
 
-    def _load_metta(self, path: str):
+        if durability_relaxed and not restore_errors:
+            self.stdout("MongoDB durability settings restored.")
+
+    def _show_restore_error(self, error: PyMongoError, restore_errors: list):
+        restore_errors.append(error)
+
+        self.stdout(
+            f"Could not restore the MongoDB durability settings after the bulk load: {error}\n"
+            "Restart MongoDB to bring journalCommitInterval and syncdelay back to their defaults.",
+            severity=StdoutSeverity.WARNING,
+        )
+
+    def _load_metta(self, path: str, jobs: int = 1):
         if self._check_if_file_or_directory(path):
-            self._load_metta_from_directory(path)
+            if jobs > 1:
+                self._load_metta_from_directory_in_parallel(path, jobs)
+            else:
+                self._load_metta_from_directory(path)
         else:
             self._load_metta_from_file(path)
 
@@ -85,6 +148,18 @@ class MettaLoad(Command):
                 severity=StdoutSeverity.SUCCESS,
             )
 
+    def _get_loader_container_manager(
+        self,
+    ) -> DatabaseLoaderContainerManager | MorkLoaderContainerManager:
+        # MorkDB backends ingest the files through the Mork loader instead of the generic db_loader.
+        if any(
+            isinstance(provider, MorkMongoDBBackend)
+            for provider in self._atomdb_backend.get_active_providers()
+        ):
+            return self._mork_loader_container_manager
+
+        return self._database_loader_container_manager
+
     def _check_path_exists(self, file_path: str):
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"The specified file path '{file_path}' does not exist.")
@@ -132,7 +207,7 @@ class MettaLoad(Command):
             severity=StdoutSeverity.SUCCESS,
         )
 
-        self._database_loader_container_manager.start_container(file_path)
+        self._get_loader_container_manager().start_container(file_path)
 
     def _load_metta_from_directory(self, directory_path: str):
         self._check_if_directory_has_permissions(directory_path)
@@ -154,6 +229,120 @@ class MettaLoad(Command):
                     severity=StdoutSeverity.ERROR,
                 )
 
+    def _load_file_job(self, file_path: str, job_id: str) -> dict:
+        # Each job gets its own containers; their logs are not streamed, as they would interleave.
+        started_at = time.monotonic()
+        syntax_manager = self._metta_syntax_container_manager.for_job(job_id)
+        loader_manager = self._get_loader_container_manager().for_job(job_id)
+
+        try:
+            self._check_file_and_permissions(file_path)
+
+            try:
+                syntax_manager.start_container(file_path, follow_logs=False)
+            except DockerError:
+                raise DockerError(
+                    f"Syntax validation failed for '{file_path}'. "
+                    "The file contains invalid MeTTa syntax."
+                )
+            finally:
+                try:
+                    syntax_manager.stop()
+                except (DockerContainerNotFoundError, DockerError):
+                    pass
+
+            loader_manager.start_container(file_path, follow_logs=False)
+        except Exception as e:
+            return {
+                "file": file_path,
+                "loaded": False,
+                "error": str(e),
+                "duration_seconds": round(time.monotonic() - started_at, 3),
+            }
+        finally:
+            # The loader only removes its container once it exits on its own.
+            try:
+                loader_manager.stop(force=True)
+            except (DockerContainerNotFoundError, DockerError):
+                pass
+
+        return {
+            "file": file_path,
+            "loaded": True,
+            "error": None,
+            "duration_seconds": round(time.monotonic() - started_at, 3),
+        }
+
+    def _remove_leftover_job_containers(self):
+        # Job containers are named "<name>-<pid>-<index>"; the ones whose das-cli process is
+        # gone were left behind by a run that was killed before it could remove them.
+        for manager in (self._metta_syntax_container_manager, self._get_loader_container_manager()):
+            job_name = re.compile(rf"^{re.escape(manager.get_container().name)}-(\d+)-\d+$")
+
+            for container_name in manager.list_job_container_names():
+                match = job_name.match(container_name)
+
+                if match and not self._is_process_alive(int(match.group(1))):
+                    try:
+                        manager.remove_container(container_name)
+                    except (DockerContainerNotFoundError, DockerError):
+                        pass
+
+    def _is_process_alive(self, pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+
+        return True
+
+    def _load_metta_from_directory_in_parallel(self, directory_path: str, jobs: int):
+        self._check_if_directory_has_permissions(directory_path)
+        self._remove_leftover_job_containers()
+
+        files = glob.glob(f"{directory_path}/*")
+        # At most a couple of files per worker are queued, the rest wait to be submitted.
+        queue_slots = threading.BoundedSemaphore(jobs * 2)
+        futures = []
+
+        self.stdout(f"Loading {len(files)} files from {directory_path} with {jobs} jobs...")
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            for index, file_path in enumerate(files):
+                queue_slots.acquire()
+
+                future = executor.submit(self._load_file_job, file_path, f"{os.getpid()}-{index}")
+                future.add_done_callback(lambda _: queue_slots.release())
+                future.add_done_callback(lambda done: self._show_file_result(done.result()))
+                futures.append(future)
+
+        results = [future.result() for future in futures]
+        loaded = sum(1 for result in results if result["loaded"])
+
+        self.stdout(
+            f"Loaded {loaded} of {len(results)} files.",
+            severity=StdoutSeverity.SUCCESS if loaded == len(results) else StdoutSeverity.WARNING,
+        )
+
+    def _show_file_result(self, result: dict):
+        # Results are reported from the worker threads as each file finishes.
+        with self._output_lock:
+            self._print_file_result(result)
+
+    def _print_file_result(self, result: dict):
+        if result["loaded"]:
+            self.stdout(
+                f"Done loading {result['file']} in {result['duration_seconds']:.1f}s.",
+                severity=StdoutSeverity.SUCCESS,
+            )
+        else:
+            self.stdout(
+                f"Failed loading file {result['file']}.\nReason: {result['error']}",
+                severity=StdoutSeverity.ERROR,
+            )
+
 
 class MettaCheck(Command):
     name = "check"
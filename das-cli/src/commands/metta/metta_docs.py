@@ -5,7 +5,7 @@ NAME
 
 SYNOPSIS
 
-    das-cli metta load <path>
+    das-cli metta load <path> [--jobs N]
 
 DESCRIPTION
 
@@ -18,6 +18,20 @@ DESCRIPTION
     This operation requires that the MongoDB and Redis services are running.
     Use 'das-cli db start' to start the necessary containers before loading.
 
+    When the AtomDB backend is MorkDB ('atomdb.type' set to 'morkdb', or an adapterdb
+    whose 'atomdb_backend.type' is 'morkdb'), each file is handed to the Mork loader
+    image, which ingests it through MorkDB's own bulk import, instead of the generic
+    DAS loader. The MorkDB and MongoDB services must be running.
+
+    When 'atomdb.mongodb.profile' is set to 'bulk-load', MongoDB's journal commit interval
+    and checkpoint delay are raised while the files are loaded and restored afterwards.
+
+    With --jobs greater than 1, the files of a directory are loaded by up to N loader
+    containers at the same time, each with its own name. The loader logs are not shown
+    in this mode; the result and time of each file are reported as it finishes, and the
+    last lines of the log are included when a file fails. Containers left behind by a
+    parallel load that was killed are removed when the next one starts.
+
 ARGUMENTS
 
     <path>
@@ -25,6 +39,12 @@ ARGUMENTS
         Absolute path to a .metta file or directory containing .metta files.
         Relative paths are not supported.
 
+OPTIONS
+
+    --jobs, -j N
+
+        Number of files of a directory loaded at the same time. Defaults to 1.
+
 EXAMPLES
 
     Load a single MeTTa file into the database:
@@ -34,6 +54,10 @@ EXAMPLES
     Load all MeTTa files in a directory:
 
         $ das-cli metta load /absolute/path/to/mettas-directory
+
+    Load the files of a directory four at a time:
+
+        $ das-cli metta load /absolute/path/to/mettas-directory --jobs 4
 """
 
 SHORT_HELP_LOAD = "Load a MeTTa file into the databases."
@@ -2,18 +2,22 @@ import os
 
 from common import Module
 from common.config.store import JsonConfigStore
+from common.container_manager.atomdb.mongodb_container_manager import MongodbContainerManager
 from common.container_manager.atomdb.morkdb_container_manager import MorkdbContainerManager
 from common.container_manager.metta.database_loader_container_manager import (
     DatabaseLoaderContainerManager,
 )
+from common.container_manager.metta.mork_loader_container_manager import MorkLoaderContainerManager
 from common.factory.atomdb.atomdb_backend import AtomdbBackend
 from common.factory.atomdb.atomdb_factory import (
     AtomDbContainerManagerFactory,
     MorkDbContainerManagerFactory,
 )
+from common.factory.atomdb.mongodb_manager_factory import MongoDbContainerManagerFactory
 from common.factory.metta.database_loader_manager_factory import (
     DatabaseLoaderContainerManagerFactory,
 )
+from common.factory.metta.mork_loader_manager_factory import MorkLoaderContainerManagerFactory
 from settings.config import SECRETS_PATH
 
 from .metta_cli import MettaCli, Settings
@@ -30,7 +34,9 @@ class MettaModule(Module):
         self._dependency_list = [
             (AtomdbBackend, AtomDbContainerManagerFactory().build()),
             (DatabaseLoaderContainerManager, DatabaseLoaderContainerManagerFactory().build()),
+            (MorkLoaderContainerManager, MorkLoaderContainerManagerFactory().build()),
             (MorkdbContainerManager, MorkDbContainerManagerFactory().build()),
+            (MongodbContainerManager, MongoDbContainerManagerFactory().build()),
             (
                 Settings,
                 self._settings,
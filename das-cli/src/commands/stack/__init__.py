@@ -0,0 +1,3 @@
+from .stack_module import DownModule, UpModule
+
+__all__ = ["UpModule", "DownModule"]
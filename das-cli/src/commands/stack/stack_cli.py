@@ -0,0 +1,288 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+import click
+from injector import inject
+
+from commands.batch.batch_cli import run_in_process, run_in_process_collected
+from common import (
+    CommandArgument,
+    CommandGroup,
+    CommandOption,
+    Settings,
+    StdoutSeverity,
+    StdoutType,
+)
+from common.exceptions import PortRangeOverlapError
+from common.network import is_port_reachable
+from common.port_scanner import find_port_range_overlaps, get_configured_port_ranges
+
+from .stack_docs import HELP_DOWN, HELP_UP, SHORT_HELP_DOWN, SHORT_HELP_UP
+from .stack_plan import StackService, build_stack, plan_stages
+
+READINESS_POLL_INTERVAL = 0.5
+
+
+class StackError(Exception):
+    """Raised when one or more services of 'up' or 'down' failed."""
+
+    def __init__(self, action: str, failed_services: List[str]):
+        self.failed_services = failed_services
+        super().__init__(f"'{action}' failed for: {', '.join(failed_services)}.")
+
+
+class StackCommand(CommandGroup):
+    """Runs the start or stop command of every service, stage by stage."""
+
+    action: str
+
+    def _run_service_command(self, root: click.Command, args: List[str]) -> Tuple[int, Any]:
+        # In json or yaml mode each service command runs in that format too, and its output
+        # goes into the service result, so the whole run prints one document that can be parsed.
+        if self.output_format == "plain":
+            return run_in_process(root, args), None
+
+        return run_in_process_collected(root, args, self.output_format)
+
+    def __init__(self, settings: Settings) -> None:
+        super().__init__()
+        self._settings = settings
+        self.override_group_command()
+
+        # There are no subcommands, so options are also accepted after the service names.
+        self.group.allow_interspersed_args = True
+        self.group.subcommand_metavar = ""
+
+    def _run_stages(
+        self,
+        stages: List[List[str]],
+        run_service: Callable[[str], Dict[str, Any]],
+        stop_on_failure: bool,
+    ) -> Tuple[List[dict], List[str]]:
+        stage_results = []
+        failed_services: List[str] = []
+
+        for index, stage in enumerate(stages, start=1):
+            self.stdout(f"[stage {index}/{len(stages)}] {self.action}: {', '.join(stage)}")
+
+            stage_started_at = time.monotonic()
+
+            with ThreadPoolExecutor(max_workers=len(stage)) as executor:
+                results = list(executor.map(run_service, stage))
+
+            stage_duration = round(time.monotonic() - stage_started_at, 3)
+
+            for result in results:
+                if result["ok"]:
+                    self.stdout(
+                        f"[stage {index}/{len(stages)}] {result['service']}: {result['message']}",
+                        severity=StdoutSeverity.SUCCESS,
+                    )
+                else:
+                    failed_services.append(result["service"])
+                    self.stdout(
+                        f"[stage {index}/{len(stages)}] {result['service']}: {result['message']}",
+                        severity=StdoutSeverity.ERROR,
+                    )
+
+            self.stdout(f"[stage {index}/{len(stages)}] done in {stage_duration:.2f}s")
+
+            stage_results.append(
+                {
+                    "stage": index,
+                    "services": results,
+                    "duration_seconds": stage_duration,
+                }
+            )
+
+            if failed_services and stop_on_failure:
+                break
+
+        return stage_results, failed_services
+
+    def _run(
+        self,
+        services: List[str],
+        run_service: Callable[[StackService], Dict[str, Any]],
+        reverse: bool,
+    ) -> None:
+        stack = build_stack(self._settings)
+        stages = plan_stages(stack, list(services), reverse=reverse)
+
+        started_at = time.monotonic()
+        stage_results, failed_services = self._run_stages(
+            stages,
+            lambda name: run_service(stack[name]),
+            stop_on_failure=not reverse,
+        )
+        total_duration = round(time.monotonic() - started_at, 3)
+
+        self.stdout(
+            f"\n{self.action.capitalize()} {sum(len(stage) for stage in stages)} service(s) "
+            f"in {len(stages)} stage(s) in {total_duration:.2f}s, {len(failed_services)} failed.",
+            severity=StdoutSeverity.ERROR if failed_services else StdoutSeverity.SUCCESS,
+        )
+        self.stdout(
+            {
+                "action": self.action,
+                "stages": stage_results,
+                "failed_services": failed_services,
+                "total_duration_seconds": total_duration,
+            },
+            stdout_type=StdoutType.MACHINE_READABLE,
+        )
+
+        if failed_services:
+            raise StackError(self.action, failed_services)
+
+
+class UpCli(StackCommand):
+    name = "up"
+
+    action = "up"
+
+    short_help = SHORT_HELP_UP
+
+    help = HELP_UP
+
+    params = [
+        CommandArgument(
+            ["services"],
+            nargs=-1,
+            required=False,
+        ),
+        CommandOption(
+            ["--ready-timeout"],
+            type=float,
+            default=180.0,
+            help="Seconds to wait for each service to accept connections once started.",
+            required=False,
+        ),
+        *CommandGroup.default_params,
+    ]
+
+    @inject
+    def __init__(self, settings: Settings) -> None:
+        super().__init__(settings)
+
+    @staticmethod
+    def _wait_until_ready(service: StackService, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        pending = list(service["endpoints"])
+
+        while pending:
+            pending = [endpoint for endpoint in pending if not is_port_reachable(*endpoint)]
+
+            if not pending:
+                break
+
+            if time.monotonic() >= deadline:
+                return False
+
+            time.sleep(READINESS_POLL_INTERVAL)
+
+        return True
+
+    def _start_service(self, root: click.Command, service: StackService, timeout: float) -> dict:
+        started_at = time.monotonic()
+        exit_code, output = self._run_service_command(root, service["start_args"])
+        start_duration = round(time.monotonic() - started_at, 3)
+
+        if exit_code != 0:
+            return {
+                "service": service["name"],
+                "ok": False,
+                "exit_code": exit_code,
+                "start_seconds": start_duration,
+                "ready_seconds": None,
+                "message": f"failed with exit code {exit_code} after {start_duration:.2f}s",
+                "output": output,
+            }
+
+        ready = self._wait_until_ready(service, timeout)
+        ready_duration = round(time.monotonic() - started_at - start_duration, 3)
+        endpoints = ", ".join(f"{host}:{port}" for host, port in service["endpoints"])
+
+        return {
+            "service": service["name"],
+            "ok": ready,
+            "exit_code": exit_code,
+            "start_seconds": start_duration,
+            "ready_seconds": ready_duration if ready else None,
+            "message": (
+                f"started in {start_duration:.2f}s, ready after {ready_duration:.2f}s"
+                if ready
+                else f"started but {endpoints} not reachable after {timeout:.0f}s"
+            ),
+            "output": output,
+        }
+
+    def run(self, services: Tuple[str, ...] = (), ready_timeout: float = 180.0) -> None:
+        self._settings.validate_configuration_file()
+
+        # Conflicting port reservations are reported before any container starts.
+        overlaps = find_port_range_overlaps(get_configured_port_ranges(self._settings))
+
+        if overlaps:
+            raise PortRangeOverlapError(overlaps)
+
+        root = click.get_current_context().find_root().command
+
+        self._run(
+            list(services),
+            lambda service: self._start_service(root, service, ready_timeout),
+            reverse=False,
+        )
+
+
+class DownCli(StackCommand):
+    name = "down"
+
+    action = "down"
+
+    short_help = SHORT_HELP_DOWN
+
+    help = HELP_DOWN
+
+    params = [
+        CommandArgument(
+            ["services"],
+            nargs=-1,
+            required=False,
+        ),
+        *CommandGroup.default_params,
+    ]
+
+    @inject
+    def __init__(self, settings: Settings) -> None:
+        super().__init__(settings)
+
+    def _stop_service(self, root: click.Command, service: StackService) -> dict:
+        started_at = time.monotonic()
+        exit_code, output = self._run_service_command(root, service["stop_args"])
+        duration = round(time.monotonic() - started_at, 3)
+
+        return {
+            "service": service["name"],
+            "ok": exit_code == 0,
+            "exit_code": exit_code,
+            "stop_seconds": duration,
+            "message": (
+                f"stopped in {duration:.2f}s"
+                if exit_code == 0
+                else f"failed with exit code {exit_code} after {duration:.2f}s"
+            ),
+            "output": output,
+        }
+
+    def run(self, services: Tuple[str, ...] = ()) -> None:
+        self._settings.validate_configuration_file()
+
+        root = click.get_current_context().find_root().command
+
+        self._run(
+            list(services),
+            lambda service: self._stop_service(root, service),
+            reverse=True,
+        )
@@ -0,0 +1,87 @@
+HELP_UP = """
+NAME
+
+    up - Start the DAS stack in dependency order
+
+SYNOPSIS
+
+    das-cli up [SERVICES...] [--ready-timeout SECONDS]
+
+DESCRIPTION
+
+    Starts the services of the current configuration in stages: the AtomDB databases, then the attention broker, then the query agent, the AtomDB broker and the command router, and finally the agents that peer with the query agent.
+
+    The services of a stage start concurrently. The next stage only starts once every service of the current one accepts TCP connections on its configured endpoint, so no service is started before the ones it depends on are ready.
+
+    When service names are given, only those services and the services they depend on are started. Services already running are left as they are.
+
+    Before anything starts, the ports reserved by the agents (their endpoints and 'ports_range' spans) are checked for overlaps, and any conflict is reported as an error.
+
+    If a service fails to start or does not become ready in time, the remaining stages are not started and the command exits with an error. The time taken by each service and stage is reported, also as JSON with --output-format json. In that format, the output of each service's start command is included in its "output" field, so the command prints a single document.
+
+    Available services: atomdb, attention-broker, query-agent, atomdb-broker, command-router, link-creation-agent, inference-agent, evolution-agent and context-broker. Services not present in the configuration are skipped.
+
+OPTIONS
+
+    SERVICES
+
+        Names of the services to start, along with their dependencies. Defaults to every service.
+
+    --ready-timeout SECONDS
+
+        Seconds to wait for each service to accept connections once started. Defaults to 180.
+
+EXAMPLES
+
+    Start the whole stack:
+
+        $ das-cli up
+
+    Start the query agent and everything it depends on:
+
+        $ das-cli up query-agent
+
+    Start the stack and report the timings as JSON:
+
+        $ das-cli up -o json
+"""
+
+SHORT_HELP_UP = "Start the DAS stack in dependency order."
+
+HELP_DOWN = """
+NAME
+
+    down - Stop the DAS stack in reverse dependency order
+
+SYNOPSIS
+
+    das-cli down [SERVICES...]
+
+DESCRIPTION
+
+    Stops the services of the current configuration in the reverse order 'das-cli up' starts them: the agents first and the AtomDB databases last. The services of a stage are stopped concurrently.
+
+    When service names are given, only those services and the services depending on them are stopped.
+
+    A service that fails to stop does not keep the following stages from being stopped; the command exits with an error once every stage ran.
+
+    With --output-format json, the timings and the output of each service's stop command are printed as a single document.
+
+OPTIONS
+
+    SERVICES
+
+        Names of the services to stop, along with the services depending on them. Defaults to every service.
+
+EXAMPLES
+
+    Stop the whole stack:
+
+        $ das-cli down
+
+    Stop the attention broker and the services that depend on it:
+
+        $ das-cli down attention-broker
+"""
+
+SHORT_HELP_DOWN = "Stop the DAS stack in reverse dependency order."
@@ -0,0 +1,39 @@
+import os
+
+from common import Module
+from common.config.store import JsonConfigStore
+from settings.config import SECRETS_PATH
+
+from .stack_cli import DownCli, Settings, UpCli
+
+
+class UpModule(Module):
+    _instance = UpCli
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self._settings = Settings(store=JsonConfigStore(os.path.expanduser(SECRETS_PATH)))
+
+        self._dependency_list = [
+            (
+                Settings,
+                self._settings,
+            ),
+        ]
+
+
+class DownModule(Module):
+    _instance = DownCli
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self._settings = Settings(store=JsonConfigStore(os.path.expanduser(SECRETS_PATH)))
+
+        self._dependency_list = [
+            (
+                Settings,
+                self._settings,
+            ),
+        ]
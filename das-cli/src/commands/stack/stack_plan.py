@@ -0,0 +1,186 @@
+from typing import Dict, List, Optional, Tuple, TypedDict
+
+from common import Settings
+from common.utils import extract_service_hostname, extract_service_port
+
+
+class StackService(TypedDict):
+    name: str
+    start_args: List[str]
+    stop_args: List[str]
+    depends_on: List[str]
+    endpoints: List[Tuple[str, int]]
+
+
+# Bus node services started by 'das-cli up': (command, config path, dependencies, peers with the query agent)
+BUS_NODE_SERVICES = [
+    ("query-agent", "agents.query", ["atomdb", "attention-broker"], False),
+    ("atomdb-broker", "agents.atomdb", ["atomdb"], False),
+    ("command-router", "agents.command_router", ["atomdb"], False),
+    ("link-creation-agent", "agents.link_creation", ["query-agent"], True),
+    ("inference-agent", "agents.inference", ["attention-broker", "query-agent"], True),
+    ("evolution-agent", "agents.evolution", ["query-agent"], True),
+    ("context-broker", "agents.context", ["query-agent"], True),
+]
+
+
+def _get_endpoint(settings: Settings, path: str) -> Optional[Tuple[str, int]]:
+    endpoint = settings.get(f"{path}.endpoint", None)
+    port = extract_service_port(endpoint) if endpoint else None
+
+    if port is None:
+        return None
+
+    return extract_service_hostname(endpoint) or "localhost", port
+
+
+def _get_atomdb_endpoints(settings: Settings) -> Optional[List[Tuple[str, int]]]:
+    atomdb_type = settings.get("atomdb.type", "redismongodb")
+    atomdb_path = "atomdb"
+
+    if atomdb_type == "adapterdb":
+        atomdb_type = settings.get("atomdb.adapterdb.atomdb_backend.type", "morkdb")
+        atomdb_path = "atomdb.adapterdb.atomdb_backend"
+
+    databases = {
+        "redismongodb": ["redis", "mongodb"],
+        "morkdb": ["mongodb", "morkdb"],
+    }.get(atomdb_type)
+
+    if databases is None:
+        return None
+
+    endpoints = [_get_endpoint(settings, f"{atomdb_path}.{database}") for database in databases]
+
+    return [endpoint for endpoint in endpoints if endpoint]
+
+
+def build_stack(settings: Settings) -> Dict[str, StackService]:
+    """
+    Builds the services of the DAS stack found in the configuration, with the
+    services each one depends on and the endpoints that tell it is ready.
+    """
+    services: Dict[str, StackService] = {}
+    atomdb_endpoints = _get_atomdb_endpoints(settings)
+
+    # InMemoryDB and RemoteDB have no containers to manage.
+    if atomdb_endpoints is not None:
+        services["atomdb"] = {
+            "name": "atomdb",
+            "start_args": ["db", "start"],
+            "stop_args": ["db", "stop"],
+            "depends_on": [],
+            "endpoints": atomdb_endpoints,
+        }
+
+    attention_endpoint = _get_endpoint(settings, "agents.attention")
+
+    if attention_endpoint:
+        services["attention-broker"] = {
+            "name": "attention-broker",
+            "start_args": ["attention-broker", "start"],
+            "stop_args": ["attention-broker", "stop"],
+            "depends_on": ["atomdb"],
+            "endpoints": [attention_endpoint],
+        }
+
+    query_endpoint = _get_endpoint(settings, "agents.query")
+
+    for name, path, depends_on, uses_query_peer in BUS_NODE_SERVICES:
+        endpoint = _get_endpoint(settings, path)
+
+        if not endpoint or (uses_query_peer and not query_endpoint):
+            continue
+
+        start_args = [name, "start"]
+        ports_range = settings.get(f"{path}.ports_range", None)
+
+        if ports_range:
+            start_args += ["--port-range", str(ports_range)]
+
+        if uses_query_peer and query_endpoint:
+            start_args += [
+                "--peer-hostname",
+                query_endpoint[0],
+                "--peer-port",
+                str(query_endpoint[1]),
+            ]
+
+        services[name] = {
+            "name": name,
+            "start_args": start_args,
+            "stop_args": [name, "stop"],
+            "depends_on": depends_on,
+            "endpoints": [endpoint],
+        }
+
+    # Dependencies on services the configuration does not have are dropped.
+    for service in services.values():
+        service["depends_on"] = [name for name in service["depends_on"] if name in services]
+
+    return services
+
+
+def _select_services(
+    services: Dict[str, StackService],
+    selected: List[str],
+    reverse: bool,
+) -> List[str]:
+    unknown = [name for name in selected if name not in services]
+
+    if unknown:
+        raise ValueError(
+            f"Unknown service(s): {', '.join(unknown)}. Available services: {', '.join(services)}"
+        )
+
+    dependents: Dict[str, List[str]] = {name: [] for name in services}
+
+    for service in services.values():
+        for dependency in service["depends_on"]:
+            dependents[dependency].append(service["name"])
+
+    # Starting a service needs its dependencies, stopping one takes down its dependents.
+    pending = list(selected)
+    included = set()
+
+    while pending:
+        name = pending.pop()
+
+        if name in included:
+            continue
+
+        included.add(name)
+        pending.extend(dependents[name] if reverse else services[name]["depends_on"])
+
+    return [name for name in services if name in included]
+
+
+def plan_stages(
+    services: Dict[str, StackService],
+    selected: Optional[List[str]] = None,
+    reverse: bool = False,
+) -> List[List[str]]:
+    """
+    Groups the services in stages: every service only depends on services of
+    earlier stages, so the services of a stage can start concurrently. With
+    reverse, the stages are returned in stop order.
+    """
+    names = _select_services(services, selected, reverse) if selected else list(services)
+    remaining = {name: set(services[name]["depends_on"]) & set(names) for name in names}
+    stages: List[List[str]] = []
+
+    while remaining:
+        stage = [name for name, depends_on in remaining.items() if not depends_on]
+
+        if not stage:
+            raise ValueError(f"Circular dependency between services: {', '.join(remaining)}")
+
+        stages.append(stage)
+
+        for name in stage:
+            del remaining[name]
+
+        for depends_on in remaining.values():
+            depends_on.difference_update(stage)
+
+    return list(reversed(stages)) if reverse else stages
@@ -1,26 +1,47 @@
+import json
 import os
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 
 from injector import inject
 
-from common import Command, CommandGroup, CommandOption, Settings, StdoutType
+from common import Command, CommandGroup, CommandOption, FloatRange, Settings, StdoutType, logger
+from common.cluster_hosts import ClusterHost, discover_cluster_hosts
+from common.container_manager.atomdb.mongodb_container_manager import MongodbContainerManager
+from common.container_manager.atomdb.redis_container_manager import RedisContainerManager
 from common.container_manager.system_containers_manager import (
     SystemContainersManager,
 )
+from common.factory.atomdb.atomdb_backend import (
+    AtomdbBackend,
+    MongoDBRedisBackend,
+    MorkMongoDBBackend,
+)
+from common.network import is_local_host
+from common.prompt_types import DurationType
+from common.ssh_pool import discard_ssh_connection, get_ssh_connection
+from common.systemutils.metrics_history import MetricsHistory
+from common.systemutils.openmetrics_exporter import CachedCollector, OpenMetricsExporter
 from common.systemutils.sys_info import (
     SystemInfoExtractor,
 )
 from common.utils import print_table
 
 from .system_docs import (
+    HELP_EXPORTER,
     HELP_STATUS,
     HELP_SYSTEM,
+    SHORT_HELP_EXPORTER,
     SHORT_HELP_STATUS,
     SHORT_HELP_SYSTEM,
 )
 
 
+HISTORY_TABLE_MAX_ROWS = 60
+
+
 class SystemStatus(Command):
 
     name = "status"
@@ -45,19 +66,40 @@ class SystemStatus(Command):
             default=2,
             required=False,
         ),
+        CommandOption(
+            ["--history"],
+            help="Shows the recorded metrics for the given period (e.g. 30s, 15m, 1h, 7d) instead of the current instant.",
+            type=DurationType(),
+            default=None,
+            required=False,
+        ),
+        CommandOption(
+            ["--all-nodes"],
+            help="Shows the status of every host found in the configuration (database nodes and agent endpoints), queried concurrently.",
+            default=False,
+            required=False,
+            is_flag=True,
+        ),
     ]
 
+    # Upper bound of hosts queried at the same time with --all-nodes.
+    MAX_PARALLEL_NODES = 16
+
+    REMOTE_STATUS_COMMAND = "das-cli system status -o json"
+
     @inject
     def __init__(
         self,
         settings: Settings,
         system_containers_manager: SystemContainersManager,
         sysinfo_extractor: SystemInfoExtractor,
+        metrics_history: MetricsHistory,
     ) -> None:
 
         self._system_containers_manager = system_containers_manager
         self._sysinfo = sysinfo_extractor
         self._settings = settings
+        self._metrics_history = metrics_history
 
         super().__init__()
 
@@ -65,10 +107,23 @@ class SystemStatus(Command):
         self,
         stream: bool = False,
         cooldown: int = 2,
+        history: int | None = None,
+        all_nodes: bool = False,
     ) -> None:
 
         self._settings.validate_configuration_file()
 
+        if all_nodes:
+            if stream or history is not None:
+                raise ValueError("--all-nodes cannot be combined with --stream or --history")
+
+            self._show_all_nodes()
+            return
+
+        if history is not None:
+            self._show_history(history)
+            return
+
         if stream:
 
             if cooldown < 2:
@@ -88,19 +143,199 @@ class SystemStatus(Command):
 
     def _collect_snapshot(self) -> dict:
 
+        # The CPU measurement window overlaps the Docker stats collection instead of
+        # blocking on its own, so a snapshot takes as long as its slowest I/O.
+        self._sysinfo.start_cpu_sample()
+
+        service_output = self._system_containers_manager.get_services_status()
+
         machine_info = {
-            "CPUInfo": self._sysinfo.get_cpu_info(interval=2),
+            "CPUInfo": self._sysinfo.get_cpu_info(),
             "MemoryInfo": self._sysinfo.get_memory_info(),
             "DisksInfo": self._sysinfo.get_disks_info(),
         }
 
-        service_output = self._system_containers_manager.get_services_status()
-
         return {
             "machineInfo": machine_info,
             "serviceInfo": service_output,
         }
 
+    def _collect_remote_snapshot(self, node: ClusterHost) -> dict:
+        connection = get_ssh_connection(node["host"], user=node["username"])
+
+        try:
+            result = connection.run(self.REMOTE_STATUS_COMMAND, hide=True, warn=True)
+        except Exception:
+            # Drop the broken session so a later call gets a fresh one.
+            discard_ssh_connection(connection)
+            raise
+
+        if result.exited != 0:
+            raise RuntimeError(
+                (result.stderr or result.stdout).strip()
+                or f"'{self.REMOTE_STATUS_COMMAND}' exited with code {result.exited}"
+            )
+
+        for entry in json.loads(result.stdout):
+            if isinstance(entry, dict) and "machineInfo" in entry:
+                return entry
+
+        raise ValueError("Remote das-cli returned no system status")
+
+    def _collect_node_status(self, node: ClusterHost) -> dict:
+        started_at = time.monotonic()
+        status = None
+        error = None
+
+        try:
+            if is_local_host(node["host"]):
+                status = self._collect_snapshot()
+            else:
+                status = self._collect_remote_snapshot(node)
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+
+        return {
+            "username": node["username"],
+            "roles": node["roles"],
+            "latency_ms": round((time.monotonic() - started_at) * 1000, 1),
+            "error": error,
+            "status": status,
+        }
+
+    def _show_all_nodes(self) -> None:
+        nodes = discover_cluster_hosts(self._settings)
+
+        if not nodes:
+            self.stdout("No hosts found in the configuration.")
+            return
+
+        # Every host is queried at the same time over its own pooled SSH session, so the
+        # whole fan-out takes as long as the slowest host instead of the sum of all of them.
+        # The sessions stay in the pool, as later steps of a batch or 'up' may share them.
+        with ThreadPoolExecutor(max_workers=min(len(nodes), self.MAX_PARALLEL_NODES)) as executor:
+            results = list(executor.map(self._collect_node_status, nodes))
+
+        nodes_status = {node["host"]: result for node, result in zip(nodes, results)}
+
+        self.stdout(
+            nodes_status,
+            stdout_type=StdoutType.MACHINE_READABLE,
+        )
+
+        rows = []
+
+        for host, result in nodes_status.items():
+            status = result["status"] or {}
+            machine_info = status.get("machineInfo", {})
+            services = status.get("serviceInfo", {})
+
+            rows.append(
+                {
+                    "HOST": host,
+                    "ROLES": ",".join(result["roles"]),
+                    "LATENCY (ms)": result["latency_ms"],
+                    "CPU (Machine load / %)": machine_info.get("CPUInfo", {}).get("cpuUsage", "-"),
+                    "MEM USED (GB)": machine_info.get("MemoryInfo", {}).get("usedMemory", "-"),
+                    "SERVICES RUNNING": (
+                        sum(1 for info in services.values() if info.get("status") == "running")
+                        if status
+                        else "-"
+                    ),
+                    "ERROR": result["error"] or "-",
+                }
+            )
+
+        print_table(
+            rows,
+            columns=[
+                "HOST",
+                "ROLES",
+                "LATENCY (ms)",
+                "CPU (Machine load / %)",
+                "MEM USED (GB)",
+                "SERVICES RUNNING",
+                "ERROR",
+            ],
+            stdout=self.stdout,
+        )
+
+    def _record_history(self, system_info: dict) -> None:
+        try:
+            self._metrics_history.record(system_info)
+        except Exception as e:
+            logger().warning(f"Could not record metrics history: {e}")
+
+    def _show_history(self, duration: int) -> None:
+        history = self._metrics_history.query(duration)
+
+        self.stdout(
+            history,
+            stdout_type=StdoutType.MACHINE_READABLE,
+        )
+
+        # The table only shows a summary; the full series is in the machine readable output.
+        host_series = self._metrics_history.downsample(history["host"], HISTORY_TABLE_MAX_ROWS)
+        title = f"MACHINE HISTORY (resolution {history['resolution']}"
+
+        if len(host_series) < len(history["host"]):
+            title += f", {len(history['host'])} samples averaged into {len(host_series)} rows"
+
+        self.stdout(f"{title}):\n")
+
+        host_rows = []
+
+        for timestamp, cpu_percent, memory_used, disk_used in host_series:
+            host_rows.append(
+                {
+                    "TIME": datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S"),
+                    "CPU (Machine load / %)": cpu_percent,
+                    "MEM USED (GB)": memory_used,
+                    "DISK USED (GB)": disk_used,
+                }
+            )
+
+        print_table(
+            host_rows,
+            columns=[
+                "TIME",
+                "CPU (Machine load / %)",
+                "MEM USED (GB)",
+                "DISK USED (GB)",
+            ],
+            stdout=self.stdout,
+        )
+
+        self.stdout("\nSERVICES HISTORY:\n")
+
+        container_rows = []
+
+        for container_name, series in history["containers"].items():
+            cpu_values = [sample[1] for sample in series]
+            memory_values = [sample[2] for sample in series]
+
+            container_rows.append(
+                {
+                    "CONTAINER NAME": container_name,
+                    "SAMPLES": len(series),
+                    "CPU AVG (%)": round(sum(cpu_values) / len(cpu_values), 2),
+                    "CPU MAX (%)": max(cpu_values),
+                    "MEMORY MAX(GB)": max(memory_values),
+                }
+            )
+
+        print_table(
+            container_rows,
+            columns=[
+                "CONTAINER NAME",
+                "SAMPLES",
+                "CPU AVG (%)",
+                "CPU MAX (%)",
+                "MEMORY MAX(GB)",
+            ],
+            stdout=self.stdout,
+        )
+
     def _format_info_for_display(
         self,
         system_info: dict,
@@ -166,6 +401,7 @@ class SystemStatus(Command):
         container_rows = []
 
         for _, info in services.items():
+            cpu_limit, memory_limit = self._format_resource_limits(info.get("resources") or {})
 
             container_rows.append(
                 {
@@ -175,6 +411,8 @@ class SystemStatus(Command):
                     "AGE": info.get("age", "-"),
                     "CPU (Container %)": info.get("cpu_percent", 0),
                     "MEMORY(GB)": info.get("memory_mb", 0),
+                    "CPU LIMIT": cpu_limit,
+                    "MEM LIMIT(GB)": memory_limit,
                     "CONTAINER STATUS": info.get("status", "-"),
                     "SERVICE HEALTH": info.get("service_health", "-"),
                 }
@@ -189,12 +427,34 @@ class SystemStatus(Command):
                 "AGE",
                 "CPU (Container %)",
                 "MEMORY(GB)",
+                "CPU LIMIT",
+                "MEM LIMIT(GB)",
                 "CONTAINER STATUS",
                 "SERVICE HEALTH",
             ],
             stdout=self.stdout,
         )
 
+    @staticmethod
+    def _format_resource_limits(resources: dict) -> tuple[str, str]:
+        cpu_limits = []
+
+        if resources.get("cpuset_cpus"):
+            cpu_limits.append(f"cpus {resources['cpuset_cpus']}")
+
+        if resources.get("nano_cpus"):
+            cpu_limits.append(f"{resources['nano_cpus'] / 1_000_000_000:g} cores")
+
+        if resources.get("cpu_shares"):
+            cpu_limits.append(f"{resources['cpu_shares']} shares")
+
+        memory_limit = resources.get("mem_limit_bytes")
+
+        return (
+            ", ".join(cpu_limits) or "-",
+            f"{memory_limit / (1024**3):.2f}" if memory_limit else "-",
+        )
+
     def _run_stream(self, cooldown) -> None:
         latest_machine: dict[str, str] = {}
         latest_services: dict[str, str] = {}
@@ -220,6 +480,10 @@ class SystemStatus(Command):
                 except Exception as e:
                     print(f"[machine_loop] {e}")
 
+        # Container stats come from one long-lived stream per container, so this loop only
+        # refreshes the container list and reads the latest samples at the cooldown interval.
+        self._system_containers_manager.enable_stats_streams()
+
         def docker_loop():
 
             while True:
@@ -231,6 +495,8 @@ class SystemStatus(Command):
                 except Exception as e:
                     print(f"[docker_loop] {e}")
 
+                time.sleep(cooldown)
+
         threading.Thread(
             target=docker_loop,
             daemon=True,
@@ -251,6 +517,8 @@ class SystemStatus(Command):
                         "serviceInfo": dict(latest_services),
                     }
 
+                self._record_history(system_info)
+
                 os.system("clear")
 
                 self.stdout(system_info, stdout_type=StdoutType.MACHINE_READABLE, stream_mode=True)
@@ -259,6 +527,140 @@ class SystemStatus(Command):
 
         except KeyboardInterrupt:
             return
+        finally:
+            self._system_containers_manager.disable_stats_streams()
+
+
+class SystemExporter(Command):
+
+    name = "exporter"
+
+    short_help = SHORT_HELP_EXPORTER
+
+    help = HELP_EXPORTER
+
+    params = [
+        CommandOption(
+            ["--listen"],
+            help="Address and port the metrics endpoint listens on.",
+            default="0.0.0.0:9473",
+            required=False,
+        ),
+        CommandOption(
+            ["--interval"],
+            help="Seconds between refreshes of the host and container metrics.",
+            type=FloatRange(min=0, min_open=True),
+            default=5.0,
+            required=False,
+        ),
+        CommandOption(
+            ["--atomdb-interval"],
+            help="Seconds between refreshes of the AtomDB document and key counts.",
+            type=FloatRange(min=0, min_open=True),
+            default=30.0,
+            required=False,
+        ),
+    ]
+
+    @inject
+    def __init__(
+        self,
+        settings: Settings,
+        system_containers_manager: SystemContainersManager,
+        sysinfo_extractor: SystemInfoExtractor,
+        atomdb_backend: AtomdbBackend,
+        mongodb_container_manager: MongodbContainerManager,
+        redis_container_manager: RedisContainerManager,
+        metrics_history: MetricsHistory,
+    ) -> None:
+
+        self._settings = settings
+        self._system_containers_manager = system_containers_manager
+        self._sysinfo = sysinfo_extractor
+        self._metrics_history = metrics_history
+        self._atomdb_backend = atomdb_backend
+        self._mongodb_container_manager = mongodb_container_manager
+        self._redis_container_manager = redis_container_manager
+
+        super().__init__()
+
+    def _parse_listen_address(self, listen: str) -> tuple[str, int]:
+        host, _, port = listen.rpartition(":")
+
+        if not port.isdigit():
+            raise ValueError(
+                f"Invalid listen address '{listen}'. Expected HOST:PORT, e.g. 0.0.0.0:9473."
+            )
+
+        return host or "0.0.0.0", int(port)
+
+    def _record_history(self, system_info: dict) -> None:
+        # A failing history write must not take the metric out of the exporter.
+        try:
+            self._metrics_history.record(system_info)
+        except Exception as e:
+            logger().warning(f"Could not record metrics history: {e}")
+
+    def _collect_host(self) -> dict:
+        machine_info = {
+            "CPUInfo": self._sysinfo.get_cpu_info(interval=1),
+            "MemoryInfo": self._sysinfo.get_memory_info(),
+            "DisksInfo": self._sysinfo.get_disks_info(),
+        }
+        self._record_history({"machineInfo": machine_info})
+
+        return machine_info
+
+    def _collect_services(self) -> dict:
+        services_info = self._system_containers_manager.get_services_status()
+        self._record_history({"serviceInfo": services_info})
+
+        return services_info
+
+    def _collect_atomdb(self) -> dict:
+        atomdb_stats: dict = {}
+
+        for provider in self._atomdb_backend.get_active_providers():
+            if not isinstance(provider, (MongoDBRedisBackend, MorkMongoDBBackend)):
+                continue
+
+            atomdb_stats["collections"] = self._mongodb_container_manager.get_collection_stats()
+
+            if isinstance(provider, MongoDBRedisBackend):
+                atomdb_stats["redis_keys"] = self._redis_container_manager.get_key_stats()["keys"]
+
+        return atomdb_stats
+
+    def run(
+        self,
+        listen: str = "0.0.0.0:9473",
+        interval: float = 5.0,
+        atomdb_interval: float = 30.0,
+    ) -> None:
+        self._settings.validate_configuration_file()
+
+        host, port = self._parse_listen_address(listen)
+
+        # Each collector refreshes its cache on its own schedule, so a scrape only
+        # serializes the latest values and never waits on Docker or the databases.
+        self._system_containers_manager.enable_stats_streams()
+
+        exporter = OpenMetricsExporter(
+            [
+                CachedCollector("host", self._collect_host, interval),
+                CachedCollector("containers", self._collect_services, interval),
+                CachedCollector("atomdb", self._collect_atomdb, atomdb_interval),
+            ]
+        )
+
+        self.stdout(f"Serving OpenMetrics on http://{host}:{port}/metrics (press Ctrl+C to stop)")
+
+        try:
+            exporter.serve_forever(host, port)
+        except KeyboardInterrupt:
+            return
+        finally:
+            self._system_containers_manager.disable_stats_streams()
 
 
 class SystemCli(CommandGroup):
@@ -275,6 +677,7 @@ class SystemCli(CommandGroup):
     def __init__(
         self,
         system_status: SystemStatus,
+        system_exporter: SystemExporter,
     ) -> None:
 
         super().__init__()
@@ -282,5 +685,6 @@ class SystemCli(CommandGroup):
         self.add_commands(
             [
                 system_status,
+                system_exporter,
             ]
         )
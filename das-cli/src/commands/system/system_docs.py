@@ -5,21 +5,86 @@ NAME
 
 SYNOPSIS
 
-    das-cli system status
+    das-cli system status [--stream] [--cooldown SECONDS] [--history PERIOD] [--all-nodes]
 
 DESCRIPTION
 
     Shows the current status of the DAS system, including service health for all components.
 
+    The CPU LIMIT and MEM LIMIT(GB) columns show the limits applied from the 'resources' section
+    of each service (for example atomdb.mongodb.resources). A section may set cpuset_cpus, cpus,
+    cpu_shares and mem_limit, or be "auto" to pin the service to its own share of the cores of
+    the host it runs on. The cores of each host are split by weight among the "auto" services of
+    that host, and kept within one NUMA node when it fits. Remote database nodes are sized from
+    the CPU count reported by their Docker daemon.
+
+    While 'das-cli system exporter' or --stream runs, every refresh is recorded in a local
+    metrics history kept under ~/.das/metrics, downsampled into 1 second, 1 minute and 1 hour
+    resolutions. Use --history to read it back; keep the exporter running to build up history.
+    A single status read does not record anything. The table shows at most 60 rows, averaging
+    neighbouring samples when there are more; -o json returns every sample.
+
+    With --all-nodes, the status of every host found in the configuration (Redis and MongoDB
+    cluster nodes and agent endpoints) is collected concurrently, each remote host over a single
+    SSH session, and returned as one document keyed by host with the latency and error of each
+    one. The names of the local machine (localhost, 127.0.0.1, its hostname) are collected once.
+
 EXAMPLES
 
     Display system status:
 
         das-cli system status
+
+    Display the machine and service metrics recorded during the last hour:
+
+        das-cli system status --history 1h
+
+    Export the last 7 days of metrics as compact JSON arrays:
+
+        das-cli system status --history 7d -o json
+
+    Display the status of every configured host as a single JSON document:
+
+        das-cli system status --all-nodes -o json
 """
 
 SHORT_HELP_STATUS = "Show system status."
 
+HELP_EXPORTER = """
+NAME
+
+    das-cli system exporter - Serve DAS metrics in the OpenMetrics format.
+
+SYNOPSIS
+
+    das-cli system exporter [--listen HOST:PORT] [--interval SECONDS] [--atomdb-interval SECONDS]
+
+DESCRIPTION
+
+    Starts an HTTP endpoint at /metrics that a Prometheus compatible scraper can collect. It
+    exposes the machine CPU, memory and disk usage, the CPU, memory, restarts, health and uptime
+    of every container managed by das-cli, and the AtomDB document and key counts.
+
+    Metrics are refreshed in the background, each group on its own interval, and scrapes are
+    served from the latest values, so a slow Docker daemon or database never delays a scrape. The
+    das_exporter_collector_up metric tells whether each group was refreshed successfully.
+
+    The host and container samples are also recorded in the local metrics history read by
+    'das-cli system status --history'.
+
+EXAMPLES
+
+    Serve metrics on the default address (0.0.0.0:9473):
+
+        das-cli system exporter
+
+    Serve metrics on localhost only, refreshing the AtomDB counts every minute:
+
+        das-cli system exporter --listen 127.0.0.1:9473 --atomdb-interval 60
+"""
+
+SHORT_HELP_EXPORTER = "Serve DAS metrics in the OpenMetrics format."
+
 HELP_SYSTEM = """
 NAME
 
@@ -36,6 +101,7 @@ DESCRIPTION
 SUBCOMMANDS
 
     status - Show system status.
+    exporter - Serve DAS metrics in the OpenMetrics format.
 
 EXAMPLES
 
@@ -2,11 +2,18 @@ import os
 
 from common import Module
 from common.config.store import JsonConfigStore
+from common.container_manager.atomdb.mongodb_container_manager import MongodbContainerManager
+from common.container_manager.atomdb.redis_container_manager import RedisContainerManager
 from common.container_manager.system_containers_manager import SystemContainersManager
+from common.factory.atomdb.atomdb_backend import AtomdbBackend
+from common.factory.atomdb.atomdb_factory import AtomDbContainerManagerFactory
+from common.factory.atomdb.mongodb_manager_factory import MongoDbContainerManagerFactory
+from common.factory.atomdb.redis_manager_factory import RedisContainerManagerFactory
 from common.factory.system_containers_factory import SystemContainerManagerFactory
 from common.settings import Settings
+from common.systemutils.metrics_history import MetricsHistory
 from common.systemutils.sys_info import SystemInfoExtractor
-from settings.config import SECRETS_PATH
+from settings.config import METRICS_HISTORY_PATH, SECRETS_PATH
 
 from .system_cli import SystemCli
 
@@ -23,5 +30,9 @@ class SystemModule(Module):
         self._dependency_list = [
             (SystemContainersManager, SystemContainerManagerFactory().build()),
             (SystemInfoExtractor, self._system_extractor),
+            (MetricsHistory, MetricsHistory(METRICS_HISTORY_PATH)),
+            (MongodbContainerManager, MongoDbContainerManagerFactory().build()),
+            (RedisContainerManager, RedisContainerManagerFactory().build()),
+            (AtomdbBackend, AtomDbContainerManagerFactory().build()),
             (Settings, self._settings),
         ]
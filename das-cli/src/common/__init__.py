@@ -1,4 +1,4 @@
-from click import Choice, IntRange, Path
+from click import Choice, FloatRange, IntRange, Path
 
 from . import ssh
 from .command import (
@@ -48,6 +48,7 @@ __all__ = [
     "KeyValueType",
     "VersionType",
     "IntRange",
+    "FloatRange",
     "Path",
     "ReachableIpAddress",
     "RegexType",
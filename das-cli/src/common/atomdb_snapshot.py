@@ -0,0 +1,261 @@
+import copy
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, TypeVar
+
+import zstandard
+
+from common.container_manager.atomdb.mongodb_container_manager import MongodbContainerManager
+from common.container_manager.atomdb.redis_container_manager import RedisContainerManager
+from common.docker import ContainerManager
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+MANIFEST_FILE_NAME = "manifest.json"
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+ManagerType = TypeVar("ManagerType", bound=ContainerManager)
+
+
+def _get_zstd_threads(threads: int) -> int:
+    # zstandard takes -1 as "one worker per logical CPU".
+    return -1 if threads == 0 else threads
+
+
+def write_compressed(
+    chunks: Iterable[bytes], path: Path, level: int, threads: int
+) -> Dict[str, int]:
+    '''
+    Compresses a stream into a zstd file, spreading the compression over several
+    worker threads, and returns the raw and compressed sizes.
+    '''
+    compressor = zstandard.ZstdCompressor(level=level, threads=_get_zstd_threads(threads))
+    raw_bytes = 0
+
+    with open(path, "wb") as file, compressor.stream_writer(file, closefd=False) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+            raw_bytes += len(chunk)
+
+    return {"raw_bytes": raw_bytes, "compressed_bytes": path.stat().st_size}
+
+
+@contextmanager
+def open_compressed(path: Path) -> Iterator[BinaryIO]:
+    '''Opens a zstd file as a stream of its decompressed content.'''
+    with open(path, "rb") as file, zstandard.ZstdDecompressor().stream_reader(file) as reader:
+        yield reader
+
+
+def read_compressed(path: Path, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+    with open_compressed(path) as reader:
+        while chunk := reader.read(chunk_size):
+            yield chunk
+
+
+def _for_node(manager: ManagerType, node: dict) -> ManagerType:
+    # Each node gets its own copy, so concurrent nodes do not share the exec context.
+    node_manager = copy.copy(manager)
+    node_manager.set_exec_context(node.get("context"))
+
+    return node_manager
+
+
+def _run_concurrently(function, items: List[Any], jobs: int) -> List[Any]:
+    if not items:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(items)))) as executor:
+        return list(executor.map(function, items))
+
+
+def snapshot_redis(
+    manager: RedisContainerManager,
+    nodes: List[dict],
+    target_dir: Path,
+    level: int,
+    threads: int,
+    jobs: int,
+) -> Dict[str, Any]:
+    """Dumps the RDB of every Redis node at the same time, one compressed file per node."""
+
+    def dump_node(indexed_node) -> Dict[str, Any]:
+        index, node = indexed_node
+        file_name = f"redis-{index}.rdb.zst"
+        started_at = time.monotonic()
+        sizes = write_compressed(
+            _for_node(manager, node).dump_rdb(), target_dir / file_name, level, threads
+        )
+
+        return {
+            "node": node.get("ip"),
+            "file": file_name,
+            **sizes,
+            "duration_seconds": round(time.monotonic() - started_at, 3),
+        }
+
+    return {
+        "cluster": manager.is_cluster,
+        "nodes": _run_concurrently(dump_node, list(enumerate(nodes)), jobs),
+    }
+
+
+def snapshot_mongodb(
+    manager: MongodbContainerManager,
+    target_dir: Path,
+    level: int,
+    threads: int,
+    jobs: int,
+) -> Dict[str, Any]:
+    """
+    Dumps every AtomDB collection as raw BSON, one compressed file per collection.
+    On a replica set the collections are read in turn through one snapshot session,
+    as sessions cannot be shared between threads; a standalone server has no
+    snapshot reads, so its collections are dumped concurrently.
+    """
+
+    def dump_collection(collection_name: str, session=None) -> Dict[str, Any]:
+        file_name = f"mongodb-{collection_name}.bson.zst"
+        started_at = time.monotonic()
+        documents = 0
+
+        def counted(chunks: Iterable[bytes]) -> Iterator[bytes]:
+            nonlocal documents
+
+            for chunk in chunks:
+                documents += 1
+                yield chunk
+
+        sizes = write_compressed(
+            counted(manager.dump_collection(collection_name, session=session)),
+            target_dir / file_name,
+            level,
+            threads,
+        )
+
+        return {
+            "collection": collection_name,
+            "file": file_name,
+            "documents": documents,
+            "indexes": manager.get_index_specs(collection_name),
+            **sizes,
+            "duration_seconds": round(time.monotonic() - started_at, 3),
+        }
+
+    with manager.snapshot_session() as session:
+        collection_names = manager.list_collections()
+
+        if session is None:
+            collections = _run_concurrently(dump_collection, collection_names, jobs)
+        else:
+            collections = [dump_collection(name, session) for name in collection_names]
+
+    return {"collections": collections}
+
+
+def restore_redis(
+    manager: RedisContainerManager,
+    nodes: List[dict],
+    source_dir: Path,
+    section: Dict[str, Any],
+    jobs: int,
+) -> List[Dict[str, Any]]:
+    """
+    Loads the RDB of each snapshot node into the node at the same position, all at
+    once. The target needs the same number of nodes, and a cluster the same slot
+    layout, which 'db start' gives for the same node list.
+    """
+    snapshot_nodes = section["nodes"]
+
+    if len(snapshot_nodes) != len(nodes):
+        raise ValueError(
+            f"The snapshot has {len(snapshot_nodes)} Redis node(s) but the configuration has {len(nodes)}"
+        )
+
+    if bool(section.get("cluster")) != manager.is_cluster:
+        raise ValueError(
+            "The snapshot and the configuration do not agree on the Redis cluster mode"
+        )
+
+    def restore_node(pair) -> Dict[str, Any]:
+        node, snapshot_node = pair
+        started_at = time.monotonic()
+
+        _for_node(manager, node).restore_rdb(
+            read_compressed(source_dir / snapshot_node["file"]), snapshot_node["raw_bytes"]
+        )
+
+        return {
+            "node": node.get("ip"),
+            "file": snapshot_node["file"],
+            "duration_seconds": round(time.monotonic() - started_at, 3),
+        }
+
+    return _run_concurrently(restore_node, list(zip(nodes, snapshot_nodes)), jobs)
+
+
+def restore_mongodb(
+    manager: MongodbContainerManager,
+    source_dir: Path,
+    section: Dict[str, Any],
+    jobs: int,
+) -> List[Dict[str, Any]]:
+    """
+    Replaces the AtomDB collections with the snapshot ones, several at a time, then
+    drops the collections the snapshot does not have, so the result matches it.
+    """
+
+    def restore_collection(collection: Dict[str, Any]) -> Dict[str, Any]:
+        started_at = time.monotonic()
+
+        with open_compressed(source_dir / collection["file"]) as stream:
+            documents = manager.restore_collection(
+                collection["collection"], stream, collection["indexes"]
+            )
+
+        return {
+            "collection": collection["collection"],
+            "file": collection["file"],
+            "documents": documents,
+            "duration_seconds": round(time.monotonic() - started_at, 3),
+        }
+
+    restored = _run_concurrently(restore_collection, section["collections"], jobs)
+    snapshot_collections = {collection["collection"] for collection in section["collections"]}
+
+    for collection_name in manager.list_collections():
+        if collection_name not in snapshot_collections:
+            manager.drop_collection(collection_name)
+
+    return restored
+
+
+def write_manifest(target_dir: Path, manifest: Dict[str, Any]) -> None:
+    manifest = {
+        "version": SNAPSHOT_FORMAT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        **manifest,
+    }
+
+    (target_dir / MANIFEST_FILE_NAME).write_text(json.dumps(manifest, indent=2))
+
+
+def read_manifest(source_dir: Path) -> Dict[str, Any]:
+    manifest_path = source_dir / MANIFEST_FILE_NAME
+
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except FileNotFoundError:
+        raise ValueError(f"{source_dir} is not an AtomDB snapshot: {MANIFEST_FILE_NAME} not found")
+
+    if manifest.get("version") != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported snapshot version {manifest.get('version')}; expected {SNAPSHOT_FORMAT_VERSION}"
+        )
+
+    return manifest
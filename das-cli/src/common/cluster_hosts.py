@@ -0,0 +1,65 @@
+from typing import Dict, List, TypedDict
+
+from common.network import is_local_host
+from common.settings import Settings
+from common.utils import extract_service_hostname, get_server_username
+
+
+class ClusterHost(TypedDict):
+    host: str
+    username: str
+    roles: List[str]
+
+
+def _get_atomdb_path(settings: Settings) -> str:
+    if settings.get("atomdb.type") == "adapterdb":
+        return "atomdb.adapterdb.atomdb_backend"
+
+    return "atomdb"
+
+
+def discover_cluster_hosts(settings: Settings) -> List[ClusterHost]:
+    """
+    Lists every host referenced by the configuration: the Redis and MongoDB
+    cluster nodes and the hosts of the agent endpoints. Each host appears once,
+    with all the roles it was found in; the names of this machine (localhost,
+    127.0.0.1, its hostname) count as one host, listed under the first one found.
+    """
+    hosts: Dict[str, ClusterHost] = {}
+    local_key = None
+
+    def add_host(host: str | None, username: str | None, role: str) -> None:
+        nonlocal local_key
+
+        if not host:
+            return
+
+        key = host
+
+        if is_local_host(host):
+            local_key = local_key or host
+            key = local_key
+
+        if key not in hosts:
+            hosts[key] = {
+                "host": key,
+                "username": username or get_server_username(),
+                "roles": [],
+            }
+
+        if role not in hosts[key]["roles"]:
+            hosts[key]["roles"].append(role)
+
+    atomdb_path = _get_atomdb_path(settings)
+
+    for service in ("redis", "mongodb"):
+        for node in settings.get(f"{atomdb_path}.{service}.nodes", []) or []:
+            add_host(node.get("ip"), node.get("username"), service)
+
+    agents = settings.get("agents", {}) or {}
+
+    for agent_name, agent in agents.items():
+        if isinstance(agent, dict) and isinstance(agent.get("endpoint"), str):
+            add_host(extract_service_hostname(agent["endpoint"]), None, f"{agent_name}-agent")
+
+    return list(hosts.values())
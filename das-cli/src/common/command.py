@@ -1,11 +1,16 @@
 import json
+import os
 import sys
-from contextlib import suppress
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
 from dataclasses import asdict, dataclass
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, TypedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypedDict
 
 import click
+import invoke
 import yaml
 from fabric import Connection
 from InquirerPy import inquirer
@@ -13,11 +18,20 @@ from InquirerPy.base.control import Choice as InquirerChoice
 from invoke.exceptions import UnexpectedExit
 
 from common import Choice
-from common.exceptions import InvalidRemoteConfiguration
+from common.config.remote_check import (
+    REMOTE_CONFIG_HASH_COMMAND,
+    REMOTE_SECRETS_PATH,
+    RemoteConfigCheckCache,
+    canonical_config_hash,
+    parse_remote_config_hash,
+)
+from common.exceptions import InvalidRemoteConfiguration, RemoteFanOutError
 from common.execution_context import ExecutionContext, SSHParams
+from common.network import is_local_host
 from common.prompt_types import ValidUsername
+from common.ssh_pool import discard_ssh_connection, get_ssh_connection
 from common.utils import log_exception
-from settings.config import SECRETS_PATH
+from settings.config import REMOTE_CONFIG_CHECKS_PATH, SECRETS_PATH
 
 from .utils import env_to_dict
 
@@ -27,6 +41,12 @@ class SelectOption(TypedDict):
     value: str
 
 
+class FanOutTarget(TypedDict):
+    host: str
+    user: str
+    port: int
+
+
 class StdoutType(Enum):
     DEFAULT = "default"
     MACHINE_READABLE = "machine_readable"
@@ -62,13 +82,32 @@ class OutputBufferEntry:
         return asdict(self)
 
 
+# Set while a command runs another one in the same process, so the inner command hands
+# its machine readable output back instead of printing it. Context variables are per
+# thread, so commands run concurrently (e.g. by 'up') each collect their own output.
+_machine_readable_sink: ContextVar[Optional[List[Any]]] = ContextVar(
+    "machine_readable_sink", default=None
+)
+
+
+@contextmanager
+def collect_machine_readable_output() -> Iterator[List[Any]]:
+    '''Collects the machine readable output of the commands run inside the block.'''
+    collected: List[Any] = []
+    token = _machine_readable_sink.set(collected)
+
+    try:
+        yield collected
+    finally:
+        _machine_readable_sink.reset(token)
+
+
 class Command:
     name = "unknown"
     help = ""
     short_help = ""
     params: List = []
     aliases: List[str] = []
-    _output_buffer: List[OutputBufferEntry] = []
 
     exclude_params = [
         "output_format",
@@ -80,6 +119,10 @@ class Command:
         "password",
         "connect_timeout",
         "context",
+        "hosts",
+        "hosts_from_config",
+        "parallel",
+        "exit_policy",
     ]
 
     default_params = [
@@ -146,6 +189,33 @@ class Command:
             required=False,
             default=10,
         ),
+        CommandOption(
+            ["--hosts"],
+            type=str,
+            help="Comma-separated list of hosts ([user@]host[:port]) to run the command on concurrently",
+            required=False,
+        ),
+        CommandOption(
+            ["--hosts-from-config"],
+            type=bool,
+            default=False,
+            is_flag=True,
+            help="Run the command concurrently on every host found in the configuration",
+        ),
+        CommandOption(
+            ["--parallel"],
+            type=click.IntRange(min=1),
+            help="Maximum number of hosts the command runs on at the same time",
+            required=False,
+            default=8,
+        ),
+        CommandOption(
+            ["--exit-policy"],
+            type=Choice(["all", "any"]),
+            help="Succeed only if the command succeeds on all hosts, or on any of them",
+            required=False,
+            default="all",
+        ),
     ]
 
     @property
@@ -166,6 +236,8 @@ class Command:
 
     def __init__(self) -> None:
         self._execution_context: Optional[ExecutionContext] = None
+        # Per instance, so a command run from another one (e.g. a 'batch' step) keeps its own output.
+        self._output_buffer: List[OutputBufferEntry] = []
         self.command = click.Command(
             name=self.name,
             callback=self.safe_run,
@@ -280,12 +352,11 @@ class Command:
             services["database"] = keep
         return config
 
-    def _check_remote_config(self, remote_kwargs):
-        REMOTE_SECRETS_PATH = "$HOME/.das/.env"
-
+    def _check_remote_config(self, connection: Connection):
         try:
             env_dict = env_to_dict(SECRETS_PATH)
             config_path = env_dict.get("configpath")
+            config_mtime = os.path.getmtime(config_path)
             with open(config_path, "r") as f:
                 local_config = json.loads(f.read())
         except Exception as e:
@@ -294,10 +365,15 @@ class Command:
                 f"Verify your configuration settings and try again. Details: {e}"
             )
 
+        host_key = f"{connection.user}@{connection.host}:{connection.port}"
+        checks_cache = RemoteConfigCheckCache(REMOTE_CONFIG_CHECKS_PATH)
+
+        if checks_cache.is_verified(host_key, config_mtime):
+            return
+
         try:
-            command = f"grep 'configpath' {REMOTE_SECRETS_PATH} | cut -d'=' -f2 | xargs cat"
-            result = Connection(**remote_kwargs).run(command, hide=True)
-            remote_config = json.loads(result.stdout)
+            result = connection.run(REMOTE_CONFIG_HASH_COMMAND, hide=True)
+            remote_config_hash = parse_remote_config_hash(result.stdout)
         except UnexpectedExit:
             raise FileNotFoundError(f"Remote configuration file not found at {REMOTE_SECRETS_PATH}")
         except Exception as e:
@@ -305,14 +381,18 @@ class Command:
                 f"Failed to fetch and parse remote configuration due to a connection/authentication error via SSH. Exception: {e}"
             )
 
-        if local_config == remote_config:
+        local_config_hash = canonical_config_hash(local_config)
+
+        if local_config_hash == remote_config_hash:
+            checks_cache.mark_verified(host_key, config_mtime, local_config_hash)
             return
         else:
+            checks_cache.invalidate(host_key)
             raise InvalidRemoteConfiguration(
                 "Remote configuration file does not match the local configuration file."
             )
 
-    def _remote_run(self, kwargs, remote_kwargs):
+    def _build_remote_command(self, kwargs, execution_context: ExecutionContext) -> str:
         prefix = "das-cli"
 
         output_fmt = getattr(self, "_output_format", "plain")
@@ -324,21 +404,31 @@ class Command:
             kwargs["stream"] = stream_val
 
         extra_args = self._dict_to_command_line_args(kwargs)
-        execution_context = self._get_remote_execution_context()
         context_encoded = execution_context.to_str(include_ssh=False)
         command_path = execution_context.command_path
         remote_context = f"--context '{context_encoded}'"
-        command = f"{prefix} {command_path} {extra_args} {remote_context}".strip()
+        return f"{prefix} {command_path} {extra_args} {remote_context}".strip()
+
+    def _remote_run(self, kwargs, remote_kwargs):
+        execution_context = self._get_remote_execution_context()
+        command_path = execution_context.command_path
+        command = self._build_remote_command(kwargs, execution_context)
+
+        # A single SSH session serves both the config check and the command itself,
+        # and stays pooled for any later remote call to the same host in this process.
+        connection = get_ssh_connection(**remote_kwargs)
 
         try:
 
             if "config" not in command_path:
-                self._check_remote_config(remote_kwargs)
+                self._check_remote_config(connection)
 
             # Ignores this check when a config command is called, prevents command from breaking when user is setting up configuration across multiple remote machines.
-            Connection(**remote_kwargs).run(command, pty=False)
+            connection.run(command, pty=False)
 
         except Exception as e:
+            if not isinstance(e, UnexpectedExit):
+                discard_ssh_connection(connection)
 
             self.stdout(
                 str(e),
@@ -363,13 +453,160 @@ class Command:
 
             raise e
 
+    def _get_fan_out_targets(self) -> List[FanOutTarget]:
+        targets: List[FanOutTarget] = []
+
+        if getattr(self, "_hosts_from_config", False):
+            from common.cluster_hosts import discover_cluster_hosts
+            from common.config.store import JsonConfigStore
+            from common.settings import Settings
+
+            settings = Settings(store=JsonConfigStore(os.path.expanduser(SECRETS_PATH)))
+
+            for node in discover_cluster_hosts(settings):
+                targets.append(
+                    {
+                        "host": node["host"],
+                        "user": getattr(self, "_user", None) or node["username"],
+                        "port": getattr(self, "_port", None) or 22,
+                    }
+                )
+
+        for entry in (getattr(self, "_hosts", None) or "").split(","):
+            entry = entry.strip()
+
+            if not entry:
+                continue
+
+            user, _, address = entry.rpartition("@")
+            host, _, port = address.partition(":")
+
+            if port and not port.isdigit():
+                raise click.BadParameter(f"Invalid port in host '{entry}'", param_hint="--hosts")
+
+            targets.append(
+                {
+                    "host": host,
+                    "user": user or getattr(self, "_user", None) or "",
+                    "port": int(port) if port else (getattr(self, "_port", None) or 22),
+                }
+            )
+
+        unique_targets: Dict[str, FanOutTarget] = {}
+
+        for target in targets:
+            unique_targets.setdefault(target["host"], target)
+
+        return list(unique_targets.values())
+
+    def _run_on_target(self, target: FanOutTarget, command: str, command_path: str) -> dict:
+        started_at = time.monotonic()
+        result: Dict[str, Any] = {"exit_code": None, "error": None, "output": None}
+
+        try:
+            if is_local_host(target["host"]):
+                run_result = invoke.run(command, hide=True, warn=True, pty=False)
+            else:
+                key_file = getattr(self, "_key_file", None)
+                password = getattr(self, "_password", None)
+
+                connect_kwargs: Dict[str, Any] = {}
+                if key_file:
+                    connect_kwargs["key_filename"] = key_file
+                if password:
+                    connect_kwargs["password"] = password
+
+                connection = get_ssh_connection(
+                    target["host"],
+                    user=target["user"],
+                    port=target["port"],
+                    connect_kwargs=connect_kwargs,
+                    connect_timeout=getattr(self, "_connect_timeout", None) or 10,
+                )
+
+                try:
+                    if "config" not in command_path:
+                        self._check_remote_config(connection)
+
+                    run_result = connection.run(command, hide=True, warn=True, pty=False)
+                except Exception:
+                    discard_ssh_connection(connection)
+                    raise
+
+            result["exit_code"] = run_result.exited
+            result["output"] = run_result.stdout
+
+            if run_result.exited != 0:
+                result["error"] = run_result.stderr.strip() or None
+
+            if self.output_format != "plain":
+                with suppress(yaml.YAMLError):
+                    result["output"] = yaml.safe_load(run_result.stdout)
+        except Exception as e:
+            result["exit_code"] = 1
+            result["error"] = str(e) or e.__class__.__name__
+
+        result["duration_seconds"] = round(time.monotonic() - started_at, 3)
+
+        return result
+
+    def _fan_out_run(self, kwargs) -> None:
+        targets = self._get_fan_out_targets()
+
+        if not targets:
+            raise ValueError("No hosts to run the command on.")
+
+        execution_context = self.get_execution_context()
+        command = self._build_remote_command(kwargs, execution_context)
+        parallel = getattr(self, "_parallel", None) or 8
+
+        with ThreadPoolExecutor(max_workers=min(parallel, len(targets))) as executor:
+            results = list(
+                executor.map(
+                    lambda target: self._run_on_target(
+                        target, command, execution_context.command_path
+                    ),
+                    targets,
+                )
+            )
+
+        hosts_results = {target["host"]: result for target, result in zip(targets, results)}
+
+        for host, result in hosts_results.items():
+            succeeded = result["exit_code"] == 0
+            self.stdout(
+                f"==> {host} (exit code {result['exit_code']}, {result['duration_seconds']:.2f}s)",
+                severity=StdoutSeverity.SUCCESS if succeeded else StdoutSeverity.ERROR,
+            )
+
+            if isinstance(result["output"], str) and result["output"].strip():
+                self.stdout(result["output"].rstrip())
+
+            if result["error"]:
+                self.stdout(result["error"], severity=StdoutSeverity.ERROR)
+
+        self.stdout(hosts_results, stdout_type=StdoutType.MACHINE_READABLE)
+
+        failed_hosts = [host for host, result in hosts_results.items() if result["exit_code"] != 0]
+        exit_policy = getattr(self, "_exit_policy", None) or "all"
+
+        if (exit_policy == "all" and failed_hosts) or (
+            exit_policy == "any" and len(failed_hosts) == len(hosts_results)
+        ):
+            raise RemoteFanOutError(failed_hosts, exit_policy)
+
     def safe_run(self, **kwargs):
+        # The same command instance may run several times in one process (e.g. 'das-cli batch'),
+        # so the execution context is rebuilt from the current invocation's options.
+        self._execution_context = None
         remote, remote_kwargs = self._get_remote_kwargs_from_context()
         for param in getattr(self, "exclude_params", []):
             setattr(self, f"_{param}", kwargs.pop(param, None))
 
         try:
-            if remote:
+            if getattr(self, "_hosts", None) or getattr(self, "_hosts_from_config", False):
+                self._fan_out_run(kwargs)
+            elif remote:
                 self._remote_run(kwargs, remote_kwargs)
             else:
                 self.run(**kwargs)
@@ -378,7 +615,11 @@ class Command:
             self.flush_stdout()
             raise click.exceptions.Exit(1)
 
-        if not remote:
+        if (
+            not remote
+            or getattr(self, "_hosts", None)
+            or getattr(self, "_hosts_from_config", False)
+        ):
             self.flush_stdout()
 
     @staticmethod
@@ -443,6 +684,12 @@ class Command:
         if self.output_format == "plain":
             return
 
+        sink = _machine_readable_sink.get()
+
+        if stream_mode and sink is not None:
+            sink.append(entry.message)
+            return
+
         if stream_mode:
             if self.output_format == "json":
                 click.echo(json.dumps(entry.message), nl=True)
@@ -505,6 +752,12 @@ class Command:
         if not results:
             return
 
+        sink = _machine_readable_sink.get()
+
+        if sink is not None:
+            sink.extend(results)
+            return
+
         if self.output_format == "json":
             click.echo(json.dumps(results, indent=2))
         elif self.output_format == "yaml":
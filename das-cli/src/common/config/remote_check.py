@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+REMOTE_SECRETS_PATH = "$HOME/.das/.env"
+
+# The cache is rebuilt per command, but the fan-out threads of one process share the file.
+_cache_lock = threading.Lock()
+
+# How long a successful verification is trusted for the same host and local config.
+REMOTE_CHECK_TTL_SECONDS = 60
+
+# Prints the SHA-256 of the canonicalized remote config. Hosts without python3 fall
+# back to printing the whole file, which is then hashed locally.
+REMOTE_CONFIG_HASH_COMMAND = (
+    f"path=$(grep 'configpath' {REMOTE_SECRETS_PATH} | cut -d'=' -f2 | xargs); "
+    "if command -v python3 >/dev/null 2>&1; then "
+    "python3 -c 'import hashlib, json, sys; "
+    "print(hashlib.sha256(json.dumps(json.load(open(sys.argv[1])), sort_keys=True, "
+    "separators=(\",\", \":\")).encode()).hexdigest())' \"$path\"; "
+    "else cat \"$path\"; fi"
+)
+
+
+def canonical_config_hash(config: Any) -> str:
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def parse_remote_config_hash(output: str) -> str:
+    output = output.strip()
+
+    if len(output) == 64 and all(char in "0123456789abcdef" for char in output):
+        return output
+
+    return canonical_config_hash(json.loads(output))
+
+
+class RemoteConfigCheckCache:
+    """
+    Remembers which hosts were verified to hold the same configuration as the
+    local one. Entries are bound to the local config mtime and expire after a
+    short TTL, so a burst of remote commands only checks each host once.
+    """
+
+    def __init__(self, path: Path, ttl: float = REMOTE_CHECK_TTL_SECONDS) -> None:
+        self._path = Path(path)
+        self._ttl = ttl
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            with open(self._path, "r") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        return entries if isinstance(entries, dict) else {}
+
+    def _save(self, entries: Dict[str, dict]) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self._path.parent, prefix=f"{self._path.name}.", suffix=".tmp", delete=False
+        ) as f:
+            json.dump(entries, f)
+
+        try:
+            os.replace(f.name, self._path)
+        except OSError:
+            os.unlink(f.name)
+            raise
+
+    def is_verified(self, host_key: str, config_mtime: float) -> bool:
+        entry = self._load().get(host_key)
+
+        if not entry or entry.get("config_mtime") != config_mtime:
+            return False
+
+        return time.time() - entry.get("verified_at", 0) <= self._ttl
+
+    def mark_verified(self, host_key: str, config_mtime: float, config_hash: str) -> None:
+        with _cache_lock:
+            now = time.time()
+            entries = {
+                key: entry
+                for key, entry in self._load().items()
+                if now - entry.get("verified_at", 0) <= self._ttl
+            }
+
+            entries[host_key] = {
+                "config_mtime": config_mtime,
+                "config_hash": config_hash,
+                "verified_at": now,
+            }
+
+            try:
+                self._save(entries)
+            except OSError:
+                pass
+
+    def invalidate(self, host_key: str) -> None:
+        with _cache_lock:
+            entries = self._load()
+
+            if entries.pop(host_key, None) is not None:
+                try:
+                    self._save(entries)
+                except OSError:
+                    pass
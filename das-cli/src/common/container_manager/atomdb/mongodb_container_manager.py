@@ -1,11 +1,36 @@
 import io
 import json
-from typing import AnyStr, Dict, List, TypedDict, Union
-
-from common import Container, ContainerManager, get_rand_token, ssh
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, AnyStr, BinaryIO, Callable, Dict, Iterator, List, Optional, TypedDict, Union
+
+from bson import decode_file_iter
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from pymongo import MongoClient
+from pymongo.client_session import ClientSession
+from pymongo.errors import OperationFailure, PyMongoError
+
+from common import Container, ContainerManager, get_rand_token
+from common.container_manager.atomdb.mongodb_tuning import (
+    MONGODB_BULK_LOAD_PARAMETERS,
+    mongodb_tuning_to_args,
+    resolve_mongodb_tuning,
+)
+from common.db_clients import get_mongodb_client
 from common.docker.exceptions import DockerError
+from common.network import is_port_reachable
+from common.ssh_pool import get_ssh_connection
+from common.utils import extract_service_hostname
 from settings.config import MONGODB_IMAGE_NAME, MONGODB_IMAGE_VERSION
 
+# Server error raised when a snapshot read is older than minSnapshotHistoryWindowInSeconds.
+SNAPSHOT_TOO_OLD_ERROR_CODE = 239
+
+# Collections being restored get this infix until they replace the live ones.
+RESTORE_COLLECTION_INFIX = ".das-restore-"
+
 
 class RsConfig(TypedDict):
     _id: str
@@ -14,6 +39,9 @@ class RsConfig(TypedDict):
 
 class MongodbContainerManager(ContainerManager):
     _repl_set = "rs0"
+    _database_name = "das"
+
+    data_volumes = {"db": "/data/db", "configdb": "/data/configdb"}
 
     def __init__(
         self,
@@ -33,43 +61,81 @@ class MongodbContainerManager(ContainerManager):
 
         super().__init__(container)
         self._options = options
+        self._cluster_keyfiles: Dict[str, str] = {}
+
+    @staticmethod
+    def _get_node_host(cluster_node: Dict) -> str:
+        return cluster_node.get("host") or cluster_node["ip"]
 
     def _upload_key_to_server(self, cluster_node, mongodb_cluster_secret_key):
         keyfile_server_path = f"/tmp/{get_rand_token(num_bytes=5)}.txt"
+        node_host = self._get_node_host(cluster_node)
 
         try:
-            with ssh.open(cluster_node["host"], cluster_node["username"]) as (
-                ssh_conn,
-                sftp_conn,
+            connection = get_ssh_connection(node_host, user=cluster_node["username"])
+            content_stream = io.BytesIO(mongodb_cluster_secret_key.encode("utf-8"))
+
+            connection.put(content_stream, remote=keyfile_server_path)
+
+            # mongod refuses a keyfile readable by others or owned by another user, and
+            # inside the container 999 is the mongodb's uid and gid.
+            for command in (
+                f"chmod 400 {keyfile_server_path}",
+                f"chown 999:999 {keyfile_server_path}",
             ):
-                content_stream = io.BytesIO(mongodb_cluster_secret_key.encode("utf-8"))
-                remote_file = sftp_conn.open(keyfile_server_path, "w")
-                remote_file.write(content_stream.read())
+                result = connection.run(command, hide=True, warn=True)
 
-                ssh_conn.exec_command(f"chmod 400 {keyfile_server_path}")
-                ssh_conn.exec_command(
-                    f"chown 999:999 {keyfile_server_path}"
-                )  # Inside the container 999 is the mongodb's uid and gid
+                if result.exited != 0:
+                    raise RuntimeError(
+                        f"'{command}' exited with code {result.exited}: "
+                        f"{(result.stderr or result.stdout).strip()}"
+                    )
 
             return keyfile_server_path
 
         except Exception as e:
             raise RuntimeError(
-                f"Failed to upload key to server at {cluster_node['host']} (username: {cluster_node['username']}): {e}"
+                f"Failed to upload key to server at {node_host} (username: {cluster_node['username']}): {e}"
+            )
+
+    def upload_cluster_keys(
+        self,
+        mongodb_nodes: List[Dict],
+        mongodb_cluster_secret_key: str,
+    ) -> Dict[str, str]:
+        """
+        Uploads the cluster keyfile to every node at the same time before any container is
+        started, so a node that cannot be reached fails the start up front.
+        """
+        with ThreadPoolExecutor(max_workers=max(len(mongodb_nodes), 1)) as executor:
+            keyfile_paths = list(
+                executor.map(
+                    lambda node: self._upload_key_to_server(node, mongodb_cluster_secret_key),
+                    mongodb_nodes,
+                )
             )
 
+        self._cluster_keyfiles = {
+            self._get_node_host(node): keyfile_path
+            for node, keyfile_path in zip(mongodb_nodes, keyfile_paths)
+        }
+
+        return self._cluster_keyfiles
+
     def _get_cluster_node_config(self, cluster_node, mongodb_cluster_secret_key):
         if not cluster_node:
             return {}
 
         keyfile_path = "/data/keyfile.txt"
-        keyfile_server_path = self._upload_key_to_server(
+        keyfile_server_path = self._cluster_keyfiles.get(
+            self._get_node_host(cluster_node)
+        ) or self._upload_key_to_server(
             cluster_node,
             mongodb_cluster_secret_key,
         )
 
         return {
-            "command": f"--replSet {self._repl_set} --keyFile {keyfile_path} --auth",
+            "command": ["--replSet", self._repl_set, "--keyFile", keyfile_path, "--auth"],
             "volumes": {
                 keyfile_server_path: {
                     "bind": keyfile_path,
@@ -78,6 +144,24 @@ class MongodbContainerManager(ContainerManager):
             },
         }
 
+    @property
+    def profile(self) -> str:
+        return self._options.get("mongodb_profile") or "default"
+
+    @property
+    def nodes(self) -> List[Dict]:
+        return list(self._options.get("mongodb_nodes") or [])
+
+    @property
+    def is_cluster(self) -> bool:
+        return bool(self._options.get("mongodb_cluster"))
+
+    def get_tuning_settings(self) -> Dict[str, Any]:
+        return resolve_mongodb_tuning(
+            self._options.get("mongodb_profile"),
+            self._options.get("mongodb_tuning"),
+        )
+
     def start_container(
         self,
         port: int,
@@ -88,9 +172,24 @@ class MongodbContainerManager(ContainerManager):
     ):
         self.raise_running_container()
 
+        cluster_node_config: Dict[str, Any] = self._get_cluster_node_config(
+            cluster_node, mongodb_cluster_secret_key
+        )
+        cluster_command_params: List[str] = cluster_node_config.pop("command", [])
+        tuning_command_params: List[str] = mongodb_tuning_to_args(
+            self.get_tuning_settings(), replica_set=bool(cluster_node)
+        )
+
         container = self._start_container(
-            **self._get_cluster_node_config(cluster_node, mongodb_cluster_secret_key),
-            command=["mongod", "--bind_ip_all", "--port", f"{port}"],
+            **cluster_node_config,
+            command=[
+                "mongod",
+                "--bind_ip_all",
+                "--port",
+                f"{port}",
+                *tuning_command_params,
+                *cluster_command_params,
+            ],
             restart_policy={
                 "Name": "on-failure",
                 "MaximumRetryCount": 5,
@@ -151,10 +250,144 @@ class MongodbContainerManager(ContainerManager):
 
         self.set_exec_context(mongodb_nodes[0]["context"])
         self._exec_container(
-            f"mongosh -u {mongodb_username} -p {mongodb_password} --eval 'rs.initiate({rl_config_json})'"
+            f"mongosh --port {mongodb_port} -u {mongodb_username} -p {mongodb_password} --eval 'rs.initiate({rl_config_json})'"
         )
 
-    def get_collection_stats(self) -> dict:
+        self.wait_for_replica_set(
+            mongodb_nodes[0]["ip"],
+            len(mongodb_nodes),
+            mongodb_port,
+            mongodb_username,
+            mongodb_password,
+        )
+
+    def _get_replica_set_states(
+        self,
+        mongodb_host: str,
+        mongodb_port: int,
+        mongodb_username: str,
+        mongodb_password: str,
+    ) -> List[str]:
+        client = get_mongodb_client(mongodb_host, mongodb_port, mongodb_username, mongodb_password)
+        status = client.admin.command("replSetGetStatus")
+
+        return [member["stateStr"] for member in status.get("members", [])]
+
+    def wait_for_replica_set(
+        self,
+        mongodb_host: str,
+        members_count: int,
+        mongodb_port: int,
+        mongodb_username: str,
+        mongodb_password: str,
+        timeout: int = 120,
+        interval: int = 2,
+    ) -> List[str]:
+        """
+        Waits until the replica set has a PRIMARY and every other member is SECONDARY,
+        polling replSetGetStatus through the pooled client of the first member.
+        """
+        deadline = time.monotonic() + timeout
+        states: List[str] = []
+
+        while time.monotonic() < deadline:
+            try:
+                states = self._get_replica_set_states(
+                    mongodb_host, mongodb_port, mongodb_username, mongodb_password
+                )
+            except PyMongoError:
+                states = []
+
+            if (
+                len(states) == members_count
+                and states.count("PRIMARY") == 1
+                and states.count("SECONDARY") == members_count - 1
+            ):
+                return states
+
+            time.sleep(interval)
+
+        raise DockerError(
+            f"Timeout waiting for the MongoDB replica set to elect a primary. Member states: {states or 'unknown'}"
+        )
+
+    def _get_mongodb_host(self) -> str:
+        mongodb_endpoint = self._options.get("mongodb_endpoint") or ""
+
+        return extract_service_hostname(mongodb_endpoint) or "localhost"
+
+    def get_mongodb_client(self) -> MongoClient:
+        return get_mongodb_client(
+            self._get_mongodb_host(),
+            self._options["mongodb_port"],
+            self._options["mongodb_username"],
+            self._options["mongodb_password"],
+        )
+
+    def _get_server_parameters(self, names: List[str]) -> Dict[str, Any]:
+        admin = self.get_mongodb_client().admin
+        parameters = {}
+
+        for name in names:
+            result = admin.command({"getParameter": 1, name: 1})
+            parameters[name] = result[name]
+
+        return parameters
+
+    def _set_server_parameters(self, parameters: Dict[str, Any]) -> None:
+        admin = self.get_mongodb_client().admin
+
+        for name, value in parameters.items():
+            admin.command({"setParameter": 1, name: value})
+
+    @contextmanager
+    def bulk_load_durability(
+        self,
+        on_restore_error: Optional[Callable[[PyMongoError], None]] = None,
+    ) -> Iterator[bool]:
+        """
+        Relaxes journaling and checkpointing for the duration of a bulk load when the
+        bulk-load profile is selected, restoring the previous values on exit. Yields
+        whether the parameters were changed. Only the parameters actually changed are
+        restored; a failed restore is passed to on_restore_error instead of raised, so
+        it does not hide the outcome of the load.
+        """
+        if self.profile != "bulk-load":
+            yield False
+            return
+
+        previous_parameters = self._get_server_parameters(list(MONGODB_BULK_LOAD_PARAMETERS))
+        changed_parameters: Dict[str, Any] = {}
+
+        try:
+            for name, value in MONGODB_BULK_LOAD_PARAMETERS.items():
+                self._set_server_parameters({name: value})
+                changed_parameters[name] = previous_parameters[name]
+
+            yield True
+        finally:
+            try:
+                self._set_server_parameters(changed_parameters)
+            except PyMongoError as e:
+                if on_restore_error is None:
+                    raise
+
+                on_restore_error(e)
+
+    def _get_collection_stats_from_client(self) -> dict:
+        database = self.get_mongodb_client()[self._database_name]
+        collection_names = database.list_collection_names()
+
+        # The pooled client lets the per-collection counts share one round trip window.
+        with ThreadPoolExecutor(max_workers=max(len(collection_names), 1)) as executor:
+            counts = executor.map(
+                lambda name: database.get_collection(name).estimated_document_count(),
+                collection_names,
+            )
+
+        return dict(zip(collection_names, counts))
+
+    def _get_collection_stats_from_exec(self) -> dict:
         mongodb_username = self._options.get("mongodb_username")
         mongodb_password = self._options.get("mongodb_password")
         mongodb_port = self._options.get("mongodb_port")
@@ -170,11 +403,26 @@ class MongodbContainerManager(ContainerManager):
 
         command = (
             f'bash -c "mongosh --port {mongodb_port} -u {mongodb_username} -p {mongodb_password} '
-            f'--eval \'use das\' --eval \'{mongodb_command}\' | tail -n 1"'
+            f'--eval \'use {self._database_name}\' --eval \'{mongodb_command}\' | tail -n 1"'
         )
 
         result = self._exec_container(command)
-        stats = json.loads(result.output)
+
+        return json.loads(result.output)
+
+    def get_collection_stats(self) -> dict:
+        mongodb_port = self._options.get("mongodb_port")
+        stats = None
+
+        if mongodb_port and is_port_reachable(self._get_mongodb_host(), mongodb_port):
+            try:
+                stats = self._get_collection_stats_from_client()
+            except PyMongoError:
+                # Auth, TLS or server selection errors leave the exec path to answer.
+                stats = None
+
+        if stats is None:
+            stats = self._get_collection_stats_from_exec()
 
         if "nodes" in stats and "links" in stats:
             atoms = 0
@@ -190,3 +438,124 @@ class MongodbContainerManager(ContainerManager):
         count_atoms = int(collection_stats.get("atoms", 0))
 
         return count_atoms
+
+    def list_collections(self) -> List[str]:
+        return [
+            name
+            for name in self.get_mongodb_client()[self._database_name].list_collection_names()
+            if RESTORE_COLLECTION_INFIX not in name
+        ]
+
+    def drop_collection(self, collection_name: str) -> None:
+        self.get_mongodb_client()[self._database_name].drop_collection(collection_name)
+
+    def get_index_specs(self, collection_name: str) -> List[Dict[str, Any]]:
+        """Describes the secondary indexes of a collection, so they can be rebuilt on restore."""
+        collection = self.get_mongodb_client()[self._database_name].get_collection(collection_name)
+        index_specs = []
+
+        for name, info in collection.index_information().items():
+            if name == "_id_":
+                continue
+
+            index_specs.append(
+                {
+                    "name": name,
+                    "keys": [[field, direction] for field, direction in info["key"]],
+                    "options": {
+                        key: value for key, value in info.items() if key not in ("v", "key", "ns")
+                    },
+                }
+            )
+
+        return index_specs
+
+    @contextmanager
+    def snapshot_session(self) -> Iterator[Optional[ClientSession]]:
+        """
+        Yields a session whose reads all see the same point in time. Snapshot reads need
+        a replica set, so a standalone server yields None and should not be written to
+        while it is dumped.
+        """
+        if not self.is_cluster:
+            yield None
+            return
+
+        with self.get_mongodb_client().start_session(snapshot=True) as session:
+            yield session
+
+    def dump_collection(
+        self,
+        collection_name: str,
+        session: Optional[ClientSession] = None,
+        batch_size: int = 10_000,
+    ) -> Iterator[bytes]:
+        """Yields the documents of a collection as raw BSON, without decoding them."""
+        collection = self.get_mongodb_client()[self._database_name].get_collection(
+            collection_name, codec_options=CodecOptions(document_class=RawBSONDocument)
+        )
+
+        try:
+            for document in collection.find({}, session=session, batch_size=batch_size):
+                yield document.raw
+        except OperationFailure as e:
+            if e.code != SNAPSHOT_TOO_OLD_ERROR_CODE:
+                raise
+
+            raise RuntimeError(
+                f"The snapshot of '{collection_name}' outlived the MongoDB snapshot history window. "
+                "Raise minSnapshotHistoryWindowInSeconds (300 s by default) on the replica set "
+                "above the expected dump time and run the snapshot again"
+            ) from e
+
+    def restore_collection(
+        self,
+        collection_name: str,
+        stream: BinaryIO,
+        index_specs: List[Dict[str, Any]],
+        batch_size: int = 1000,
+    ) -> int:
+        """
+        Replaces a collection with the BSON documents read from the stream. They are
+        loaded into a temporary collection, indexed once they are all in, which is faster
+        than maintaining the indexes during the inserts, and only then renamed over the
+        live one. A truncated stream or a failed insert leaves the live collection as it was.
+        """
+        database = self.get_mongodb_client()[self._database_name]
+        temporary_name = f"{collection_name}{RESTORE_COLLECTION_INFIX}{get_rand_token(num_bytes=4)}"
+        collection = database.get_collection(temporary_name)
+        batch: List[RawBSONDocument] = []
+        restored = 0
+
+        try:
+            for document in decode_file_iter(
+                stream, codec_options=CodecOptions(document_class=RawBSONDocument)
+            ):
+                batch.append(document)
+
+                if len(batch) >= batch_size:
+                    collection.insert_many(batch, ordered=False, bypass_document_validation=True)
+                    restored += len(batch)
+                    batch = []
+
+            if batch:
+                collection.insert_many(batch, ordered=False, bypass_document_validation=True)
+                restored += len(batch)
+
+            for index_spec in index_specs:
+                collection.create_index(
+                    [(field, direction) for field, direction in index_spec["keys"]],
+                    name=index_spec["name"],
+                    **index_spec["options"],
+                )
+
+            # An empty snapshot collection still has to replace the live one.
+            if temporary_name not in database.list_collection_names():
+                database.create_collection(temporary_name)
+
+            collection.rename(collection_name, dropTarget=True)
+        except BaseException:
+            database.drop_collection(temporary_name)
+            raise
+
+        return restored
@@ -0,0 +1,109 @@
+from typing import Any, Callable, Dict, List, Optional
+
+MONGODB_BLOCK_COMPRESSORS = ("none", "snappy", "zlib", "zstd")
+
+# Minimum cache size accepted by mongod for wiredTigerCacheSizeGB.
+MONGODB_MIN_CACHE_SIZE_GB = 0.25
+
+MONGODB_TUNING_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    "bulk-load": {
+        "block_compressor": "snappy",
+    },
+    "low-memory": {
+        "cache_size_gb": MONGODB_MIN_CACHE_SIZE_GB,
+        "block_compressor": "zstd",
+    },
+}
+
+DEFAULT_MONGODB_TUNING_PROFILE = "default"
+
+# Runtime parameters relaxed by the bulk-load profile while 'metta load' runs: a longer
+# journal group commit window and fewer checkpoints. Both are restored afterwards.
+MONGODB_BULK_LOAD_PARAMETERS: Dict[str, Any] = {
+    "journalCommitInterval": 500,
+    "syncdelay": 300,
+}
+
+
+def _get_number(settings: Dict[str, Any], key: str, cast: Callable[[Any], Any]) -> Any:
+    value = settings.get(key)
+
+    if value is None:
+        return None
+
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        raise ValueError(
+            f"Invalid MongoDB tuning value for '{key}': expected a number, got '{value}'"
+        )
+
+
+def _validate_mongodb_tuning(settings: Dict[str, Any]) -> None:
+    cache_size_gb = _get_number(settings, "cache_size_gb", float)
+    journal_commit_interval = _get_number(settings, "journal_commit_interval", int)
+    block_compressor = settings.get("block_compressor")
+    oplog_size_mb = _get_number(settings, "oplog_size_mb", int)
+
+    if cache_size_gb is not None and cache_size_gb < MONGODB_MIN_CACHE_SIZE_GB:
+        raise ValueError(
+            f"MongoDB cache_size_gb must be at least {MONGODB_MIN_CACHE_SIZE_GB}, got {cache_size_gb}"
+        )
+
+    if journal_commit_interval is not None and not 1 <= journal_commit_interval <= 500:
+        raise ValueError(
+            f"MongoDB journal_commit_interval must be between 1 and 500 ms, got {journal_commit_interval}"
+        )
+
+    if block_compressor is not None and block_compressor not in MONGODB_BLOCK_COMPRESSORS:
+        raise ValueError(
+            f"MongoDB block_compressor must be one of {', '.join(MONGODB_BLOCK_COMPRESSORS)}, "
+            f"got '{block_compressor}'"
+        )
+
+    if oplog_size_mb is not None and oplog_size_mb <= 0:
+        raise ValueError(f"MongoDB oplog_size_mb must be a positive number, got {oplog_size_mb}")
+
+
+def resolve_mongodb_tuning(
+    profile: Optional[str] = None,
+    overrides: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    '''Merges the named profile with the per-key overrides and validates the result.'''
+    profile = profile or DEFAULT_MONGODB_TUNING_PROFILE
+
+    if profile not in MONGODB_TUNING_PROFILES:
+        raise ValueError(
+            f"Unknown MongoDB tuning profile '{profile}'. "
+            f"Available profiles: {', '.join(MONGODB_TUNING_PROFILES)}"
+        )
+
+    settings = dict(MONGODB_TUNING_PROFILES[profile])
+    settings.update(overrides or {})
+
+    _validate_mongodb_tuning(settings)
+
+    return settings
+
+
+def mongodb_tuning_to_args(settings: Dict[str, Any], replica_set: bool = False) -> List[str]:
+    '''
+    Translates a resolved configuration into mongod command line arguments. The oplog
+    size only applies to replica set members.
+    '''
+    args = []
+
+    if settings.get("cache_size_gb") is not None:
+        args.extend(["--wiredTigerCacheSizeGB", str(settings["cache_size_gb"])])
+
+    if settings.get("journal_commit_interval") is not None:
+        args.extend(["--journalCommitInterval", str(settings["journal_commit_interval"])])
+
+    if settings.get("block_compressor") is not None:
+        args.extend(["--wiredTigerCollectionBlockCompressor", settings["block_compressor"]])
+
+    if replica_set and settings.get("oplog_size_mb") is not None:
+        args.extend(["--oplogSize", str(settings["oplog_size_mb"])])
+
+    return args
@@ -0,0 +1,109 @@
+from collections import Counter
+from typing import Dict, List, TypedDict
+
+REDIS_CLUSTER_SLOTS = 16384
+
+# Redis refuses to create a cluster with fewer masters than this.
+REDIS_CLUSTER_MIN_MASTERS = 3
+
+
+class RedisClusterPlan(TypedDict):
+    masters: List[Dict]
+    replicas: Dict[str, List[Dict]]
+    slots: Dict[str, int]
+
+
+def _node_weight(node: Dict) -> float:
+    try:
+        weight = float(node.get("weight", 1))
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid weight for Redis node {node.get('ip')}: {node.get('weight')}")
+
+    if weight <= 0:
+        raise ValueError(f"Redis node {node.get('ip')} must have a positive weight")
+
+    return weight
+
+
+def _node_zone(node: Dict) -> str:
+    return str(node.get("zone") or node["ip"])
+
+
+def _distribute_slots(masters: List[Dict]) -> Dict[str, int]:
+    weights = {master["ip"]: _node_weight(master) for master in masters}
+    total_weight = sum(weights.values())
+
+    shares = {ip: REDIS_CLUSTER_SLOTS * weight / total_weight for ip, weight in weights.items()}
+    slots = {ip: int(share) for ip, share in shares.items()}
+
+    # Largest remainder method, so the slot counts always add up to the full range.
+    remaining = REDIS_CLUSTER_SLOTS - sum(slots.values())
+    for ip in sorted(shares, key=lambda ip: shares[ip] - slots[ip], reverse=True)[:remaining]:
+        slots[ip] += 1
+
+    return slots
+
+
+def plan_redis_cluster(nodes: List[Dict], replicas_per_master: int = 0) -> RedisClusterPlan:
+    """
+    Splits the nodes into masters and replicas.
+
+    Nodes may set "role" ("master" or "replica") to pin their role, "weight" to get a
+    proportional share of the hash slots when they are masters, and "zone" so that replicas
+    are placed outside the zone of their master whenever possible.
+    """
+    if replicas_per_master < 0:
+        raise ValueError("replicas_per_master cannot be negative")
+
+    masters_count = len(nodes) // (1 + replicas_per_master)
+    pinned_masters = [node for node in nodes if node.get("role") == "master"]
+    candidates = [node for node in nodes if node.get("role") not in ("master", "replica")]
+
+    if len(pinned_masters) > masters_count:
+        raise ValueError(
+            f"{len(pinned_masters)} Redis nodes are pinned as masters, but {len(nodes)} nodes "
+            f"with {replicas_per_master} replica(s) per master only allow {masters_count}"
+        )
+
+    # The heaviest nodes are promoted first, spreading masters across zones on ties.
+    zone_usage = Counter(_node_zone(node) for node in pinned_masters)
+    masters = list(pinned_masters)
+
+    while candidates and len(masters) < masters_count:
+        node = max(
+            candidates,
+            key=lambda node: (_node_weight(node), -zone_usage[_node_zone(node)]),
+        )
+
+        candidates.remove(node)
+        masters.append(node)
+        zone_usage[_node_zone(node)] += 1
+
+    if len(masters) < REDIS_CLUSTER_MIN_MASTERS:
+        raise ValueError(
+            f"A Redis cluster needs at least {REDIS_CLUSTER_MIN_MASTERS} masters, but {len(nodes)} "
+            f"node(s) with {replicas_per_master} replica(s) per master only provide {len(masters)}"
+        )
+
+    master_ips = {master["ip"] for master in masters}
+    replicas: Dict[str, List[Dict]] = {master["ip"]: [] for master in masters}
+
+    for node in nodes:
+        if node["ip"] in master_ips:
+            continue
+
+        # Prefer the master with fewer replicas, then one in a different zone.
+        master = min(
+            masters,
+            key=lambda master: (
+                len(replicas[master["ip"]]),
+                _node_zone(master) == _node_zone(node),
+            ),
+        )
+        replicas[master["ip"]].append(node)
+
+    return {
+        "masters": masters,
+        "replicas": replicas,
+        "slots": _distribute_slots(masters),
+    }
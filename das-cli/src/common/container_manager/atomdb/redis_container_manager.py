@@ -1,7 +1,23 @@
-from typing import AnyStr, Dict, List, Union
+import re
+import time
+from typing import AnyStr, Dict, Iterable, Iterator, List, Union, cast
+
+import docker.errors
+from redis.cluster import RedisCluster
+from redis.exceptions import RedisError
 
 from common import Container, ContainerManager
-from common.network import is_server_port_available
+from common.container_manager.atomdb.redis_cluster_planner import (
+    REDIS_CLUSTER_SLOTS,
+    RedisClusterPlan,
+    plan_redis_cluster,
+)
+from common.container_manager.atomdb.redis_tuning import redis_tuning_to_args, resolve_redis_tuning
+from common.db_clients import get_redis_client
+from common.docker.exceptions import DockerError
+from common.exceptions import PortBindingError
+from common.network import is_port_reachable, probe_nodes_ports, probe_server_ports
+from common.utils import extract_service_hostname
 from settings.config import REDIS_IMAGE_NAME, REDIS_IMAGE_VERSION
 
 
@@ -26,6 +42,11 @@ class RedisContainerManager(ContainerManager):
         super().__init__(container, exec_context)
         self._options = options
 
+    # Redis cluster nodes talk to each other on the client port plus this offset.
+    CLUSTER_BUS_PORT_OFFSET = 10000
+
+    data_volumes = {"data": "/data"}
+
     @staticmethod
     def get_cluster_command_params(port: int) -> List[str]:
         return [
@@ -39,6 +60,24 @@ class RedisContainerManager(ContainerManager):
             "0.0.0.0",
         ]
 
+    @property
+    def profile(self) -> str:
+        return self._options.get("redis_profile") or "default"
+
+    @property
+    def nodes(self) -> List[Dict]:
+        return list(self._options.get("redis_nodes") or [])
+
+    @property
+    def is_cluster(self) -> bool:
+        return bool(self._options.get("redis_cluster"))
+
+    def get_tuning_settings(self) -> Dict[str, str]:
+        return resolve_redis_tuning(
+            self._options.get("redis_profile"),
+            self._options.get("redis_tuning"),
+        )
+
     def start_container(
         self,
         port: int,
@@ -49,15 +88,19 @@ class RedisContainerManager(ContainerManager):
         self.raise_running_container()
 
         cluster_command_params = self.get_cluster_command_params(port) if cluster else []
-        cluster_port = port + 10000
+        cluster_port = port + self.CLUSTER_BUS_PORT_OFFSET
 
         if cluster:
-            is_server_port_available(
-                username,
-                host,
-                port,
-                cluster_port,
-            )
+            ports_in_use = [
+                node_port
+                for node_port, in_use in probe_server_ports(
+                    username, host, [port, cluster_port]
+                ).items()
+                if in_use
+            ]
+
+            if ports_in_use:
+                raise PortBindingError(ports_in_use, host)
 
         container_id = self._start_container(
             restart_policy={
@@ -68,27 +111,225 @@ class RedisContainerManager(ContainerManager):
                 "redis-server",
                 "--port",
                 f"{port}",
-                "--appendonly",
-                "no",
-                "--save",
-                "",
-                "--protected-mode",
-                "no",
+                *redis_tuning_to_args(self.get_tuning_settings()),
                 *cluster_command_params,
             ],
         )
 
         return container_id
 
-    def start_cluster(self, redis_nodes: List[Dict], redis_port: AnyStr):
-        nodes_str = ""
+    def probe_cluster_ports(self, redis_nodes: List[Dict], port: int) -> Dict[str, List[int]]:
+        """
+        Probes the client and cluster bus ports of every node concurrently. The per-node
+        checks done by start_container are then answered from the probe cache.
+        """
+        return probe_nodes_ports(redis_nodes, [port, port + self.CLUSTER_BUS_PORT_OFFSET])
 
-        for redis_node in redis_nodes:
-            server_ip = redis_node.get("ip")
-            nodes_str += "{}:{} ".format(str(server_ip), str(redis_port))
+    def _get_cluster_node_id(self, ip: str, port: int) -> str:
+        result = self._exec_container(f"redis-cli -h {ip} -p {port} cluster myid")
 
-        cmd = f"redis-cli --cluster create {nodes_str} --cluster-replicas 0 --cluster-yes"
+        return result.output.decode("utf-8", errors="ignore").strip()
 
-        container_id = self._exec_container(cmd)
+    def _get_cluster_info(self, ip: str, port: int) -> Dict[str, str]:
+        result = self._exec_container(f"redis-cli -h {ip} -p {port} cluster info")
+        cluster_info = {}
 
-        return container_id
+        for line in result.output.decode("utf-8", errors="ignore").splitlines():
+            key, _, value = line.strip().partition(":")
+            cluster_info[key] = value
+
+        return cluster_info
+
+    def get_cluster_slot_counts(self, ip: str, port: int) -> Dict[str, int]:
+        """Reads back how many hash slots each master actually serves, keyed by master IP."""
+        result = self._exec_container(f"redis-cli -h {ip} -p {port} cluster nodes")
+        slot_counts: Dict[str, int] = {}
+
+        # <id> <ip:port@cport[,hostname]> <flags> <master> <ping> <pong> <epoch> <link> <slot>...
+        for line in result.output.decode("utf-8", errors="ignore").splitlines():
+            fields = line.split()
+
+            if len(fields) < 8 or "master" not in fields[2].split(","):
+                continue
+
+            master_ip = fields[1].split("@")[0].rsplit(":", 1)[0]
+            slots = 0
+
+            for slot_range in fields[8:]:
+                # Slots being imported or migrated are listed in brackets and not served yet.
+                if slot_range.startswith("["):
+                    continue
+
+                start, _, end = slot_range.partition("-")
+                slots += int(end or start) - int(start) + 1
+
+            slot_counts[master_ip] = slots
+
+        return slot_counts
+
+    def wait_for_cluster(self, ip: str, port: int, timeout: int = 60, interval: int = 2) -> None:
+        """Waits until every hash slot is served and the cluster reports cluster_state:ok."""
+        deadline = time.monotonic() + timeout
+        cluster_info: Dict[str, str] = {}
+
+        while time.monotonic() < deadline:
+            cluster_info = self._get_cluster_info(ip, port)
+
+            if (
+                cluster_info.get("cluster_state") == "ok"
+                and cluster_info.get("cluster_slots_assigned") == str(REDIS_CLUSTER_SLOTS)
+                and cluster_info.get("cluster_slots_ok") == str(REDIS_CLUSTER_SLOTS)
+            ):
+                return
+
+            time.sleep(interval)
+
+        raise DockerError(
+            "Timeout waiting for the Redis cluster to cover all hash slots "
+            f"(state: {cluster_info.get('cluster_state', 'unknown')}, "
+            f"slots ok: {cluster_info.get('cluster_slots_ok', 'unknown')}/{REDIS_CLUSTER_SLOTS})"
+        )
+
+    def start_cluster(self, redis_nodes: List[Dict], redis_port: AnyStr) -> RedisClusterPlan:
+        port = int(redis_port)
+        plan = plan_redis_cluster(
+            redis_nodes,
+            int(self._options.get("redis_replicas_per_master", 0) or 0),
+        )
+        masters_str = " ".join(f"{master['ip']}:{port}" for master in plan["masters"])
+        entrypoint = plan["masters"][0]["ip"]
+
+        self._exec_container(
+            f"redis-cli --cluster create {masters_str} --cluster-replicas 0 --cluster-yes"
+        )
+
+        master_ids = {
+            master["ip"]: self._get_cluster_node_id(master["ip"], port)
+            for master in plan["masters"]
+        }
+
+        # Slots are created evenly, so weighted masters need a rebalance while the cluster is empty.
+        # The slot counts differ by one even for equal weights, so they cannot tell.
+        if len({float(master.get("weight", 1)) for master in plan["masters"]}) > 1:
+            weights_str = " ".join(
+                f"{master_ids[master['ip']]}={master.get('weight', 1)}"
+                for master in plan["masters"]
+            )
+            # The default threshold skips masters within 2% of their share; 0 moves them all.
+            self._exec_container(
+                f"redis-cli --cluster rebalance {entrypoint}:{port} "
+                f"--cluster-weight {weights_str} --cluster-use-empty-masters --cluster-threshold 0"
+            )
+
+        for master_ip, replicas in plan["replicas"].items():
+            for replica in replicas:
+                self._exec_container(
+                    f"redis-cli --cluster add-node {replica['ip']}:{port} {master_ip}:{port} "
+                    f"--cluster-slave --cluster-master-id {master_ids[master_ip]}"
+                )
+
+        self.wait_for_cluster(entrypoint, port)
+
+        return plan
+
+    def _get_redis_host(self) -> str:
+        redis_endpoint = self._options.get("redis_endpoint") or ""
+
+        return extract_service_hostname(redis_endpoint) or "localhost"
+
+    def get_redis_client(self):
+        return get_redis_client(
+            self._get_redis_host(),
+            self._options["redis_port"],
+            bool(self._options.get("redis_cluster", False)),
+        )
+
+    def _get_key_count_from_client(self) -> int:
+        client = self.get_redis_client()
+
+        if isinstance(client, RedisCluster):
+            return cast(int, client.dbsize(target_nodes=RedisCluster.PRIMARIES))
+
+        return cast(int, client.dbsize())
+
+    def _get_key_count_from_exec(self) -> int:
+        redis_port = self._options.get("redis_port")
+
+        if self._options.get("redis_cluster"):
+            # DBSIZE only counts the local node; --cluster info sums the keys of every master.
+            result = self._exec_container(f"redis-cli --cluster info 127.0.0.1:{redis_port}")
+            pattern = r"(\d+) keys in \d+ masters"
+        else:
+            result = self._exec_container(f"redis-cli -p {redis_port} dbsize")
+            pattern = r"(\d+)"
+
+        match = re.search(pattern, result.output.decode("utf-8", errors="ignore"))
+
+        return int(match.group(1)) if match else 0
+
+    def get_key_stats(self) -> dict:
+        redis_port = self._options.get("redis_port")
+        keys = None
+
+        if redis_port and is_port_reachable(self._get_redis_host(), redis_port):
+            try:
+                keys = self._get_key_count_from_client()
+            except RedisError:
+                # Auth, TLS or cluster discovery errors leave the exec path to answer.
+                keys = None
+
+        if keys is None:
+            keys = self._get_key_count_from_exec()
+
+        return {"keys": keys}
+
+    def dump_rdb(self) -> Iterator[bytes]:
+        """Streams a point-in-time RDB snapshot of this node, taken through replication."""
+        return self.exec_stream(["redis-cli", "-p", str(self._options["redis_port"]), "--rdb", "-"])
+
+    def _is_loaded(self, port: int) -> bool:
+        try:
+            output = b"".join(self.exec_stream(["redis-cli", "-p", str(port), "ping"]))
+        except DockerError:
+            return False
+
+        return output.strip() == b"PONG"
+
+    def restore_rdb(
+        self,
+        chunks: Iterable[bytes],
+        size: int,
+        timeout: int = 600,
+        interval: int = 2,
+    ) -> None:
+        """
+        Replaces the data of this node with an RDB snapshot: the file is streamed into
+        the data volume and the container restarted so Redis loads it on boot.
+        """
+        redis_port = int(self._options["redis_port"])
+
+        if self.get_tuning_settings().get("appendonly") == "yes":
+            raise DockerError(
+                "Redis restores need 'appendonly no', as Redis boots from the AOF otherwise"
+            )
+
+        # Nothing may overwrite the restored file while the container shuts down.
+        b"".join(
+            self.exec_stream(["redis-cli", "-p", str(redis_port), "config", "set", "save", ""])
+        )
+        self.put_file(f"{self.data_volumes['data']}/dump.rdb", chunks, size)
+
+        try:
+            self.get_docker_client().containers.get(self.get_container().name).restart()
+        except docker.errors.APIError as e:
+            raise DockerError(e.explanation)
+
+        deadline = time.monotonic() + timeout
+
+        while not self._is_loaded(redis_port):
+            if time.monotonic() >= deadline:
+                raise DockerError(
+                    f"Timeout waiting for Redis to load the snapshot on port {redis_port}"
+                )
+
+            time.sleep(interval)
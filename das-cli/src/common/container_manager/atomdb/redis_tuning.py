@@ -0,0 +1,86 @@
+from typing import Any, Dict, List, Optional
+
+# AtomDB keeps no state worth persisting in Redis, so every profile starts from these.
+REDIS_BASE_SETTINGS: Dict[str, str] = {
+    "appendonly": "no",
+    "save": "",
+    "protected-mode": "no",
+}
+
+# Eviction is never enabled: dropping AtomDB keys would silently corrupt the indexes.
+REDIS_TUNING_PROFILES: Dict[str, Dict[str, str]] = {
+    "default": {},
+    "bulk-load": {
+        "io-threads": "4",
+        "io-threads-do-reads": "yes",
+        "hz": "10",
+        "tcp-backlog": "4096",
+        "maxmemory-policy": "noeviction",
+        "activerehashing": "no",
+        "lazyfree-lazy-eviction": "yes",
+        "lazyfree-lazy-expire": "yes",
+        "lazyfree-lazy-server-del": "yes",
+        "lazyfree-lazy-user-del": "yes",
+    },
+    "query-serving": {
+        "io-threads": "4",
+        "io-threads-do-reads": "yes",
+        "hz": "20",
+        "tcp-backlog": "4096",
+        "maxmemory-policy": "noeviction",
+        "lazyfree-lazy-user-del": "yes",
+    },
+    "low-memory": {
+        "io-threads": "1",
+        "hz": "10",
+        "tcp-backlog": "511",
+        "maxmemory": "1gb",
+        "maxmemory-policy": "noeviction",
+        "activedefrag": "yes",
+        "lazyfree-lazy-user-del": "yes",
+    },
+}
+
+DEFAULT_REDIS_TUNING_PROFILE = "default"
+
+
+def _format_setting(value: Any) -> str:
+    if isinstance(value, bool):
+        return "yes" if value else "no"
+
+    return str(value)
+
+
+def resolve_redis_tuning(
+    profile: Optional[str] = None,
+    overrides: Optional[Dict[str, Any]] = None,
+) -> Dict[str, str]:
+    '''
+    Merges the base settings, the named profile and the per-key overrides, in
+    that order, into the redis-server configuration to use.
+    '''
+    profile = profile or DEFAULT_REDIS_TUNING_PROFILE
+
+    if profile not in REDIS_TUNING_PROFILES:
+        raise ValueError(
+            f"Unknown Redis tuning profile '{profile}'. "
+            f"Available profiles: {', '.join(REDIS_TUNING_PROFILES)}"
+        )
+
+    settings = dict(REDIS_BASE_SETTINGS)
+    settings.update(REDIS_TUNING_PROFILES[profile])
+
+    for key, value in (overrides or {}).items():
+        settings[str(key).lstrip("-")] = _format_setting(value)
+
+    return settings
+
+
+def redis_tuning_to_args(settings: Dict[str, str]) -> List[str]:
+    '''Translates a resolved configuration into redis-server command line arguments.'''
+    args = []
+
+    for key, value in settings.items():
+        args.extend([f"--{key}", value])
+
+    return args
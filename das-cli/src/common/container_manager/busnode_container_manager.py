@@ -5,6 +5,8 @@ import docker
 from common import Container, ContainerImageMetadata, ContainerMetadata
 from common.docker import ContainerManager
 from common.docker.exceptions import DockerContainerDuplicateError
+from common.exceptions import PortRangeOverlapError
+from common.port_scanner import find_port_range_overlaps, parse_ports_range
 from settings.config import CURRENT_CONFIGFILE_PATH, DAS_IMAGE_NAME, DAS_IMAGE_VERSION
 
 from ..bus_node.busnode_command_registry import BusNodeCommandRegistry
@@ -32,9 +34,31 @@ class BusNodeContainerManager(ContainerManager):
 
         super().__init__(container)
 
+    def raise_on_port_range_overlap(self, ports_range: str) -> None:
+        ports_range_key = self._options.get("ports_range_key")
+        port_ranges = {
+            **(self._options.get("port_ranges") or {}),
+            ports_range_key: parse_ports_range(ports_range),
+        }
+
+        overlaps = [
+            overlap
+            for overlap in find_port_range_overlaps(port_ranges)
+            if ports_range_key in (overlap["first"], overlap["second"])
+        ]
+
+        if overlaps:
+            raise PortRangeOverlapError(overlaps)
+
     def start_container(self, ports_range: str, **kwargs) -> None:
         self.raise_running_container()
-        self.raise_on_port_in_use([self._options.get("service_port")])
+        self.raise_on_port_range_overlap(ports_range)
+
+        # The endpoint and the whole range are checked in one pass before the container starts.
+        start_port, end_port = parse_ports_range(ports_range)
+        self.raise_on_port_in_use(
+            [self._options.get("service_port"), *range(start_port, end_port + 1)]
+        )
 
         user_config_volume = CURRENT_CONFIGFILE_PATH
 
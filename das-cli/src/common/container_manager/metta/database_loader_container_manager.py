@@ -7,6 +7,8 @@ from common import Container, ContainerManager
 from common.docker.exceptions import DockerContainerNotFoundError, DockerError
 from settings.config import CURRENT_CONFIGFILE_PATH, DAS_IMAGE_NAME, DAS_IMAGE_VERSION
 
+LOGS_TAIL_LINES = 20
+
 
 class DatabaseLoaderContainerManager(ContainerManager):
     def __init__(
@@ -28,7 +30,14 @@ class DatabaseLoaderContainerManager(ContainerManager):
         super().__init__(container)
         self._options = options
 
-    def start_container(self, path):
+    def for_job(self, job_id: str) -> "DatabaseLoaderContainerManager":
+        """Returns a loader with its own container name, so several can run at the same time."""
+        return DatabaseLoaderContainerManager(
+            f"{self.get_container().name}-{job_id}",
+            options=self._options,
+        )
+
+    def start_container(self, path, follow_logs: bool = True):
 
         try:
             self.stop()
@@ -55,13 +64,21 @@ class DatabaseLoaderContainerManager(ContainerManager):
                 auto_remove=False,
             )
 
-            self.logs()
+            if follow_logs:
+                self.logs()
 
             exit_code = self.get_container_exit_status(container)
+            error_message = f"File '{os.path.basename(path)}' could not be loaded."
+
+            # Loaders running side by side do not stream their logs, so errors carry the last lines.
+            if exit_code != 0 and not follow_logs:
+                logs_tail = container.logs(tail=LOGS_TAIL_LINES).decode("utf-8", errors="ignore")
+                error_message = f"{error_message}\n{logs_tail.strip()}".strip()
+
             container.remove(v=True, force=True)
 
             if exit_code != 0:
-                raise DockerError(f"File '{os.path.basename(path)}' could not be loaded.")
+                raise DockerError(error_message)
 
             return None
         except docker.errors.APIError as e:
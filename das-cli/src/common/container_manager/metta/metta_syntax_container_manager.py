@@ -9,10 +9,10 @@ from settings.config import METTA_PARSER_IMAGE_NAME, METTA_PARSER_IMAGE_VERSION
 
 
 class MettaSyntaxContainerManager(ContainerManager):
-    def __init__(self) -> None:
+    def __init__(self, container_name: str = "das-metta-parser") -> None:
 
         container = Container(
-            "das-metta-parser",
+            container_name,
             metadata=ContainerMetadata(
                 {
                     "image": ContainerImageMetadata(
@@ -29,7 +29,11 @@ class MettaSyntaxContainerManager(ContainerManager):
 
         super().__init__(container)
 
-    def start_container(self, filepath):
+    def for_job(self, job_id: str) -> "MettaSyntaxContainerManager":
+        """Returns a syntax checker with its own container name, so several can run at the same time."""
+        return MettaSyntaxContainerManager(f"{self.get_container().name}-{job_id}")
+
+    def start_container(self, filepath, follow_logs: bool = True):
         if not os.path.exists(filepath):
             raise FileNotFoundError()
 
@@ -57,7 +61,8 @@ class MettaSyntaxContainerManager(ContainerManager):
                 tty=True,
             )
 
-            self.logs()
+            if follow_logs:
+                self.logs()
 
             exit_code = self.get_container_exit_status(container)
 
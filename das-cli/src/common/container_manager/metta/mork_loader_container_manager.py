@@ -0,0 +1,89 @@
+import os
+from typing import Dict
+
+import docker
+
+from common import Container, ContainerManager
+from common.docker.exceptions import DockerContainerNotFoundError, DockerError
+from settings.config import DAS_MORK_LOADER_IMAGE_NAME, DAS_MORK_LOADER_IMAGE_VERSION
+
+LOGS_TAIL_LINES = 20
+
+
+class MorkLoaderContainerManager(ContainerManager):
+    def __init__(
+        self,
+        loader_container_name: str,
+        options: Dict = {},
+    ) -> None:
+        container = Container(
+            loader_container_name,
+            metadata={
+                "port": None,
+                "image": {
+                    "name": DAS_MORK_LOADER_IMAGE_NAME,
+                    "version": DAS_MORK_LOADER_IMAGE_VERSION,
+                },
+            },
+        )
+
+        super().__init__(container)
+        self._options = options
+
+    def for_job(self, job_id: str) -> "MorkLoaderContainerManager":
+        """Returns a loader with its own container name, so several can run at the same time."""
+        return MorkLoaderContainerManager(
+            f"{self.get_container().name}-{job_id}",
+            options=self._options,
+        )
+
+    def start_container(self, path, follow_logs: bool = True):
+        try:
+            self.stop()
+        except (DockerContainerNotFoundError, DockerError):
+            pass
+
+        try:
+            filename = os.path.basename(path)
+            container_path = f"/tmp/{filename}"
+
+            # The file is handed to MorkDB's own ingest endpoint, which parses and
+            # indexes it server side instead of inserting the atoms one by one.
+            container = self._start_container(
+                command=self._gen_mork_loader_command(container_path),
+                environment={
+                    "MORK_SERVER_ADDR": self._options.get("morkdb_hostname"),
+                    "MORK_SERVER_PORT": self._options.get("morkdb_port"),
+                },
+                volumes={
+                    path: {
+                        "bind": container_path,
+                        "mode": "ro",
+                    },
+                },
+                stdin_open=True,
+                tty=False,
+                auto_remove=False,
+            )
+
+            if follow_logs:
+                self.logs()
+
+            exit_code = self.get_container_exit_status(container)
+            error_message = f"File '{filename}' could not be loaded into MorkDB."
+
+            if exit_code != 0 and not follow_logs:
+                logs_tail = container.logs(tail=LOGS_TAIL_LINES).decode("utf-8", errors="ignore")
+                error_message = f"{error_message}\n{logs_tail.strip()}".strip()
+
+            container.remove(v=True, force=True)
+
+            if exit_code != 0:
+                raise DockerError(error_message)
+
+            return None
+        except docker.errors.APIError as e:
+            raise DockerError(e.explanation)
+
+    def _gen_mork_loader_command(self, filepath: str) -> str:
+        return f"mork_loader --file={filepath}"
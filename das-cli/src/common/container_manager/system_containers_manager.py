@@ -6,7 +6,11 @@ from dateutil.parser import isoparse
 from docker.models.containers import Container
 
 from common.docker.docker_manager import DockerManager
+from common.docker.stats_stream_manager import ContainerStatsStreamManager
 from common.settings import Settings
+from common.systemutils.cgroup_stats import CgroupStatsReader
+
+LOCAL_DOCKER_BASE_URL = "http+docker://localhost"
 
 
 class SystemContainersManager(DockerManager):
@@ -18,27 +22,77 @@ class SystemContainersManager(DockerManager):
     ) -> None:
         super().__init__(exec_context)
         self._settings = settings
+        self._executor: ThreadPoolExecutor | None = None
+        self._stats_streams: ContainerStatsStreamManager | None = None
+        self._cgroup_reader = CgroupStatsReader()
 
     def _list_service_containers(self) -> list[Container]:
         return self.get_docker_client().containers.list(filters={"label": "das-cli.managed=true"})
 
+    def _is_local_daemon(self, containers: list[Container]) -> bool:
+        if self._exec_context not in (None, "default") or not containers:
+            return False
+
+        return containers[0].client.api.base_url == LOCAL_DOCKER_BASE_URL
+
+    def _collect_cgroup_stats(self, containers: list[Container]) -> dict[str, dict]:
+        if not self._is_local_daemon(containers) or not self._cgroup_reader.is_available():
+            return {}
+
+        return self._cgroup_reader.sample(containers)
+
+    def enable_stats_streams(self) -> None:
+        if self._stats_streams is None:
+            self._stats_streams = ContainerStatsStreamManager()
+
+    def disable_stats_streams(self) -> None:
+        if self._stats_streams is not None:
+            self._stats_streams.detach_all()
+            self._stats_streams = None
+
     def get_services_status(self) -> dict:
 
         containers = self._list_service_containers()
         services = {}
 
-        stats = self.map_services_thread(self._safe_get_container_stats, containers)
+        # Local containers are read from their cgroups, everything else from the Docker API.
+        cgroup_stats = self._collect_cgroup_stats(containers)
+
+        if self._stats_streams is not None:
+            self._stats_streams.sync(c for c in containers if c.id not in cgroup_stats)
+
+        stats = self.map_services_thread(
+            lambda container: self._safe_get_container_stats(
+                container,
+                cgroup_stats.get(container.id),
+            ),
+            containers,
+        )
 
         for stat in stats:
             services[stat["container_name"]] = stat
 
         return services
 
-    def _safe_get_container_stats(self, container: Container) -> dict:
+    def _get_container_stats(self, container: Container) -> dict:
+        if self._stats_streams is not None:
+            return self._stats_streams.get_latest(container.id) or {}
+
+        return container.stats(stream=False)
+
+    def _safe_get_container_stats(
+        self,
+        container: Container,
+        cgroup_stats: dict | None = None,
+    ) -> dict:
         try:
             container_labels: dict = container.labels
-            container_stats = container.stats(stream=False)
-            cpu_memory_info = self._parse_container_stats(container_stats)
+
+            if cgroup_stats is not None:
+                cpu_memory_info = cgroup_stats
+            else:
+                container_stats = self._get_container_stats(container)
+                cpu_memory_info = self._parse_container_stats(container_stats)
 
             container_name = container.name
             image = self._extract_image(container)
@@ -56,8 +110,13 @@ class SystemContainersManager(DockerManager):
                 "age": age,
                 "cpu_percent": cpu_memory_info.get("cpu_percent", 0),
                 "memory_mb": cpu_memory_info.get("memory_mb", 0),
+                "io_read_bytes": cpu_memory_info.get("io_read_bytes", 0),
+                "io_write_bytes": cpu_memory_info.get("io_write_bytes", 0),
                 "status": status,
                 "service_health": service_health,
+                "restart_count": container.attrs.get("RestartCount", 0),
+                "started_at": container.attrs.get("State", {}).get("StartedAt"),
+                "resources": self._extract_resources(container),
             }
 
         except Exception:
@@ -67,12 +126,10 @@ class SystemContainersManager(DockerManager):
             }
 
     def _extract_image(self, container: Container) -> str:
-        tags = getattr(container.image, "tags", [])
-
-        if tags:
-            return tags[0]
+        # Read from the attrs already loaded by the listing, container.image would inspect it again.
+        image = container.attrs.get("Config", {}).get("Image")
 
-        return "-"
+        return image or "-"
 
     def _extract_port(self, container: Container) -> str:
 
@@ -108,6 +165,16 @@ class SystemContainersManager(DockerManager):
 
         return "-"
 
+    def _extract_resources(self, container: Container) -> dict:
+        host_config = container.attrs.get("HostConfig", {})
+
+        return {
+            "cpuset_cpus": host_config.get("CpusetCpus") or None,
+            "cpu_shares": host_config.get("CpuShares") or None,
+            "nano_cpus": host_config.get("NanoCpus") or None,
+            "mem_limit_bytes": host_config.get("Memory") or None,
+        }
+
     def _extract_health(self, container: Container) -> str:
 
         attrs = container.attrs
@@ -154,9 +221,23 @@ class SystemContainersManager(DockerManager):
             2,
         )
 
+        io_read_bytes = 0
+        io_write_bytes = 0
+        io_entries = stats.get("blkio_stats", {}).get("io_service_bytes_recursive") or []
+
+        for entry in io_entries:
+            op = str(entry.get("op", "")).lower()
+
+            if op == "read":
+                io_read_bytes += int(entry.get("value", 0))
+            elif op == "write":
+                io_write_bytes += int(entry.get("value", 0))
+
         return {
             "cpu_percent": round(cpu_percent, 2),
             "memory_mb": memory_mb,
+            "io_read_bytes": io_read_bytes,
+            "io_write_bytes": io_write_bytes,
         }
 
     def _calculate_cpu_percent(self, stats: dict) -> float:
@@ -186,9 +267,9 @@ class SystemContainersManager(DockerManager):
 
         return 0.0
 
-    def map_services_thread(self, fetch_function, containers: Container):
+    def map_services_thread(self, fetch_function, containers: list[Container]) -> list:
 
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            results = executor.map(fetch_function, containers)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=10)
 
-        return results
+        return list(self._executor.map(fetch_function, containers))
@@ -0,0 +1,303 @@
+import os
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Union
+
+from common.settings import Settings
+
+NUMA_NODES_PATH = Path("/sys/devices/system/node")
+
+# Config paths of the long-running services that may share a host. A service whose
+# 'resources' is "auto" gets a slice of the cores split among all the "auto" ones.
+DAS_SERVICE_PATHS = [
+    "atomdb.redis",
+    "atomdb.mongodb",
+    "atomdb.morkdb",
+    "agents.attention",
+    "agents.query",
+    "agents.link_creation",
+    "agents.inference",
+    "agents.evolution",
+    "agents.context",
+    "agents.atomdb",
+    "agents.command_router",
+    "environment.jupyter",
+]
+
+# Relative share of the cores of each service in "auto" mode, overridable with 'weight'.
+AUTO_CPU_WEIGHTS: Dict[str, float] = {
+    "atomdb.redis": 2,
+    "atomdb.mongodb": 3,
+    "atomdb.morkdb": 3,
+    "agents.query": 2,
+}
+
+# Services started once per entry of their 'nodes' list, each in the node's Docker context.
+NODE_SERVICE_NAMES = ("redis", "mongodb")
+
+LOCAL_CONTEXT = "default"
+
+RESOURCE_KEYS = ("cpuset_cpus", "mem_limit", "cpu_shares", "nano_cpus")
+
+CPU_LIST_REGEX = re.compile(r"^\d+(-\d+)?$")
+
+
+def parse_cpu_list(cpu_list: str) -> List[int]:
+    '''Parses a kernel CPU list such as "0-3,8,10-11".'''
+    cpus: List[int] = []
+
+    for part in cpu_list.strip().split(","):
+        part = part.strip()
+
+        if not part:
+            continue
+
+        if not CPU_LIST_REGEX.match(part):
+            raise ValueError(f"Invalid CPU list '{cpu_list}'")
+
+        start, _, end = part.partition("-")
+        cpus.extend(range(int(start), int(end or start) + 1))
+
+    return sorted(set(cpus))
+
+
+def format_cpu_list(cpus: List[int]) -> str:
+    '''Formats CPU ids as a compact CPU list, the format Docker expects in cpuset_cpus.'''
+    ranges: List[str] = []
+    sorted_cpus = sorted(set(cpus))
+    index = 0
+
+    while index < len(sorted_cpus):
+        start = end = sorted_cpus[index]
+
+        while index + 1 < len(sorted_cpus) and sorted_cpus[index + 1] == end + 1:
+            index += 1
+            end = sorted_cpus[index]
+
+        ranges.append(str(start) if start == end else f"{start}-{end}")
+        index += 1
+
+    return ",".join(ranges)
+
+
+def read_cpu_topology(nodes_path: Path = NUMA_NODES_PATH) -> List[List[int]]:
+    '''
+    Returns the online CPUs grouped by NUMA node. Machines without NUMA information
+    are reported as a single node holding every CPU.
+    '''
+    numa_nodes: List[List[int]] = []
+
+    try:
+        node_paths = sorted(
+            (path for path in nodes_path.glob("node[0-9]*") if path.name[4:].isdigit()),
+            key=lambda path: int(path.name[4:]),
+        )
+
+        for node_path in node_paths:
+            cpus = parse_cpu_list((node_path / "cpulist").read_text())
+
+            if cpus:
+                numa_nodes.append(cpus)
+    except (OSError, ValueError):
+        numa_nodes = []
+
+    if not numa_nodes:
+        numa_nodes = [list(range(os.cpu_count() or 1))]
+
+    return numa_nodes
+
+
+def _share_cpus(weights: Dict[str, float], total_cpus: int) -> Dict[str, int]:
+    # Every service gets one core, the rest is split by weight with the largest remainder method.
+    shares = {service: 1 for service in weights}
+    spare_cpus = total_cpus - len(weights)
+    total_weight = sum(weights.values())
+    exact = {service: spare_cpus * weight / total_weight for service, weight in weights.items()}
+
+    for service, value in exact.items():
+        shares[service] += int(value)
+
+    leftover = total_cpus - sum(shares.values())
+
+    for service in sorted(exact, key=lambda s: (int(exact[s]) - exact[s], s))[:leftover]:
+        shares[service] += 1
+
+    return shares
+
+
+def partition_cpus(weights: Dict[str, float], numa_nodes: List[List[int]]) -> Dict[str, List[int]]:
+    '''
+    Splits the CPUs among the services in proportion to their weights. The heaviest
+    services are placed first, each in the NUMA node that fits it most tightly, so a
+    service only spans nodes when no single node has enough free cores left.
+    '''
+    all_cpus = [cpu for node in numa_nodes for cpu in node]
+    services = sorted(weights, key=lambda service: (-weights[service], service))
+
+    if not services:
+        return {}
+
+    if len(services) > len(all_cpus):
+        return {service: [all_cpus[i % len(all_cpus)]] for i, service in enumerate(services)}
+
+    shares = _share_cpus(weights, len(all_cpus))
+    free_cpus = [list(node) for node in numa_nodes]
+    assignment: Dict[str, List[int]] = {}
+
+    for service in services:
+        share = shares[service]
+        fitting_nodes = [node for node in free_cpus if len(node) >= share]
+
+        if fitting_nodes:
+            node = min(fitting_nodes, key=len)
+            assignment[service] = node[:share]
+            del node[:share]
+            continue
+
+        assignment[service] = []
+
+        for node in sorted(free_cpus, key=len, reverse=True):
+            taken = node[: share - len(assignment[service])]
+            assignment[service].extend(taken)
+            del node[: len(taken)]
+
+    return assignment
+
+
+def _normalize_resources(config: Union[str, Dict[str, Any], None]) -> Dict[str, Any]:
+    if not config:
+        return {}
+
+    if config == "auto":
+        return {"cpuset_cpus": "auto"}
+
+    if not isinstance(config, dict):
+        raise ValueError(
+            f"Invalid resources configuration '{config}'. Expected 'auto' or a mapping"
+        )
+
+    return dict(config)
+
+
+def _get_service_paths(settings: Settings) -> List[str]:
+    if settings.get("atomdb.type") != "adapterdb":
+        return list(DAS_SERVICE_PATHS)
+
+    return [
+        path.replace("atomdb.", "atomdb.adapterdb.atomdb_backend.", 1)
+        if path in ("atomdb.redis", "atomdb.mongodb", "atomdb.morkdb")
+        else path
+        for path in DAS_SERVICE_PATHS
+    ]
+
+
+def _get_auto_weight(path: str) -> float:
+    return AUTO_CPU_WEIGHTS.get(path.replace("atomdb.adapterdb.atomdb_backend.", "atomdb."), 1)
+
+
+def _normalize_context(context: Optional[str]) -> str:
+    return (context or LOCAL_CONTEXT).lower()
+
+
+def _get_service_contexts(settings: Settings, path: str) -> Set[str]:
+    '''Returns the Docker contexts a service runs in: its nodes' for the databases, local otherwise.'''
+    if not path.startswith("atomdb.") or path.rsplit(".", 1)[-1] not in NODE_SERVICE_NAMES:
+        return {LOCAL_CONTEXT}
+
+    nodes = settings.get(f"{path}.nodes", []) or []
+
+    return {_normalize_context(node.get("context")) for node in nodes} or {LOCAL_CONTEXT}
+
+
+class ServiceResources:
+    """
+    The 'resources' section of one service. It is resolved when the container is
+    started, so a bad value only fails the commands that start that service.
+    """
+
+    def __init__(self, settings: Settings, service_path: str) -> None:
+        self._settings = settings
+        self._service_path = service_path
+
+    def _get_config(self, path: str) -> Dict[str, Any]:
+        return _normalize_resources(self._settings.get(f"{path}.resources", None))
+
+    def _get_auto_cpusets(self, context: str, numa_nodes: List[List[int]]) -> Dict[str, List[int]]:
+        # Only the services running in the same Docker context share its cores.
+        weights: Dict[str, float] = {}
+        service_paths = [*_get_service_paths(self._settings), self._service_path]
+
+        for path in dict.fromkeys(service_paths):
+            config = self._get_config(path)
+
+            if path != self._service_path and context not in _get_service_contexts(
+                self._settings, path
+            ):
+                continue
+
+            if config.get("cpuset_cpus") == "auto":
+                weight = float(config.get("weight", _get_auto_weight(path)))
+
+                if weight <= 0:
+                    raise ValueError(f"Invalid resources weight {weight} for '{path}'")
+
+                weights[path] = weight
+
+        return partition_cpus(weights, numa_nodes)
+
+    def _resolve_auto_cpuset(
+        self,
+        exec_context: Optional[str],
+        read_context_topology: Optional[Callable[[], List[List[int]]]],
+    ) -> List[int]:
+        context = _normalize_context(exec_context)
+
+        if context == LOCAL_CONTEXT:
+            numa_nodes = read_cpu_topology()
+        elif read_context_topology is not None:
+            numa_nodes = read_context_topology()
+        else:
+            raise ValueError(
+                f"'resources: auto' of '{self._service_path}' cannot be resolved for the "
+                f"Docker context '{context}'. Set an explicit cpuset_cpus for this service"
+            )
+
+        return self._get_auto_cpusets(context, numa_nodes)[self._service_path]
+
+    def to_docker_kwargs(
+        self,
+        exec_context: Optional[str] = None,
+        read_context_topology: Optional[Callable[[], List[List[int]]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Translates the section into Docker run arguments (cpuset_cpus, mem_limit,
+        cpu_shares and nano_cpus). 'cpus' is accepted as a friendlier spelling of
+        nano_cpus. An "auto" cpuset is split among the services of the Docker context
+        the container starts in, using read_context_topology for contexts other than
+        the local one.
+        """
+        config = self._get_config(self._service_path)
+        resources: Dict[str, Any] = {}
+
+        if "cpus" in config and "nano_cpus" not in config:
+            config["nano_cpus"] = int(float(config["cpus"]) * 1_000_000_000)
+
+        for key in RESOURCE_KEYS:
+            value: Optional[Any] = config.get(key)
+
+            if value is None:
+                continue
+
+            if key == "cpuset_cpus":
+                if value == "auto":
+                    value = format_cpu_list(
+                        self._resolve_auto_cpuset(exec_context, read_context_topology)
+                    )
+                else:
+                    value = format_cpu_list(parse_cpu_list(str(value)))
+            elif key in ("cpu_shares", "nano_cpus"):
+                value = int(value)
+
+            resources[key] = value
+
+        return resources
@@ -0,0 +1,84 @@
+import threading
+from typing import Any, Dict, Tuple, Union
+
+import pymongo
+import redis
+from redis.cluster import RedisCluster
+
+_DEFAULT_TIMEOUT_SECONDS = 2.0
+
+_clients_lock = threading.Lock()
+_mongodb_clients: Dict[Tuple[str, int, str], pymongo.MongoClient] = {}
+_redis_clients: Dict[Tuple[str, int, bool], Union[redis.Redis, RedisCluster]] = {}
+
+
+def get_mongodb_client(
+    host: str,
+    port: int,
+    username: str,
+    password: str,
+    timeout: float = _DEFAULT_TIMEOUT_SECONDS,
+) -> pymongo.MongoClient:
+    '''Returns a pooled MongoClient for the endpoint, creating it on first use.'''
+    key = (host, int(port), username)
+
+    with _clients_lock:
+        client = _mongodb_clients.get(key)
+
+        if client is None:
+            timeout_ms = int(timeout * 1000)
+            client = pymongo.MongoClient(
+                host=host,
+                port=int(port),
+                username=username,
+                password=password,
+                authSource="admin",
+                directConnection=True,
+                readPreference="primaryPreferred",
+                serverSelectionTimeoutMS=timeout_ms,
+                connectTimeoutMS=timeout_ms,
+            )
+            _mongodb_clients[key] = client
+
+    return client
+
+
+def get_redis_client(
+    host: str,
+    port: int,
+    cluster: bool = False,
+    timeout: float = _DEFAULT_TIMEOUT_SECONDS,
+) -> Union[redis.Redis, RedisCluster]:
+    '''Returns a pooled Redis (or RedisCluster) client for the endpoint.'''
+    key = (host, int(port), bool(cluster))
+
+    with _clients_lock:
+        client = _redis_clients.get(key)
+
+        if client is None:
+            client_kwargs: Dict[str, Any] = {
+                "host": host,
+                "port": int(port),
+                "socket_timeout": timeout,
+                "socket_connect_timeout": timeout,
+            }
+
+            if cluster:
+                client = RedisCluster(**client_kwargs)  # type: ignore[abstract]
+            else:
+                client = redis.Redis(**client_kwargs)
+            _redis_clients[key] = client
+
+    return client
+
+
+def close_clients() -> None:
+    with _clients_lock:
+        for mongodb_client in _mongodb_clients.values():
+            mongodb_client.close()
+
+        for redis_client in _redis_clients.values():
+            redis_client.close()
+
+        _mongodb_clients.clear()
+        _redis_clients.clear()
@@ -1,6 +1,8 @@
-import socket
+import secrets
+import tarfile
 import time
-from typing import Any, List, Optional, TypedDict, Union, cast
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TypedDict, Union, cast
 
 import docker
 import docker.errors
@@ -9,6 +11,8 @@ from rich.live import Live
 from rich.panel import Panel
 
 from common.exceptions import PortBindingError
+from common.logger import logger
+from common.port_scanner import find_ports_in_use
 from settings.config import SERVICES_NETWORK_NAME
 
 from ..utils import deep_merge_dicts
@@ -66,6 +70,10 @@ class Container:
 
 
 class ContainerManager(DockerManager):
+    # Named volumes mounted on every start, as {suffix: path in the container}. They are
+    # labeled with the container name, so pruning only touches the volumes of this service.
+    data_volumes: Dict[str, str] = {}
+
     def __init__(
         self,
         container: Container,
@@ -94,6 +102,68 @@ class ContainerManager(DockerManager):
         except docker.errors.APIError as e:
             raise DockerError(e.explanation)
 
+    def exec_stream(self, command: List[str], chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+        """
+        Runs a command in the container and yields its standard output as it is produced,
+        so large outputs such as database dumps are never held in memory. Raises
+        DockerError when the command exits with an error.
+        """
+        container_name = self.get_container().name
+        api = self.get_docker_client().api
+        stderr_tail = b""
+
+        try:
+            exec_id = api.exec_create(container_name, command, stdout=True, stderr=True)["Id"]
+
+            for stdout, stderr in api.exec_start(exec_id, stream=True, demux=True):
+                if stderr:
+                    stderr_tail = (stderr_tail + stderr)[-4096:]
+
+                if stdout:
+                    for offset in range(0, len(stdout), chunk_size):
+                        yield stdout[offset : offset + chunk_size]
+
+            exit_code = api.exec_inspect(exec_id).get("ExitCode")
+        except docker.errors.APIError as e:
+            raise DockerError(e.explanation)
+
+        if exit_code != 0:
+            raise DockerError(
+                f"Command '{' '.join(command)}' failed with exit code {exit_code}. "
+                f"Output: {stderr_tail.decode('utf-8', errors='ignore').strip()}"
+            )
+
+    def put_file(self, path: str, chunks: Iterable[bytes], size: int, mode: int = 0o644) -> None:
+        """
+        Streams a file of a known size into the container, wrapped on the fly in the
+        single-entry tar archive the Docker API expects.
+        """
+        directory, _, file_name = path.rpartition("/")
+        tar_info = tarfile.TarInfo(file_name)
+        tar_info.size = size
+        tar_info.mode = mode
+        tar_info.mtime = int(time.time())
+
+        def archive() -> Iterator[bytes]:
+            yield tar_info.tobuf(format=tarfile.GNU_FORMAT)
+            written = 0
+
+            for chunk in chunks:
+                written += len(chunk)
+                yield chunk
+
+            if written != size:
+                raise DockerError(f"Expected {size} bytes for {path}, got {written}")
+
+            yield b"\0" * (-size % tarfile.BLOCKSIZE) + b"\0" * (2 * tarfile.BLOCKSIZE)
+
+        try:
+            self.get_docker_client().api.put_archive(
+                self.get_container().name, directory or "/", archive()
+            )
+        except docker.errors.APIError as e:
+            raise DockerError(e.explanation)
+
     @property
     def labels(self):
 
@@ -114,11 +184,75 @@ class ContainerManager(DockerManager):
             "das-cli.command.label": self._options.get("service_command_label"),
         }
 
+    @property
+    def volume_labels(self) -> Dict[str, str]:
+        return {
+            "das-cli.managed": "true",
+            "das-cli.container.name": self.get_container().name,
+            **self.labels,
+        }
+
+    def _create_data_volumes(self) -> Dict[str, dict]:
+        # Each start gets new volumes, as the anonymous ones declared by the images did,
+        # so a restarted service does not pick up the data of a previous run.
+        run_id = secrets.token_hex(4)
+        mounts = {}
+
+        try:
+            for suffix, path in self.data_volumes.items():
+                volume = self.get_docker_client().volumes.create(
+                    name=f"{self.get_container().name}-{suffix}-{run_id}",
+                    labels=self.volume_labels,
+                )
+                mounts[volume.name] = {"bind": path, "mode": "rw"}
+        except docker.errors.APIError:
+            self._remove_created_volumes(list(mounts))
+            raise
+
+        return mounts
+
+    def _remove_created_volumes(self, volume_names: List[str]) -> None:
+        # The volumes were created for a start that failed. Only the container that start
+        # may have created can use them, so it is removed with them.
+        client = self.get_docker_client()
+
+        for volume_name in volume_names:
+            try:
+                for container in client.containers.list(all=True, filters={"volume": volume_name}):
+                    container.remove(force=True)
+
+                client.volumes.get(volume_name).remove(force=True)
+            except docker.errors.APIError as e:
+                logger().warning(f"Could not remove the volume {volume_name}: {e.explanation}")
+
+    def _read_daemon_cpu_topology(self) -> List[List[int]]:
+        # A remote daemon reports how many CPUs its host has, but not their NUMA layout.
+        try:
+            cpu_count = int(self.get_docker_client().info().get("NCPU") or 1)
+        except docker.errors.APIError as e:
+            raise DockerError(e.explanation)
+
+        return [list(range(cpu_count))]
+
     def _start_container(self, **kwargs) -> Any:
         self.raise_running_container()
 
+        resources = self._options.get("resources")
+        resource_kwargs = (
+            resources.to_docker_kwargs(self._exec_context, self._read_daemon_cpu_topology)
+            if resources
+            else {}
+        )
+
+        data_volumes: Dict[str, dict] = {}
+
         try:
+            if self.data_volumes:
+                data_volumes = self._create_data_volumes()
+                kwargs["volumes"] = {**data_volumes, **kwargs.get("volumes", {})}
+
             response = self.get_docker_client().containers.run(
+                **resource_kwargs,
                 **kwargs,
                 image=self.get_container().image,
                 name=self.get_container().name,
@@ -130,6 +264,8 @@ class ContainerManager(DockerManager):
             return response
 
         except docker.errors.APIError as e:
+            self._remove_created_volumes(list(data_volumes))
+
             if e.response.status_code == 404:
                 raise DockerContainerNotFoundError(
                     f"The docker image {self.get_container().image} for the attention broker could not be found!"
@@ -138,12 +274,10 @@ class ContainerManager(DockerManager):
             raise DockerError(e.explanation)
 
     def raise_on_port_in_use(self, ports: List) -> None:
-        for port in ports:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                port_in_use = s.connect_ex(("localhost", int(port))) == 0
+        ports_in_use = find_ports_in_use([int(port) for port in ports])
 
-                if port_in_use:
-                    raise PortBindingError([port])
+        if ports_in_use:
+            raise PortBindingError(ports_in_use)
 
     def raise_running_container(self) -> None:
         if self.is_running():
@@ -161,6 +295,27 @@ class ContainerManager(DockerManager):
         except docker.errors.APIError as e:
             raise DockerError(e.explanation)
 
+    def list_job_container_names(self) -> List[str]:
+        """Lists the containers, running or not, named after this one with a job suffix."""
+        prefix = f"{self.get_container().name}-"
+
+        try:
+            containers = self.get_docker_client().containers.list(
+                all=True, filters={"name": prefix}
+            )
+        except docker.errors.APIError as e:
+            raise DockerError(e.explanation)
+
+        return [container.name for container in containers if container.name.startswith(prefix)]
+
+    def remove_container(self, container_name: str) -> None:
+        try:
+            self.get_docker_client().containers.get(container_name).remove(force=True)
+        except docker.errors.NotFound as e:
+            raise DockerContainerNotFoundError(e.explanation)
+        except docker.errors.APIError as e:
+            raise DockerError(e.explanation)
+
     def get_label(self, label: str) -> Union[dict, None]:
         container_name = self.get_container().name
         container = None
@@ -237,13 +392,28 @@ class ContainerManager(DockerManager):
         except docker.errors.APIError:
             pass
 
-    def prune_volumes(self) -> dict[str, Any]:
+    def remove_volumes(self) -> List[str]:
+        """
+        Removes the volumes labeled with this container name, including the ones left by
+        earlier runs, and returns their names. The volumes are removed concurrently.
+        """
         client = self.get_docker_client()
+        container_name = self.get_container().name
+
         try:
-            result = client.volumes.prune()
-            return result
+            volumes = client.volumes.list(
+                filters={"label": f"das-cli.container.name={container_name}"}
+            )
+
+            if not volumes:
+                return []
+
+            with ThreadPoolExecutor(max_workers=len(volumes)) as executor:
+                list(executor.map(lambda volume: volume.remove(force=True), volumes))
+
+            return [volume.name for volume in volumes]
         except docker.errors.APIError as e:
-            raise DockerError(f"Error pruning volumes: {e.explanation}")
+            raise DockerError(f"Error removing the volumes of {container_name}: {e.explanation}")
 
     def stop(
         self,
@@ -273,7 +443,7 @@ class ContainerManager(DockerManager):
             raise DockerError(e.explanation)
 
         if remove_volume:
-            self.prune_volumes()
+            self.remove_volumes()
 
     def get_container_exit_status(self, container) -> int:
         try:
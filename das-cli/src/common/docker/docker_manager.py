@@ -1,6 +1,7 @@
 import os
 import platform
-from typing import Union
+import threading
+from typing import Dict, Union
 
 import docker
 
@@ -8,6 +9,11 @@ import docker
 class DockerManager:
     _exec_context: Union[str, None]
 
+    # Clients are shared by every manager of the process, one per Docker context, so
+    # consecutive commands run in the same process reuse their connections.
+    _clients: Dict[str, docker.DockerClient] = {}
+    _clients_lock = threading.Lock()
+
     def __init__(self, exec_context: Union[str, None] = None) -> None:
         self.set_exec_context(exec_context)
 
@@ -53,4 +59,21 @@ class DockerManager:
                 os.environ.pop("DOCKER_CONTEXT", None)
 
     def get_docker_client(self) -> docker.DockerClient:
-        return self._get_client(self._exec_context)
+        client_key = (self._exec_context or "default").lower()
+
+        with DockerManager._clients_lock:
+            client = DockerManager._clients.get(client_key)
+
+            if client is None:
+                client = self._get_client(self._exec_context)
+                DockerManager._clients[client_key] = client
+
+        return client
+
+    @classmethod
+    def close_docker_clients(cls) -> None:
+        with cls._clients_lock:
+            for client in cls._clients.values():
+                client.close()
+
+            cls._clients.clear()
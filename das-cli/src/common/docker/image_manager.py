@@ -1,6 +1,7 @@
-from typing import Union
+from typing import Callable, Optional, Tuple, Union
 
 import docker
+import docker.errors
 
 from .docker_manager import DockerManager
 from .exceptions import DockerError, DockerImageNotFoundError
@@ -21,6 +22,68 @@ class ImageManager(DockerManager):
 
             raise DockerError(e.explanation)
 
+    @staticmethod
+    def split_image(image: str) -> Tuple[str, str]:
+        repository, _, tag = image.rpartition(":")
+
+        # A colon before the last slash belongs to a registry port, not to the tag.
+        if not repository or "/" in tag:
+            return image, "latest"
+
+        return repository, tag
+
+    def is_image_current(self, image: str) -> bool:
+        """
+        Tells whether the image is present locally with the digest the registry
+        currently serves for its tag. When the registry cannot be reached, any
+        local copy is considered current.
+        """
+        client = self.get_docker_client()
+
+        try:
+            local_image = client.images.get(image)
+        except docker.errors.ImageNotFound:
+            return False
+        except docker.errors.APIError as e:
+            raise DockerError(e.explanation)
+
+        try:
+            registry_digest = client.images.get_registry_data(image).id
+        except docker.errors.APIError:
+            return True
+
+        local_digests = [
+            repo_digest.partition("@")[2]
+            for repo_digest in local_image.attrs.get("RepoDigests") or []
+        ]
+
+        return registry_digest in local_digests
+
+    def pull_image(
+        self,
+        image: str,
+        on_progress: Optional[Callable[[dict], None]] = None,
+    ) -> None:
+        """
+        Pulls an image through the streaming API, handing every layer progress
+        event ({"id", "status", "progressDetail"}) to on_progress.
+        """
+        repository, tag = self.split_image(image)
+
+        try:
+            for event in self.get_docker_client().api.pull(
+                repository, tag=tag, stream=True, decode=True
+            ):
+                if "error" in event:
+                    raise DockerError(f"Failed to pull {image}: {event['error']}")
+
+                if on_progress is not None:
+                    on_progress(event)
+        except docker.errors.NotFound:
+            raise DockerImageNotFoundError(f"The image {image} could not be found in the registry.")
+        except docker.errors.APIError as e:
+            raise DockerError(e.explanation)
+
     def get_label(self, repository, tag, label) -> Union[str, None]:
         container = None
 
@@ -0,0 +1,132 @@
+import threading
+from typing import Dict, Iterable, Optional
+
+import docker.errors
+import requests.exceptions
+from docker.models.containers import Container
+from docker.types.daemon import CancellableStream
+
+from common.logger import logger
+
+
+class ContainerStatsStreamManager:
+    """
+    Keeps one long-lived `stats(stream=True)` subscription per container and
+    exposes the most recent sample of each one through a shared table.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._latest_stats: Dict[str, dict] = {}
+        self._subscriptions: Dict[str, threading.Event] = {}
+        self._streams: Dict[str, CancellableStream] = {}
+
+    def sync(self, containers: Iterable[Container]) -> None:
+        """Attaches streams for new containers and detaches the ones that are gone."""
+        container_ids = set()
+
+        for container in containers:
+            container_ids.add(container.id)
+            self.attach(container)
+
+        with self._lock:
+            detached_ids = [cid for cid in self._subscriptions if cid not in container_ids]
+
+        for container_id in detached_ids:
+            self.detach(container_id)
+
+    def attach(self, container: Container) -> None:
+        with self._lock:
+            if container.id in self._subscriptions:
+                return
+
+            stop_event = threading.Event()
+            self._subscriptions[container.id] = stop_event
+
+        threading.Thread(
+            target=self._consume,
+            args=(container, stop_event),
+            daemon=True,
+        ).start()
+
+    def detach(self, container_id: str) -> None:
+        with self._lock:
+            stop_event = self._subscriptions.pop(container_id, None)
+            stream = self._streams.pop(container_id, None)
+            self._latest_stats.pop(container_id, None)
+
+        if stop_event:
+            stop_event.set()
+
+        # Closing the response unblocks the reader now instead of at the next sample.
+        if stream:
+            self._close_stream(stream)
+
+    def detach_all(self) -> None:
+        with self._lock:
+            container_ids = list(self._subscriptions)
+
+        for container_id in container_ids:
+            self.detach(container_id)
+
+    def get_latest(self, container_id: str) -> Optional[dict]:
+        with self._lock:
+            return self._latest_stats.get(container_id)
+
+    @staticmethod
+    def _open_stream(container: Container) -> CancellableStream:
+        # Same as container.stats(stream=True), but keeps the response so it can be closed.
+        api = container.client.api
+        response = api._get(
+            api._url("/containers/{0}/stats", container.id),
+            stream=True,
+            params={"stream": True},
+        )
+        api._raise_for_status(response)
+
+        return CancellableStream(api._stream_helper(response, decode=True), response)
+
+    @staticmethod
+    def _close_stream(stream: CancellableStream) -> None:
+        try:
+            stream.close()
+        except (docker.errors.DockerException, OSError) as e:
+            logger().debug(f"Could not close the stats stream: {e}")
+
+    def _consume(self, container: Container, stop_event: threading.Event) -> None:
+        stream = None
+
+        try:
+            stream = self._open_stream(container)
+
+            with self._lock:
+                if stop_event.is_set():
+                    return
+
+                self._streams[container.id] = stream
+
+            # Docker sends one sample per second and closes the stream when the container stops.
+            for stats in stream:
+                if stop_event.is_set():
+                    return
+
+                with self._lock:
+                    self._latest_stats[container.id] = stats
+        except (
+            docker.errors.DockerException,
+            requests.exceptions.RequestException,
+            ValueError,
+        ) as e:
+            if not stop_event.is_set():
+                logger().warning(f"Stats stream of container {container.name} failed: {e}")
+        finally:
+            if stream:
+                self._close_stream(stream)
+
+            with self._lock:
+                if self._subscriptions.get(container.id) is stop_event:
+                    self._subscriptions.pop(container.id, None)
+                    self._latest_stats.pop(container.id, None)
+
+                if self._streams.get(container.id) is stream:
+                    self._streams.pop(container.id, None)
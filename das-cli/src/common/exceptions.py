@@ -14,3 +14,30 @@ class InvalidRemoteConfiguration(Exception):
 
     def __init__(self, *args):
         super().__init__(*args)
+
+
+class RemoteFanOutError(Exception):
+    """Raised when a command run on several hosts does not meet the requested exit policy"""
+
+    def __init__(self, failed_hosts: list[str], exit_policy: str):
+        self.failed_hosts = failed_hosts
+        self.exit_policy = exit_policy
+        hosts_str = ", ".join(failed_hosts)
+        super().__init__(f"Command failed on {len(failed_hosts)} host(s): {hosts_str}.")
+
+
+class PortRangeOverlapError(Exception):
+    """Raised when the ports reserved by different services overlap."""
+
+    def __init__(self, overlaps: list):
+        self.overlaps = overlaps
+        details = "; ".join(
+            f"{overlap['first']} and {overlap['second']} share "
+            + (
+                f"port {overlap['start']}"
+                if overlap["start"] == overlap["end"]
+                else f"ports {overlap['start']}-{overlap['end']}"
+            )
+            for overlap in overlaps
+        )
+        super().__init__(f"Overlapping port reservations: {details}.")
@@ -6,6 +6,7 @@ from common.config.store import JsonConfigStore
 from common.container_manager.atomdb.mongodb_container_manager import (
     MongodbContainerManager,
 )
+from common.container_resources import ServiceResources
 from common.utils import extract_service_port
 from settings.config import SECRETS_PATH
 
@@ -36,6 +37,9 @@ class MongoDbContainerManagerFactory:
         mongodb_cluster = self._settings.get(f"{backend_path}.cluster", False)
         mongodb_cluster_secret_key = self._settings.get(f"{backend_path}.cluster_secret_key", None)
 
+        mongodb_profile = self._settings.get(f"{backend_path}.profile", None)
+        mongodb_tuning = self._settings.get(f"{backend_path}.tuning", {})
+
         container_name = f"das-cli-mongodb-{mongodb_port}"
 
         return MongodbContainerManager(
@@ -50,5 +54,8 @@ class MongoDbContainerManagerFactory:
                 "mongodb_nodes": mongodb_nodes,
                 "mongodb_cluster": mongodb_cluster,
                 "mongodb_cluster_secret_key": mongodb_cluster_secret_key,
+                "mongodb_profile": mongodb_profile,
+                "mongodb_tuning": mongodb_tuning,
+                "resources": ServiceResources(self._settings, backend_path),
             },
         )
@@ -4,6 +4,7 @@ from common import Settings
 from common.config.core import get_core_defaults_dict
 from common.config.store import JsonConfigStore
 from common.container_manager.atomdb.morkdb_container_manager import MorkdbContainerManager
+from common.container_resources import ServiceResources
 from common.utils import extract_service_hostname, extract_service_port
 from settings.config import SECRETS_PATH
 
@@ -37,5 +38,6 @@ class MorkDbContainerManagerFactory:
                 "morkdb_endpoint": morkdb_endpoint,
                 "morkdb_port": morkdb_port,
                 "morkdb_hostname": "0.0.0.0" if morkdb_hostname == "localhost" else morkdb_hostname,
+                "resources": ServiceResources(self._settings, backend_path),
             },
         )
@@ -6,6 +6,7 @@ from common.config.store import JsonConfigStore
 from common.container_manager.atomdb.redis_container_manager import (
     RedisContainerManager,
 )
+from common.container_resources import ServiceResources
 from common.utils import extract_service_port
 from settings.config import SECRETS_PATH
 
@@ -30,6 +31,9 @@ class RedisContainerManagerFactory:
 
         redis_nodes = self._settings.get(f"{backend_path}.nodes", [])
         redis_cluster = self._settings.get(f"{backend_path}.cluster", False)
+        redis_replicas_per_master = self._settings.get(f"{backend_path}.replicas_per_master", 0)
+        redis_profile = self._settings.get(f"{backend_path}.profile", None)
+        redis_tuning = self._settings.get(f"{backend_path}.tuning", {})
 
         container_name = f"das-cli-redis-{redis_port}"
 
@@ -42,5 +46,9 @@ class RedisContainerManagerFactory:
                 "redis_port": redis_port,
                 "redis_nodes": redis_nodes,
                 "redis_cluster": redis_cluster,
+                "redis_replicas_per_master": redis_replicas_per_master,
+                "redis_profile": redis_profile,
+                "redis_tuning": redis_tuning,
+                "resources": ServiceResources(self._settings, backend_path),
             },
         )
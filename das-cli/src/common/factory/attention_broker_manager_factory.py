@@ -5,6 +5,7 @@ from common.config.store import JsonConfigStore
 from common.container_manager.agents.attention_broker_container_manager import (
     AttentionBrokerManager,
 )
+from common.container_resources import ServiceResources
 from common.utils import extract_service_port
 from settings.config import SECRETS_PATH
 
@@ -26,5 +27,6 @@ class AttentionBrokerManagerFactory:
                 "attention_broker_port": attention_broker_port,
                 "service_name": "Attention Broker",
                 "service_command_label": "attention-broker",
+                "resources": ServiceResources(self._settings, "agents.attention"),
             },
         )
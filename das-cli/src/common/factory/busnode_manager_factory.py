@@ -2,6 +2,8 @@ import os
 
 from common import Settings
 from common.config.store import JsonConfigStore
+from common.container_resources import ServiceResources
+from common.port_scanner import get_configured_port_ranges
 from common.utils import extract_service_hostname, extract_service_port
 from settings.config import SECRETS_PATH
 
@@ -56,5 +58,8 @@ class BusNodeContainerManagerFactory:
                 "attention_broker_port": attention_broker_port,
                 "adapterdb_context_maps": adapterdb_context_mappings,
                 "metta_mapping_output_dir": metta_mapping_output_dir,
+                "resources": ServiceResources(self._settings, use_settings_from),
+                "ports_range_key": f"{use_settings_from}.ports_range",
+                "port_ranges": get_configured_port_ranges(self._settings),
             },
         )
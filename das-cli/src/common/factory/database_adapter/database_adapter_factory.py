@@ -4,6 +4,7 @@ from common.config.store import JsonConfigStore
 from common.container_manager.dbms.database_adapter_container_manager import (
     DatabaseAdapterContainerManager,
 )
+from common.container_resources import ServiceResources
 from common.settings import Settings
 from settings.config import SECRETS_PATH
 
@@ -28,5 +29,6 @@ class DatabaseAdapterFactory:
                 "metta_output_dir": metta_output_dir,
                 "service_name": "Database Adapter",
                 "service_command_label": "database-adapter",
+                "resources": ServiceResources(self._settings, "atomdb.adapterdb"),
             },
         )
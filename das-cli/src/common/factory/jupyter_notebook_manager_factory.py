@@ -5,6 +5,7 @@ from common.config.store import JsonConfigStore
 from common.container_manager.agents.jupyter_notebook_container_manager import (
     JupyterNotebookContainerManager,
 )
+from common.container_resources import ServiceResources
 from common.utils import extract_service_port
 from settings.config import SECRETS_PATH
 
@@ -28,5 +29,6 @@ class JupyterNotebookManagerFactory:
                 "jupyter_notebook_hostname": jupyter_notebook_hostname,
                 "service_name": "Jupyter Notebook",
                 "service_command_label": "jupyter-notebook",
+                "resources": ServiceResources(self._settings, "environment.jupyter"),
             },
         )
@@ -0,0 +1,33 @@
+import os
+
+from common import Settings
+from common.config.store import JsonConfigStore
+from common.container_manager.metta.mork_loader_container_manager import MorkLoaderContainerManager
+from common.utils import extract_service_hostname, extract_service_port
+from settings.config import SECRETS_PATH
+
+
+class MorkLoaderContainerManagerFactory:
+    def __init__(self):
+        self._settings = Settings(store=JsonConfigStore(os.path.expanduser(SECRETS_PATH)))
+
+    def _get_backend_path(self) -> str:
+        if self._settings.get("atomdb.type") == "adapterdb":
+            return "atomdb.adapterdb.atomdb_backend.morkdb"
+
+        return "atomdb.morkdb"
+
+    def build(self):
+        container_name = "das-cli-mork-loader"
+
+        morkdb_endpoint = self._settings.get(f"{self._get_backend_path()}.endpoint", None)
+
+        return MorkLoaderContainerManager(
+            container_name,
+            options={
+                "service_name": "Mork Loader",
+                "service_command_label": "metta",
+                "morkdb_hostname": extract_service_hostname(morkdb_endpoint),
+                "morkdb_port": extract_service_port(morkdb_endpoint),
+            },
+        )
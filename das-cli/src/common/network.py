@@ -1,17 +1,39 @@
 import re
+import socket
 import subprocess
-from typing import Tuple, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 import requests
 
+from common.port_scanner import LOCAL_HOSTS, find_ports_in_use
+from common.ssh_pool import get_ssh_connection
+
+# Results of the port probes, keyed by (username, host, port). True means something is
+# listening on the port. Kept until clear_port_probe_cache() is called.
+_port_probe_cache: Dict[Tuple[str, str, int], bool] = {}
+_port_probe_lock = threading.Lock()
+
+# Only a successful lookup is kept, so a transient failure is retried on the next call.
+_public_ip: Optional[str] = None
+
 
 def get_public_ip():
+    global _public_ip
+
+    if _public_ip is not None:
+        return _public_ip
+
     try:
-        return requests.get("https://api.ipify.org").content.decode("utf8")
+        _public_ip = requests.get("https://api.ipify.org").content.decode("utf8")
     # TODO: better exception handler, for now do not use bare except
     except Exception:
         return None
 
+    return _public_ip
+
 
 # TODO: validate ip
 def get_ssh_user_and_ip(text: str) -> Union[Tuple[str, str], None]:
@@ -26,31 +48,99 @@ def get_ssh_user_and_ip(text: str) -> Union[Tuple[str, str], None]:
         return None
 
 
-def is_server_port_available(
+@lru_cache(maxsize=None)
+def _get_local_hostnames() -> Set[str]:
+    return {name.lower() for name in (socket.gethostname(), socket.getfqdn()) if name}
+
+
+def is_local_host(host: str) -> bool:
+    return host in LOCAL_HOSTS or str(host).lower() in _get_local_hostnames()
+
+
+def _probe_ports_over_ssh(username: str, host: str, ports: List[int], timeout: int) -> Set[int]:
+    # A single command checks every port, so each node costs one round trip on its pooled
+    # SSH session. Using netcat instead of sudo ufw because it would break using any non root user.
+    ports_str = " ".join(map(str, ports))
+    command = (
+        f"for port in {ports_str}; do nc -z -w {timeout} localhost $port && echo $port; done; true"
+    )
+
+    result = get_ssh_connection(host, user=username).run(command, hide=True, warn=True)
+
+    return {int(line) for line in result.stdout.split() if line.isdigit()}
+
+
+def probe_server_ports(
     username: str,
     host: str,
-    start_port: int,
-    end_port: Union[int, None] = None,
-):
-    def server_port_up(host, start_port, end_port):
-        node_port = end_port
+    ports: List[int],
+    timeout: int = 2,
+) -> Dict[int, bool]:
+    """
+    Tells, for each port, whether something is listening on it at the host. Local hosts are
+    probed in a single pass with find_ports_in_use() and remote ones over SSH. Results are
+    cached until clear_port_probe_cache() is called.
+    """
+    with _port_probe_lock:
+        results = {
+            port: _port_probe_cache[(username, host, port)]
+            for port in ports
+            if (username, host, port) in _port_probe_cache
+        }
+
+    missing_ports = [port for port in ports if port not in results]
+
+    if not missing_ports:
+        return results
+
+    try:
+        if is_local_host(host):
+            listening_ports = set(find_ports_in_use(missing_ports, "localhost", timeout))
+        else:
+            listening_ports = _probe_ports_over_ssh(username, host, missing_ports, timeout)
+    except Exception:
+        # An unreachable node is reported as having its ports free, and is not cached.
+        return {**results, **{port: False for port in missing_ports}}
+
+    with _port_probe_lock:
+        for port in missing_ports:
+            in_use = port in listening_ports
+            _port_probe_cache[(username, host, port)] = in_use
+            results[port] = in_use
+
+    return results
+
 
-        command = f"ssh {username}@{host} " f"'nc -z -w 5 localhost {node_port}'"
+def probe_nodes_ports(nodes: List[dict], ports: List[int]) -> Dict[str, List[int]]:
+    """Probes the ports of every node concurrently and returns the ports in use per node ip."""
 
-        # Using netcat instead of sudo ufw because it would break using any non root user.
+    def probe_node(node: dict) -> List[int]:
+        node_results = probe_server_ports(node.get("username", ""), node["ip"], ports)
+        return [port for port, in_use in node_results.items() if in_use]
 
-        result = subprocess.call(
-            command,
-            shell=True,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
+    if not nodes:
+        return {}
 
-        return (
-            False if result == 0 else True
-        )  # nc return 0 if it connects to port, means its listening and not available.
+    with ThreadPoolExecutor(max_workers=len(nodes)) as executor:
+        busy_ports = list(executor.map(probe_node, nodes))
 
-    return server_port_up(host, start_port, end_port)
+    return {node["ip"]: ports_in_use for node, ports_in_use in zip(nodes, busy_ports)}
+
+
+def clear_port_probe_cache() -> None:
+    with _port_probe_lock:
+        _port_probe_cache.clear()
+
+
+def is_server_port_available(
+    username: str,
+    host: str,
+    start_port: int,
+    end_port: Union[int, None] = None,
+):
+    node_port = end_port if end_port is not None else start_port
+
+    return not probe_server_ports(username, host, [node_port])[node_port]
 
 
 def is_ssh_server_reachable(server: dict) -> bool:
@@ -58,3 +148,11 @@ def is_ssh_server_reachable(server: dict) -> bool:
     ping = subprocess.call(command, shell=True)
 
     return ping == 0
+
+
+def is_port_reachable(host: str, port: int, timeout: float = 1.0) -> bool:
+    try:
+        with socket.create_connection((host, int(port)), timeout=timeout):
+            return True
+    except (OSError, ValueError):
+        return False
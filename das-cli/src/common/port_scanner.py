@@ -0,0 +1,193 @@
+import errno
+import selectors
+import socket
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple, TypedDict
+
+from common.settings import Settings
+from common.utils import extract_service_port
+
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "0.0.0.0", "::1"}
+
+PROC_NET_TCP_PATHS = (Path("/proc/net/tcp"), Path("/proc/net/tcp6"))
+
+# State column of /proc/net/tcp for sockets in the LISTEN state.
+TCP_LISTEN_STATE = "0A"
+
+# Sockets kept open at once by the fallback scanner, well below the usual file descriptor limit.
+SCAN_BATCH_SIZE = 256
+
+# Config paths of the bus nodes, each reserving a 'ports_range' besides its endpoint.
+PORTS_RANGE_SERVICE_PATHS = [
+    "agents.query",
+    "agents.link_creation",
+    "agents.inference",
+    "agents.evolution",
+    "agents.context",
+    "agents.atomdb",
+    "agents.command_router",
+]
+
+# Endpoints that must not fall inside any of those ranges.
+ENDPOINT_SERVICE_PATHS = [
+    "agents.attention",
+    *PORTS_RANGE_SERVICE_PATHS,
+    "agents.command_router.http_api",
+]
+
+
+class PortRangeOverlap(TypedDict):
+    first: str
+    second: str
+    start: int
+    end: int
+
+
+def parse_ports_range(ports_range: str) -> Tuple[int, int]:
+    '''Parses a "start:end" ports range, as accepted by the bus nodes.'''
+    try:
+        start, end = map(int, str(ports_range).split(":"))
+    except ValueError:
+        raise ValueError(f"Invalid ports range '{ports_range}'. Expected 'start:end'")
+
+    if not 0 < start <= end <= 65535:
+        raise ValueError(f"Invalid ports range '{ports_range}'")
+
+    return start, end
+
+
+def read_listening_ports(paths: Tuple[Path, ...] = PROC_NET_TCP_PATHS) -> Optional[Set[int]]:
+    '''
+    Reads the TCP ports in the LISTEN state from the kernel socket tables, on every
+    address. Returns None when the tables are not available, as outside Linux.
+    '''
+    listening_ports: Set[int] = set()
+    found = False
+
+    for path in paths:
+        try:
+            lines = path.read_text().splitlines()[1:]
+        except OSError:
+            continue
+
+        found = True
+
+        for line in lines:
+            fields = line.split()
+
+            if len(fields) > 3 and fields[3] == TCP_LISTEN_STATE:
+                listening_ports.add(int(fields[1].rsplit(":", 1)[1], 16))
+
+    return listening_ports if found else None
+
+
+def _scan_with_sockets(host: str, ports: List[int], timeout: float) -> Set[int]:
+    # Connects to a whole batch at once with non-blocking sockets and waits for all of
+    # them together, so a range costs about one timeout instead of one per port.
+    address = socket.gethostbyname(host)
+    listening_ports: Set[int] = set()
+
+    for index in range(0, len(ports), SCAN_BATCH_SIZE):
+        selector = selectors.DefaultSelector()
+
+        try:
+            for port in ports[index : index + SCAN_BATCH_SIZE]:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                result = sock.connect_ex((address, port))
+
+                if result in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+                    selector.register(sock, selectors.EVENT_WRITE, port)
+                    continue
+
+                if result == 0:
+                    listening_ports.add(port)
+
+                sock.close()
+
+            deadline = time.monotonic() + timeout
+
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+
+                if remaining <= 0:
+                    break
+
+                for key, _ in selector.select(remaining):
+                    sock = key.fileobj  # type: ignore[assignment]
+
+                    if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                        listening_ports.add(key.data)
+
+                    selector.unregister(sock)
+                    sock.close()
+        finally:
+            for key in list(selector.get_map().values()):
+                key.fileobj.close()  # type: ignore[union-attr]
+
+            selector.close()
+
+    return listening_ports
+
+
+def find_ports_in_use(ports: List[int], host: str = "localhost", timeout: float = 0.5) -> List[int]:
+    """
+    Returns the ports something listens on, checking all of them in one pass. Local
+    hosts are looked up in /proc/net/tcp{,6}; other hosts, or systems without those
+    tables, are scanned with batches of non-blocking connections.
+    """
+    ports = sorted({int(port) for port in ports})
+
+    if not ports:
+        return []
+
+    listening_ports = read_listening_ports() if host in LOCAL_HOSTS else None
+
+    if listening_ports is None:
+        listening_ports = _scan_with_sockets(host, ports, timeout)
+
+    return [port for port in ports if port in listening_ports]
+
+
+def get_configured_port_ranges(settings: Settings) -> Dict[str, Tuple[int, int]]:
+    '''
+    Collects the ports reserved by the agents: each 'ports_range' and each endpoint
+    port, keyed by config path. Missing or malformed values are left out.
+    '''
+    port_ranges: Dict[str, Tuple[int, int]] = {}
+
+    for path in PORTS_RANGE_SERVICE_PATHS:
+        ports_range = settings.get(f"{path}.ports_range", None)
+
+        try:
+            port_ranges[f"{path}.ports_range"] = parse_ports_range(ports_range)
+        except ValueError:
+            continue
+
+    for path in ENDPOINT_SERVICE_PATHS:
+        endpoint = settings.get(f"{path}.endpoint", None)
+        port = extract_service_port(endpoint) if endpoint else None
+
+        if port:
+            port_ranges[f"{path}.endpoint"] = (port, port)
+
+    return port_ranges
+
+
+def find_port_range_overlaps(port_ranges: Dict[str, Tuple[int, int]]) -> List[PortRangeOverlap]:
+    """Returns every pair of ranges sharing at least one port, with the ports they share."""
+    overlaps: List[PortRangeOverlap] = []
+    active: List[Tuple[str, int]] = []
+
+    for name, (start, end) in sorted(port_ranges.items(), key=lambda item: item[1]):
+        active = [(other, other_end) for other, other_end in active if other_end >= start]
+
+        for other, other_end in active:
+            overlaps.append(
+                {"first": other, "second": name, "start": start, "end": min(end, other_end)}
+            )
+
+        active.append((name, end))
+
+    return overlaps
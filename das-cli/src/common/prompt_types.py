@@ -7,6 +7,7 @@ from click import ParamType
 from click import Path as ClickPath
 
 from common.network import is_server_port_available, is_ssh_server_reachable
+from common.systemutils.metrics_history import parse_duration
 
 
 def _is_remote_invocation(ctx) -> bool:
@@ -123,6 +124,21 @@ class PortRangeType(ParamType):
         return value
 
 
+class DurationType(ParamType):
+    name = "duration"
+
+    def convert(self, value, param, ctx):
+        try:
+            duration = value if isinstance(value, int) else parse_duration(value)
+        except ValueError as e:
+            self.fail(str(e), param, ctx)
+
+        if duration <= 0:
+            self.fail(f"Invalid duration '{value}'. It must be greater than zero.", param, ctx)
+
+        return duration
+
+
 class EndpointType(ParamType):
     name = "endpoint"
 
@@ -0,0 +1,82 @@
+from typing import Dict, List
+
+from common.settings import Settings
+from settings.config import (
+    DAS_IMAGE_NAME,
+    DAS_IMAGE_VERSION,
+    DAS_MORK_LOADER_IMAGE_NAME,
+    DAS_MORK_LOADER_IMAGE_VERSION,
+    DAS_MORK_SERVER_IMAGE_NAME,
+    DAS_MORK_SERVER_IMAGE_VERSION,
+    JUPYTER_NOTEBOOK_IMAGE_NAME,
+    JUPYTER_NOTEBOOK_IMAGE_VERSION,
+    METTA_PARSER_IMAGE_NAME,
+    METTA_PARSER_IMAGE_VERSION,
+    MONGODB_IMAGE_NAME,
+    MONGODB_IMAGE_VERSION,
+    REDIS_IMAGE_NAME,
+    REDIS_IMAGE_VERSION,
+)
+
+LOCAL_CONTEXT = "default"
+
+DAS_IMAGE = f"{DAS_IMAGE_NAME}:{DAS_IMAGE_VERSION}"
+REDIS_IMAGE = f"{REDIS_IMAGE_NAME}:{REDIS_IMAGE_VERSION}"
+MONGODB_IMAGE = f"{MONGODB_IMAGE_NAME}:{MONGODB_IMAGE_VERSION}"
+MORK_SERVER_IMAGE = f"{DAS_MORK_SERVER_IMAGE_NAME}:{DAS_MORK_SERVER_IMAGE_VERSION}"
+MORK_LOADER_IMAGE = f"{DAS_MORK_LOADER_IMAGE_NAME}:{DAS_MORK_LOADER_IMAGE_VERSION}"
+METTA_PARSER_IMAGE = f"{METTA_PARSER_IMAGE_NAME}:{METTA_PARSER_IMAGE_VERSION}"
+JUPYTER_NOTEBOOK_IMAGE = f"{JUPYTER_NOTEBOOK_IMAGE_NAME}:{JUPYTER_NOTEBOOK_IMAGE_VERSION}"
+
+
+def _get_backend(settings: Settings) -> tuple[str, str]:
+    atomdb_type = settings.get("atomdb.type", "redismongodb")
+
+    if atomdb_type == "adapterdb":
+        return (
+            settings.get("atomdb.adapterdb.atomdb_backend.type", "morkdb"),
+            "atomdb.adapterdb.atomdb_backend",
+        )
+
+    return atomdb_type, "atomdb"
+
+
+def resolve_required_images(
+    settings: Settings, include_optional: bool = False
+) -> Dict[str, List[str]]:
+    """
+    Lists the images the active configuration needs, keyed by the Docker context
+    that runs them. The local context gets every image; the context of each Redis
+    or MongoDB cluster node only gets its database image.
+    """
+    images: Dict[str, List[str]] = {LOCAL_CONTEXT: []}
+
+    def add_image(context: str, image: str) -> None:
+        context_images = images.setdefault(context or LOCAL_CONTEXT, [])
+
+        if image not in context_images:
+            context_images.append(image)
+
+    # Agents, the attention broker, the database adapter and the MeTTa loader.
+    add_image(LOCAL_CONTEXT, DAS_IMAGE)
+    add_image(LOCAL_CONTEXT, METTA_PARSER_IMAGE)
+
+    backend_type, backend_path = _get_backend(settings)
+    database_images: Dict[str, str] = {}
+
+    if backend_type == "redismongodb":
+        database_images = {"redis": REDIS_IMAGE, "mongodb": MONGODB_IMAGE}
+    elif backend_type == "morkdb":
+        database_images = {"mongodb": MONGODB_IMAGE, "morkdb": MORK_SERVER_IMAGE}
+        add_image(LOCAL_CONTEXT, MORK_LOADER_IMAGE)
+
+    for database, image in database_images.items():
+        add_image(LOCAL_CONTEXT, image)
+
+        for node in settings.get(f"{backend_path}.{database}.nodes", []) or []:
+            add_image(node.get("context", LOCAL_CONTEXT), image)
+
+    if include_optional:
+        add_image(LOCAL_CONTEXT, JUPYTER_NOTEBOOK_IMAGE)
+
+    return images
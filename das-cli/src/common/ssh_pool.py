@@ -0,0 +1,58 @@
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from fabric import Connection
+
+_DEFAULT_CONNECT_TIMEOUT_SECONDS = 10
+
+_connections_lock = threading.Lock()
+_connections: Dict[Tuple[str, str, int, str], Connection] = {}
+
+
+def _digest_connect_kwargs(connect_kwargs: Optional[Dict[str, Any]]) -> str:
+    # Part of the pool key, so targets with other credentials get their own session
+    # without keeping the password itself in the key.
+    encoded = json.dumps(connect_kwargs or {}, sort_keys=True, default=str)
+
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def get_ssh_connection(
+    host: str,
+    user: Optional[str] = None,
+    port: int = 22,
+    connect_kwargs: Optional[Dict[str, Any]] = None,
+    connect_timeout: int = _DEFAULT_CONNECT_TIMEOUT_SECONDS,
+) -> Connection:
+    '''
+    Returns a pooled Fabric Connection for the host, creating it on first use.
+    The SSH session is opened lazily by Fabric and kept for the rest of the process.
+    '''
+    key = (host, user or "", int(port or 22), _digest_connect_kwargs(connect_kwargs))
+
+    with _connections_lock:
+        connection = _connections.get(key)
+
+        if connection is None:
+            connection = Connection(
+                host=host,
+                user=user or None,
+                port=int(port or 22),
+                connect_kwargs=connect_kwargs or {},
+                connect_timeout=connect_timeout,
+            )
+            _connections[key] = connection
+
+    return connection
+
+
+def discard_ssh_connection(connection: Connection) -> None:
+    '''Closes a pooled connection and drops it, e.g. after a transport error.'''
+    with _connections_lock:
+        for key, pooled_connection in list(_connections.items()):
+            if pooled_connection is connection:
+                _connections.pop(key)
+
+    connection.close()
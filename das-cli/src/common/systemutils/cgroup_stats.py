@@ -0,0 +1,159 @@
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from docker.models.containers import Container
+
+
+class CgroupStatsReader:
+    """
+    Reads CPU, memory and block I/O usage of local containers straight from
+    their cgroup v2 directories, without going through the Docker stats API.
+    """
+
+    CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+    # Window used to compute CPU usage when there is no previous reading to compare with.
+    CPU_SAMPLE_INTERVAL = 0.1
+
+    def __init__(self) -> None:
+        self._cgroup_paths: Dict[str, Path] = {}
+        self._previous_readings: Dict[str, dict] = {}
+
+    def is_available(self) -> bool:
+        return (self.CGROUP_ROOT / "cgroup.controllers").exists()
+
+    def _read_proc_cgroup(self, pid: int) -> Optional[Path]:
+        try:
+            with open(f"/proc/{pid}/cgroup", "r") as f:
+                for line in f:
+                    hierarchy_id, _, cgroup_path = line.strip().split(":", 2)
+
+                    if hierarchy_id == "0" and cgroup_path not in ("", "/"):
+                        return self.CGROUP_ROOT / cgroup_path.lstrip("/")
+        except (OSError, ValueError):
+            pass
+
+        return None
+
+    def find_cgroup_path(self, container: Container) -> Optional[Path]:
+        if container.id in self._cgroup_paths:
+            return self._cgroup_paths[container.id]
+
+        pid = container.attrs.get("State", {}).get("Pid") or 0
+
+        candidates = [
+            self._read_proc_cgroup(pid) if pid else None,
+            # systemd cgroup driver
+            self.CGROUP_ROOT / "system.slice" / f"docker-{container.id}.scope",
+            # cgroupfs cgroup driver
+            self.CGROUP_ROOT / "docker" / container.id,
+        ]
+
+        for candidate in candidates:
+            if candidate is not None and (candidate / "cpu.stat").exists():
+                self._cgroup_paths[container.id] = candidate
+                return candidate
+
+        return None
+
+    def _read_key_values(self, file_path: Path) -> Dict[str, int]:
+        values = {}
+
+        with open(file_path, "r") as f:
+            for line in f:
+                parts = line.split()
+
+                if len(parts) == 2:
+                    values[parts[0]] = int(parts[1])
+
+        return values
+
+    def _read_io_bytes(self, file_path: Path) -> tuple[int, int]:
+        read_bytes = 0
+        write_bytes = 0
+
+        if not file_path.exists():
+            return read_bytes, write_bytes
+
+        with open(file_path, "r") as f:
+            # Each line looks like "8:0 rbytes=1024 wbytes=0 rios=1 wios=0 dbytes=0 dios=0"
+            for line in f:
+                for field in line.split()[1:]:
+                    key, _, value = field.partition("=")
+
+                    if key == "rbytes":
+                        read_bytes += int(value)
+                    elif key == "wbytes":
+                        write_bytes += int(value)
+
+        return read_bytes, write_bytes
+
+    def _read(self, cgroup_path: Path) -> dict:
+        cpu_stat = self._read_key_values(cgroup_path / "cpu.stat")
+        memory_current = int((cgroup_path / "memory.current").read_text().strip() or 0)
+        io_read_bytes, io_write_bytes = self._read_io_bytes(cgroup_path / "io.stat")
+
+        return {
+            "timestamp": time.monotonic(),
+            "cpu_usage_usec": cpu_stat.get("usage_usec", 0),
+            "memory_bytes": memory_current,
+            "io_read_bytes": io_read_bytes,
+            "io_write_bytes": io_write_bytes,
+        }
+
+    def _read_all(self, containers: Iterable[Container]) -> Dict[str, dict]:
+        readings = {}
+
+        for container in containers:
+            cgroup_path = self.find_cgroup_path(container)
+
+            if cgroup_path is None:
+                continue
+
+            try:
+                readings[container.id] = self._read(cgroup_path)
+            except (OSError, ValueError):
+                self._cgroup_paths.pop(container.id, None)
+
+        return readings
+
+    def _cpu_percent(self, previous: dict, current: dict) -> float:
+        wall_delta_usec = (current["timestamp"] - previous["timestamp"]) * 1_000_000
+        usage_delta_usec = current["cpu_usage_usec"] - previous["cpu_usage_usec"]
+        cpu_count = os.cpu_count() or 1
+
+        if wall_delta_usec <= 0 or usage_delta_usec <= 0:
+            return 0.0
+
+        return (usage_delta_usec / (wall_delta_usec * cpu_count)) * 100.0
+
+    def sample(self, containers: list[Container]) -> Dict[str, dict]:
+        """
+        Returns the usage of every container whose cgroup could be found, keyed
+        by container id. Containers missing from the result must be read by
+        other means.
+        """
+        readings = self._read_all(containers)
+
+        if any(cid not in self._previous_readings for cid in readings):
+            self._previous_readings.update(readings)
+            time.sleep(self.CPU_SAMPLE_INTERVAL)
+            readings = self._read_all(containers)
+
+        stats = {}
+
+        for container_id, reading in readings.items():
+            previous = self._previous_readings.get(container_id, reading)
+
+            stats[container_id] = {
+                "cpu_percent": round(self._cpu_percent(previous, reading), 2),
+                "memory_mb": round(reading["memory_bytes"] / (1024**3), 2),
+                "io_read_bytes": reading["io_read_bytes"],
+                "io_write_bytes": reading["io_write_bytes"],
+            }
+
+        self._previous_readings = readings
+
+        return stats
@@ -0,0 +1,325 @@
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # fcntl is not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+class MetricsRing:
+    """
+    Fixed-size ring of metric records stored in a memory-mapped file.
+
+    Every record holds a bucket timestamp, the number of samples merged into the
+    bucket and the running mean of each value, so coarser rings are downsampled
+    in place as new samples arrive.
+    """
+
+    MAGIC = b"DASM"
+    HEADER = struct.Struct("<4sIIII")  # magic, num_values, capacity, head, count
+
+    def __init__(self, path: Path, num_values: int, capacity: int) -> None:
+        self._path = path
+        self._num_values = num_values
+        self._capacity = capacity
+        self._record = struct.Struct("<dI" + "f" * num_values)
+        self._size = self.HEADER.size + self._record.size * capacity
+        self._file: Optional[BinaryIO] = None
+        self._mmap: Optional[mmap.mmap] = None
+
+    def _open(self) -> mmap.mmap:
+        if self._mmap is not None:
+            return self._mmap
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+        ring_file = os.fdopen(fd, "r+b")
+        self._file = ring_file
+
+        if os.fstat(fd).st_size != self._size or not self._has_valid_header():
+            ring_file.truncate(0)
+            ring_file.truncate(self._size)
+            ring_file.seek(0)
+            ring_file.write(self.HEADER.pack(self.MAGIC, self._num_values, self._capacity, 0, 0))
+            ring_file.flush()
+
+        self._mmap = mmap.mmap(fd, self._size)
+
+        return self._mmap
+
+    def _has_valid_header(self) -> bool:
+        assert self._file is not None
+
+        self._file.seek(0)
+        raw_header = self._file.read(self.HEADER.size)
+
+        if len(raw_header) != self.HEADER.size:
+            return False
+
+        magic, num_values, capacity, _, _ = self.HEADER.unpack(raw_header)
+
+        return (magic, num_values, capacity) == (self.MAGIC, self._num_values, self._capacity)
+
+    def _lock(self, exclusive: bool) -> None:
+        if fcntl is not None and self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+    def _unlock(self) -> None:
+        if fcntl is not None and self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def _offset(self, index: int) -> int:
+        return self.HEADER.size + self._record.size * index
+
+    def _read_header(self, buffer: mmap.mmap) -> Tuple[int, int]:
+        _, _, _, head, count = self.HEADER.unpack_from(buffer, 0)
+        return head, count
+
+    def append(self, bucket: float, values: List[float]) -> None:
+        buffer = self._open()
+
+        self._lock(exclusive=True)
+        try:
+            head, count = self._read_header(buffer)
+
+            if count > 0:
+                last_index = (head - 1) % self._capacity
+                last_bucket, samples, *means = self._record.unpack_from(
+                    buffer, self._offset(last_index)
+                )
+
+                if last_bucket == bucket:
+                    merged = [
+                        (mean * samples + value) / (samples + 1)
+                        for mean, value in zip(means, values)
+                    ]
+                    self._record.pack_into(
+                        buffer, self._offset(last_index), bucket, samples + 1, *merged
+                    )
+                    return
+
+                if last_bucket > bucket:
+                    return
+
+            self._record.pack_into(buffer, self._offset(head), bucket, 1, *values)
+            self.HEADER.pack_into(
+                buffer,
+                0,
+                self.MAGIC,
+                self._num_values,
+                self._capacity,
+                (head + 1) % self._capacity,
+                min(count + 1, self._capacity),
+            )
+        finally:
+            self._unlock()
+
+    def read(self, since: float = 0.0) -> List[Tuple[float, List[float]]]:
+        if not self._path.exists():
+            return []
+
+        buffer = self._open()
+
+        self._lock(exclusive=False)
+        try:
+            head, count = self._read_header(buffer)
+            records = []
+
+            for position in range(count):
+                index = (head - count + position) % self._capacity
+                bucket, _, *values = self._record.unpack_from(buffer, self._offset(index))
+
+                if bucket >= since:
+                    records.append((bucket, values))
+
+            return records
+        finally:
+            self._unlock()
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class MetricsHistory:
+    """
+    Keeps the machine and per-container metrics collected by 'system exporter' and
+    'system status --stream' in 1 second, 1 minute and 1 hour resolution rings.
+    """
+
+    # name: (bucket size in seconds, number of records)
+    RESOLUTIONS: Dict[str, Tuple[int, int]] = {
+        "1s": (1, 3600),
+        "1m": (60, 1440),
+        "1h": (3600, 720),
+    }
+
+    HOST_FIELDS = ["cpu_percent", "memory_used_gb", "disk_used_gb"]
+    CONTAINER_FIELDS = ["cpu_percent", "memory_gb"]
+
+    def __init__(self, base_path: Path) -> None:
+        self._base_path = Path(base_path)
+        self._rings: Dict[Tuple[str, str], MetricsRing] = {}
+        self._lock = threading.Lock()
+
+    def _get_ring(self, series: str, resolution: str, num_values: int) -> MetricsRing:
+        key = (series, resolution)
+
+        if key not in self._rings:
+            _, capacity = self.RESOLUTIONS[resolution]
+            path = self._base_path / f"{series}.{resolution}.ring"
+            self._rings[key] = MetricsRing(path, num_values, capacity)
+
+        return self._rings[key]
+
+    def _append(self, series: str, values: List[float], timestamp: float) -> None:
+        for resolution, (bucket_size, _) in self.RESOLUTIONS.items():
+            bucket = float(int(timestamp) - int(timestamp) % bucket_size)
+            self._get_ring(series, resolution, len(values)).append(bucket, values)
+
+    @staticmethod
+    def _to_float(value) -> float:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return 0.0
+
+    def _host_values(self, machine_info: dict) -> List[float]:
+        cpu_info = machine_info.get("CPUInfo", {})
+        memory_info = machine_info.get("MemoryInfo", {})
+        disks_info = machine_info.get("DisksInfo", [])
+
+        return [
+            self._to_float(cpu_info.get("cpuUsage")),
+            self._to_float(memory_info.get("usedMemory")),
+            sum(self._to_float(disk.get("disk_used_space")) for disk in disks_info),
+        ]
+
+    def record(self, system_info: dict, timestamp: Optional[float] = None) -> None:
+        timestamp = timestamp or time.time()
+        machine_info = system_info.get("machineInfo", {})
+        services_info = system_info.get("serviceInfo", {})
+
+        with self._lock:
+            if machine_info:
+                self._append("host", self._host_values(machine_info), timestamp)
+
+            for container_name, service in services_info.items():
+                if not container_name:
+                    continue
+
+                self._append(
+                    f"containers/{container_name}",
+                    [
+                        self._to_float(service.get("cpu_percent")),
+                        self._to_float(service.get("memory_mb")),
+                    ],
+                    timestamp,
+                )
+
+    def pick_resolution(self, duration: int) -> str:
+        for resolution, (bucket_size, capacity) in self.RESOLUTIONS.items():
+            if duration <= bucket_size * capacity:
+                return resolution
+
+        return list(self.RESOLUTIONS)[-1]
+
+    def _list_container_series(self, resolution: str) -> List[str]:
+        containers_path = self._base_path / "containers"
+
+        if not containers_path.is_dir():
+            return []
+
+        suffix = f".{resolution}.ring"
+
+        return sorted(
+            entry.name[: -len(suffix)]
+            for entry in containers_path.iterdir()
+            if entry.name.endswith(suffix)
+        )
+
+    @staticmethod
+    def _compact(records: List[Tuple[float, List[float]]]) -> List[List[float]]:
+        return [[int(bucket), *(round(value, 2) for value in values)] for bucket, values in records]
+
+    @staticmethod
+    def downsample(series: List[List[float]], max_points: int) -> List[List[float]]:
+        """
+        Averages consecutive samples of a compacted series into at most max_points rows,
+        each stamped with the timestamp of its first sample.
+        """
+        if len(series) <= max_points:
+            return series
+
+        group_size = -(-len(series) // max_points)
+        downsampled = []
+
+        for start in range(0, len(series), group_size):
+            group = series[start : start + group_size]
+            means = [round(sum(values) / len(group), 2) for values in zip(*group)][1:]
+            downsampled.append([group[0][0], *means])
+
+        return downsampled
+
+    def query(self, duration: int, now: Optional[float] = None) -> dict:
+        now = now or time.time()
+        since = now - duration
+        resolution = self.pick_resolution(duration)
+
+        with self._lock:
+            host = self._get_ring("host", resolution, len(self.HOST_FIELDS)).read(since)
+            containers = {
+                name: self._compact(
+                    self._get_ring(
+                        f"containers/{name}", resolution, len(self.CONTAINER_FIELDS)
+                    ).read(since)
+                )
+                for name in self._list_container_series(resolution)
+            }
+
+        return {
+            "resolution": resolution,
+            "since": int(since),
+            "until": int(now),
+            "fields": {
+                "host": ["timestamp", *self.HOST_FIELDS],
+                "containers": ["timestamp", *self.CONTAINER_FIELDS],
+            },
+            "host": self._compact(host),
+            "containers": {name: series for name, series in containers.items() if series},
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            for ring in self._rings.values():
+                ring.close()
+
+            self._rings.clear()
+
+
+DURATION_REGEX = re.compile(r"^(\d+)([smhd]?)$")
+DURATION_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_duration(value: str) -> int:
+    match = DURATION_REGEX.match(value.strip().lower())
+
+    if not match:
+        raise ValueError(f"Invalid duration '{value}'. Expected formats like 30s, 15m, 1h or 7d.")
+
+    amount, unit = match.groups()
+
+    return int(amount) * DURATION_UNITS[unit]
@@ -0,0 +1,318 @@
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dateutil.parser import isoparse
+
+from common.logger import logger
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+GB = 1024**3
+
+
+class CachedCollector:
+    """
+    Runs a fetch function on its own schedule in a background thread and keeps
+    the last successful result, so readers never wait on the underlying I/O.
+    """
+
+    def __init__(self, name: str, fetch: Callable[[], Any], interval: float) -> None:
+        self.name = name
+        self._fetch = fetch
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._value: Any = None
+        self._last_success: Optional[float] = None
+        self._last_error: Optional[str] = None
+        self._stop_event = threading.Event()
+
+    def start(self) -> None:
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def _loop(self) -> None:
+        while not self._stop_event.is_set():
+            started_at = time.monotonic()
+
+            try:
+                value = self._fetch()
+
+                with self._lock:
+                    self._value = value
+                    self._last_success = time.time()
+                    self._last_error = None
+            except Exception as e:
+                logger().warning(f"Metrics collector '{self.name}' failed: {e}")
+
+                with self._lock:
+                    self._last_error = str(e)
+
+            elapsed = time.monotonic() - started_at
+            self._stop_event.wait(max(0.0, self._interval - elapsed))
+
+    def snapshot(self) -> Tuple[Any, Optional[float], Optional[str]]:
+        with self._lock:
+            return self._value, self._last_success, self._last_error
+
+
+class OpenMetricsWriter:
+    def __init__(self) -> None:
+        self._families: Dict[str, Tuple[str, str, List[str]]] = {}
+
+    @staticmethod
+    def _escape(value: Any) -> str:
+        return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+    def add(
+        self,
+        name: str,
+        metric_type: str,
+        help_text: str,
+        value: Any,
+        labels: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return
+
+        if name not in self._families:
+            self._families[name] = (metric_type, help_text, [])
+
+        sample_name = f"{name}_total" if metric_type == "counter" else name
+        label_str = ""
+
+        if labels:
+            label_str = (
+                "{" + ",".join(f'{key}="{self._escape(val)}"' for key, val in labels.items()) + "}"
+            )
+
+        self._families[name][2].append(f"{sample_name}{label_str} {number!r}")
+
+    def render(self) -> str:
+        lines = []
+
+        for name, (metric_type, help_text, samples) in self._families.items():
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.append(f"# HELP {name} {help_text}")
+            lines.extend(samples)
+
+        lines.append("# EOF")
+
+        return "\n".join(lines) + "\n"
+
+
+class OpenMetricsExporter:
+    """
+    Serves the cached host, container and AtomDB metrics in the OpenMetrics
+    text format. Scrapes only read the collectors' caches.
+    """
+
+    def __init__(self, collectors: List[CachedCollector]) -> None:
+        self._collectors = {collector.name: collector for collector in collectors}
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def _write_host_metrics(self, writer: OpenMetricsWriter, machine_info: dict) -> None:
+        cpu_info = machine_info.get("CPUInfo", {})
+        memory_info = machine_info.get("MemoryInfo", {})
+
+        writer.add(
+            "das_host_cpu_usage_percent",
+            "gauge",
+            "Machine CPU load in percent.",
+            cpu_info.get("cpuUsage"),
+        )
+        writer.add(
+            "das_host_cpu_cores",
+            "gauge",
+            "Number of logical CPU cores.",
+            cpu_info.get("cpuTotalCores"),
+        )
+        writer.add(
+            "das_host_memory_used_bytes",
+            "gauge",
+            "Machine memory in use.",
+            float(memory_info.get("usedMemory", 0)) * GB,
+        )
+        writer.add(
+            "das_host_memory_total_bytes",
+            "gauge",
+            "Machine total memory.",
+            float(memory_info.get("totalMemory", 0)) * GB,
+        )
+
+        for disk in machine_info.get("DisksInfo", []):
+            labels = {"device": disk.get("disk_device"), "mountpoint": disk.get("disk_mntpoint")}
+
+            writer.add(
+                "das_host_disk_used_bytes",
+                "gauge",
+                "Disk space in use per partition.",
+                float(disk.get("disk_used_space", 0)) * GB,
+                labels,
+            )
+            writer.add(
+                "das_host_disk_total_bytes",
+                "gauge",
+                "Disk space per partition.",
+                float(disk.get("disk_total_space", 0)) * GB,
+                labels,
+            )
+
+    @staticmethod
+    def _uptime_seconds(started_at: Optional[str]) -> Optional[float]:
+        if not started_at:
+            return None
+
+        try:
+            return (datetime.now(timezone.utc) - isoparse(started_at)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+
+    def _write_container_metrics(self, writer: OpenMetricsWriter, services: dict) -> None:
+        for container_name, service in services.items():
+            if not container_name:
+                continue
+
+            labels = {
+                "container": container_name,
+                "service": service.get("service_name") or "",
+                "command": service.get("service_command_label") or "",
+            }
+            health = service.get("service_health")
+
+            writer.add(
+                "das_container_up",
+                "gauge",
+                "Whether the das-cli managed container is running.",
+                1 if service.get("status") == "running" else 0,
+                labels,
+            )
+            writer.add(
+                "das_container_healthy",
+                "gauge",
+                "Whether the container healthcheck passes (1 when it has no healthcheck).",
+                1 if health in ("healthy", "-", None) else 0,
+                labels,
+            )
+            writer.add(
+                "das_container_cpu_usage_percent",
+                "gauge",
+                "Container CPU usage in percent of the machine.",
+                service.get("cpu_percent"),
+                labels,
+            )
+            writer.add(
+                "das_container_memory_bytes",
+                "gauge",
+                "Container memory usage.",
+                float(service.get("memory_mb", 0)) * GB,
+                labels,
+            )
+            writer.add(
+                "das_container_restarts",
+                "counter",
+                "Number of times Docker restarted the container.",
+                service.get("restart_count"),
+                labels,
+            )
+            writer.add(
+                "das_container_uptime_seconds",
+                "gauge",
+                "Seconds since the container was started.",
+                self._uptime_seconds(service.get("started_at")),
+                labels,
+            )
+
+    def _write_atomdb_metrics(self, writer: OpenMetricsWriter, atomdb_stats: dict) -> None:
+        for collection, count in atomdb_stats.get("collections", {}).items():
+            writer.add(
+                "das_atomdb_documents",
+                "gauge",
+                "Estimated number of documents per AtomDB MongoDB collection.",
+                count,
+                {"collection": collection},
+            )
+
+        if "redis_keys" in atomdb_stats:
+            writer.add(
+                "das_atomdb_redis_keys",
+                "gauge",
+                "Number of keys stored in the AtomDB Redis.",
+                atomdb_stats["redis_keys"],
+            )
+
+    def render(self) -> str:
+        writer = OpenMetricsWriter()
+        writers = {
+            "host": self._write_host_metrics,
+            "containers": self._write_container_metrics,
+            "atomdb": self._write_atomdb_metrics,
+        }
+
+        for name, collector in self._collectors.items():
+            value, last_success, last_error = collector.snapshot()
+
+            writer.add(
+                "das_exporter_collector_up",
+                "gauge",
+                "Whether the last run of the collector succeeded.",
+                0 if last_error or last_success is None else 1,
+                {"collector": name},
+            )
+
+            if last_success is not None:
+                writer.add(
+                    "das_exporter_collector_last_success_timestamp_seconds",
+                    "gauge",
+                    "Unix time of the last successful collector run.",
+                    last_success,
+                    {"collector": name},
+                )
+
+            if value and name in writers:
+                writers[name](writer, value)
+
+        return writer.render()
+
+    def _build_handler(self):
+        exporter = self
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+
+                body = exporter.render().encode("utf-8")
+
+                self.send_response(200)
+                self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger().debug(f"exporter: {format % args}")
+
+        return MetricsRequestHandler
+
+    def serve_forever(self, host: str, port: int) -> None:
+        for collector in self._collectors.values():
+            collector.start()
+
+        self._server = ThreadingHTTPServer((host, port), self._build_handler())
+        self._server.daemon_threads = True
+
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+            for collector in self._collectors.values():
+                collector.stop()
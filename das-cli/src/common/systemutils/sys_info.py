@@ -1,12 +1,16 @@
 import shutil
+import time
 
 import psutil
 
 
 class SystemInfoExtractor:
 
+    # psutil needs a short window between two readings to give a meaningful percentage.
+    MIN_CPU_SAMPLE_INTERVAL = 0.1
+
     def __init__(self):
-        pass
+        self._cpu_sample_started_at: float | None = None
 
     IGNORED_MOUNTPOINTS_PREFIX = (
         "/boot",
@@ -20,7 +24,24 @@ class SystemInfoExtractor:
         "/var/lib/kubelet",
     )
 
-    def get_cpu_info(self, interval):
+    def start_cpu_sample(self) -> None:
+        psutil.cpu_percent(interval=None)
+        self._cpu_sample_started_at = time.monotonic()
+
+    def _wait_cpu_sample_window(self) -> None:
+        if self._cpu_sample_started_at is None:
+            self.start_cpu_sample()
+
+        elapsed = time.monotonic() - (self._cpu_sample_started_at or 0.0)
+        time.sleep(max(0.0, self.MIN_CPU_SAMPLE_INTERVAL - elapsed))
+
+        self._cpu_sample_started_at = None
+
+    def get_cpu_info(self, interval=None):
+        if interval is None:
+            # Non-blocking mode: usage is measured since the last start_cpu_sample() call.
+            self._wait_cpu_sample_window()
+
         cpuUsagePercent = psutil.cpu_percent(interval=interval)
         cpuTotalCores = psutil.cpu_count()
 
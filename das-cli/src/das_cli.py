@@ -4,6 +4,7 @@ from injector import Injector
 
 from commands.atomdb_broker.atomdb_broker_module import AtomDbBrokerModule
 from commands.attention_broker import AttentionBrokerModule
+from commands.batch import BatchModule
 from commands.command_router import CommandRouterModule
 from commands.config import ConfigModule
 from commands.context_broker import ContextBrokerModule
@@ -12,6 +13,7 @@ from commands.database_adapter import DatabaseAdapterModule
 from commands.db import DbModule
 from commands.evolution_agent import EvolutionAgentModule
 from commands.example import ExampleModule
+from commands.images import ImagesModule
 from commands.inference_agent import InferenceAgentModule
 from commands.jupyter_notebook import JupyterNotebookModule
 from commands.link_creation_agent import LinkCreationAgentModule
@@ -20,6 +22,7 @@ from commands.metta import MettaModule
 from commands.python_library import PythonLibraryModule
 from commands.query_agent import QueryAgentModule
 from commands.release_notes import ReleaseNotesModule
+from commands.stack import DownModule, UpModule
 from commands.system import SystemModule
 from common.utils import log_exception
 
@@ -42,6 +45,10 @@ MODULES = [
     SystemModule,
     AtomDbBrokerModule,
     CommandRouterModule,
+    BatchModule,
+    ImagesModule,
+    UpModule,
+    DownModule,
 ]
 
 
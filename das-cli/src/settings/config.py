@@ -15,6 +15,8 @@ DAS_PATH = Path.home() / ".das"
 SECRETS_PATH = DAS_PATH / ".env"
 
 DEFAULT_CONFIGFILE_PATH = DAS_PATH / "config.json"
+METRICS_HISTORY_PATH = DAS_PATH / "metrics"
+REMOTE_CONFIG_CHECKS_PATH = DAS_PATH / "remote_config_checks.json"
 CURRENT_CONFIGFILE_PATH = (
     EnvFileLoader(SECRETS_PATH).load().get("configpath", DEFAULT_CONFIGFILE_PATH)
 )
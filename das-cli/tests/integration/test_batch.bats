@@ -0,0 +1,58 @@
+#!/usr/local/bin/bats
+
+load 'libs/bats-support/load'
+load 'libs/bats-assert/load'
+load 'libs/utils'
+load 'libs/docker'
+
+setup() {
+    use_config "simple"
+    stop_simple_stack
+}
+
+teardown() {
+    stop_simple_stack
+}
+
+@test "Batch runs every step in order and reports timings" {
+    run bash -c "printf '# start the stack\ndb start\ndas-cli attention-broker start\n' | das-cli batch - -o json"
+
+    assert_success
+    assert_output --partial '"command": "db start"'
+    assert_output --partial '"command": "attention-broker start"'
+    assert_output --partial '"failed_steps": []'
+
+    run bash -c "echo \"\$0\" | python3 -c 'import json, sys; json.load(sys.stdin)'" "$output"
+    assert_success
+
+    run is_service_up "das-cli-redis-40020"
+    assert_success
+
+    run is_service_up "das-attention-broker-40001"
+    assert_success
+}
+
+@test "Batch stops at the first failing step unless asked to continue" {
+    local batch_file="$BATS_TEST_TMPDIR/steps.das"
+
+    printf 'system status --history 1x\nsystem status --history 1m\n' > "$batch_file"
+
+    run das-cli batch "$batch_file"
+
+    assert_failure
+    assert_output --partial "[1/2] failed"
+    refute_output --partial "[2/2]"
+
+    run das-cli batch "$batch_file" --continue-on-error
+
+    assert_failure
+    assert_output --partial "[2/2] done"
+    assert_output --partial "1 failed"
+}
+
+@test "Batch rejects nested batches" {
+    run bash -c "echo 'batch -' | das-cli batch -"
+
+    assert_failure
+    assert_output --partial "Nested batches are not supported"
+}
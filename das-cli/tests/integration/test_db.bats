@@ -33,11 +33,13 @@ setup() {
     run das-cli db start
 
     assert_output --partial "Starting Redis service"
+    assert_output --partial "Redis tuning profile: default"
     assert_output --partial "Redis has started successfully"
     assert_output --partial "${redis_port}"
     assert_output --partial "${redis_user}"
 
     assert_output --partial "Starting MongoDB service"
+    assert_output --partial "MongoDB tuning profile: default"
     assert_output --partial "MongoDB has started successfully"
     assert_output --partial "${mongodb_port}"
     assert_output --partial "${mongodb_user}"
@@ -202,6 +204,7 @@ setup() {
 
     assert_success
     assert_regex "$output" '(MongoDB\s.*:\s[0-9]+)'
+    assert_regex "$output" '(Redis keys:\s[0-9]+)'
 }
 
 @test "Should count atoms with empty database" {
@@ -213,6 +216,13 @@ setup() {
     assert_output --partial "No collections found"
 }
 
+@test "Should reject a watch interval that is not positive" {
+    run das-cli db count-atoms --watch --interval 0
+
+    assert_failure
+    assert_output --partial "Invalid value for '--interval'"
+}
+
 @test "Should not count atoms with database disabled" {
     local redis_container_name="das-cli-redis-40020"
     local redis_port="$(get_config .services.redis.port)"
@@ -224,4 +234,33 @@ setup() {
     assert_failure
     assert_output --partial "$DOCKER_CONTAINER_MISSING"
     assert_output --partial "Please use 'db start'"
-}
\ No newline at end of file
+}
+
+@test "Should restore the atoms of a snapshot" {
+    local snapshot_dir="$(mktemp -d)/snapshot"
+
+    das-cli db restart &>/dev/null
+    das-cli metta load "$test_fixtures_dir/metta/animals.metta" &>/dev/null
+
+    local atoms_before="$(das-cli db count-atoms -o json)"
+
+    run das-cli db snapshot "$snapshot_dir"
+
+    assert_success
+    assert_output --partial "AtomDB snapshot written to $snapshot_dir"
+    assert [ -f "$snapshot_dir/manifest.json" ]
+
+    das-cli db restart &>/dev/null
+
+    run das-cli db restore "$snapshot_dir"
+
+    assert_success
+    assert_output --partial "AtomDB snapshot restored from $snapshot_dir"
+
+    run das-cli db count-atoms -o json
+
+    assert_success
+    assert_output "$atoms_before"
+
+    rm -rf "$(dirname "$snapshot_dir")"
+}
@@ -49,6 +49,7 @@ teardown() {
     assert_success
 
     assert_line --partial "Starting MongoDB service..."
+    assert_line --partial "Uploading the MongoDB cluster keyfile to all nodes..."
     assert_line --partial "MongoDB has started successfully on port ${mongodb_port} at ${mongodb_node1_ip}, operating under the server user ${mongodb_node1_username}."
     assert_line --partial "MongoDB has started successfully on port ${mongodb_port} at ${mongodb_node2_ip}, operating under the server user ${mongodb_node2_username}."
     assert_line --partial "MongoDB has started successfully on port ${mongodb_port} at ${mongodb_node3_ip}, operating under the server user ${mongodb_node3_username}."
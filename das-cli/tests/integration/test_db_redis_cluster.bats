@@ -51,6 +51,7 @@ teardown() {
     assert_line --partial "Redis has started successfully on port ${redis_port} at ${redis_node1_ip}, operating under the server user ${redis_node1_username}."
     assert_line --partial "Redis has started successfully on port ${redis_port} at ${redis_node2_ip}, operating under the server user ${redis_node2_username}."
     assert_line --partial "Redis has started successfully on port ${redis_port} at ${redis_node3_ip}, operating under the server user ${redis_node3_username}."
+    assert_line --partial "Redis cluster is up with 3 masters and 0 replicas:"
 
     unset_ssh_context "$redis_context_02"
     unset_ssh_context "$redis_context_03"
@@ -0,0 +1,24 @@
+#!/usr/local/bin/bats
+
+load 'libs/bats-support/load'
+load 'libs/bats-assert/load'
+load 'libs/utils'
+load 'libs/docker'
+
+setup() {
+    use_config "simple"
+}
+
+@test "Prefetch pulls the configured images and skips them afterwards" {
+    run das-cli images prefetch --local-only -o json
+
+    assert_success
+    assert_output --partial '"image": "redis:7.2.3-alpine"'
+    assert_output --partial '"image": "mongodb/mongodb-community-server:8.0.4-ubuntu2204"'
+    assert_output --partial '"failed": 0'
+
+    run das-cli images prefetch --local-only -o json
+
+    assert_success
+    assert_output --partial '"pulled": 0'
+}
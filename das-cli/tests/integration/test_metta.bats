@@ -109,6 +109,43 @@ setup() {
     assert_line --partial "The file contains invalid MeTTa syntax."
 }
 
+@test "Loading directory with MeTTa files in parallel" {
+    local metta_file_path="$test_fixtures_dir/metta"
+
+    run das-cli metta load "$metta_file_path" --jobs 2
+
+    assert_line --partial "with 2 jobs"
+    assert_line --regexp "Done loading .*animals.metta in"
+    assert_line --regexp "Failed loading file .*invalid.metta"
+    assert_line --partial "The file contains invalid MeTTa syntax."
+    assert_line --regexp "Loaded [0-9]+ of [0-9]+ files."
+}
+
+@test "Loading a MeTTa file into MorkDB uses the Mork loader" {
+    local metta_file_path="$test_fixtures_dir/metta/animals.metta"
+
+    das-cli db stop &>/dev/null
+    set_config ".atomdb.type" '"morkdb"'
+    set_config ".atomdb.morkdb" '{"endpoint": "localhost:40022"}'
+    das-cli db start &>/dev/null
+
+    local started_at="$(date +%s)"
+
+    run das-cli metta load "$metta_file_path"
+
+    assert_success
+    assert_line --partial "Done loading."
+
+    run docker events --since "$started_at" --until "$(date +%s)" \
+        --filter type=container --filter event=create \
+        --format '{{.Actor.Attributes.name}} {{.Actor.Attributes.image}}'
+
+    das-cli db stop &>/dev/null
+
+    assert_output --partial "das-cli-mork-loader trueagi/das:mork-loader"
+    refute_output --partial "das-cli-metta-loader"
+}
+
 @test "Trying to load a MeTTa file with an invalid path" {
     run das-cli metta load "/invalid/path"
     assert_failure
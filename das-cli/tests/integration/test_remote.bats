@@ -53,3 +53,18 @@ teardown() {
 
   assert_failure
 }
+
+@test "Running a command on several hosts aggregates the output per host" {
+  local unreachable_host="127.0.0.2"
+
+  run python3 src/das_cli.py python-library list --hosts "$REMOTE_HOST,$unreachable_host" -o json
+
+  assert_failure
+  assert_output --partial "\"$REMOTE_HOST\": {"
+  assert_output --partial "\"$unreachable_host\": {"
+
+  run python3 src/das_cli.py python-library list --hosts "$REMOTE_HOST,$unreachable_host" --exit-policy any --parallel 1
+
+  assert_success
+  assert_output --partial "==> $REMOTE_HOST (exit code 0"
+}
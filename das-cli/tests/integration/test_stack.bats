@@ -0,0 +1,64 @@
+#!/usr/local/bin/bats
+
+load 'libs/bats-support/load'
+load 'libs/bats-assert/load'
+load 'libs/utils'
+load 'libs/docker'
+
+setup() {
+    use_config "simple"
+
+    stop_simple_stack
+}
+
+teardown() {
+    stop_simple_stack
+}
+
+@test "Up starts the query agent after the services it depends on" {
+    run das-cli up query-agent
+
+    assert_success
+    assert_line --partial "[stage 1/3] atomdb: started in"
+    assert_line --partial "[stage 2/3] attention-broker: started in"
+    assert_line --partial "[stage 3/3] query-agent: started in"
+
+    run is_service_up das-query-engine-40002
+    assert_success
+
+    run bash -c "das-cli down -o json 2>/dev/null | jq -e '.[0].action == \"down\" and .[0].failed_services == []'"
+
+    assert_success
+
+    run is_service_up das-query-engine-40002
+    assert_failure
+}
+
+@test "Up and down print a single JSON document with the output of each service" {
+    run bash -c "das-cli up attention-broker -o json 2>/dev/null | jq -e '.[0].failed_services == [] and ([.[0].stages[].services[].output | type] | all(. == \"array\"))'"
+
+    assert_success
+
+    run bash -c "das-cli down -o json 2>/dev/null | jq -e '.[0].action == \"down\"'"
+
+    assert_success
+}
+
+@test "Up rejects unknown services" {
+    run das-cli up unknown-service
+
+    assert_failure
+    assert_output --partial "Unknown service(s): unknown-service"
+}
+
+@test "Up reports overlapping port ranges before starting any service" {
+    set_config ".agents.link_creation.ports_range" '"42500:43499"'
+
+    run das-cli up
+
+    assert_failure
+    assert_output --partial "agents.query.ports_range and agents.link_creation.ports_range share ports 42500-42999"
+
+    run is_service_up das-cli-redis-40020
+    assert_failure
+}
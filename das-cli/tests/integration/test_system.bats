@@ -55,6 +55,7 @@ teardown() {
         "DEVICE" \
         "SERVICES" \
         "CONTAINER NAME" \
+        "CPU LIMIT" \
         "CONTAINER STATUS"
     do
         assert_line --partial "$header"
@@ -75,4 +76,78 @@ teardown() {
 
     count_services_up=$(echo "$output" | grep -c "running" || true)
     assert [ "$count_services_up" -eq 0 ]
-}
\ No newline at end of file
+}
+
+@test "System exporter records metrics history that status reads back" {
+
+    das-cli system exporter --listen 127.0.0.1:19474 --interval 1 &>/dev/null &
+    local exporter_pid=$!
+
+    sleep 5
+
+    kill "$exporter_pid"
+
+    run das-cli system status --history 1h -o json
+
+    assert_success
+    assert_output --partial '"resolution": "1s"'
+    assert_output --partial '"host": ['
+
+    run das-cli system status --history 1x
+
+    assert_failure
+    assert_output --partial "Invalid duration"
+
+    run das-cli system status --history 0
+
+    assert_failure
+    assert_output --partial "greater than zero"
+}
+
+@test "System exporter serves OpenMetrics for managed services" {
+
+    das-cli db start
+
+    das-cli system exporter --listen 127.0.0.1:19473 --interval 1 --atomdb-interval 1 &>/dev/null &
+    local exporter_pid=$!
+
+    sleep 5
+
+    run curl -fsS http://127.0.0.1:19473/metrics
+
+    kill "$exporter_pid"
+
+    assert_success
+    assert_output --partial 'das_host_cpu_usage_percent'
+    assert_output --partial 'das_container_up{container="das-cli-mongodb-40021"'
+    assert_output --partial 'das_atomdb_documents{collection="atoms"}'
+    assert_line '# EOF'
+}
+
+@test "System exporter rejects refresh intervals that are not positive" {
+
+    run das-cli system exporter --interval 0
+
+    assert_failure
+    assert_output --partial "Invalid value for '--interval'"
+
+    run das-cli system exporter --atomdb-interval -1
+
+    assert_failure
+    assert_output --partial "Invalid value for '--atomdb-interval'"
+}
+
+@test "System status --all-nodes returns the status keyed by host" {
+
+    run das-cli system status --all-nodes -o json
+
+    assert_success
+    assert_output --partial '"localhost": {'
+    assert_output --partial '"latency_ms":'
+    assert_output --partial '"error": null'
+
+    run das-cli system status --all-nodes --stream
+
+    assert_failure
+    assert_output --partial "--all-nodes cannot be combined"
+}